@@ -0,0 +1,5 @@
+"""Benchmarks for hoverdrive.
+
+These are not part of the test suite. Run them from the root of the
+repository with, for example, ``python -m benchmarks.redirects --help``.
+"""
@@ -0,0 +1,169 @@
+"""Micro-benchmark of decoding Ook link arrays.
+
+Compares the full decoding into `~hoverdrive.storage.ookapi.OokLinksArray`
+models with the lean decoding of `~hoverdrive.storage.ookapi.OokLinksPayload`
+that redirects use, for link arrays of several sizes.
+
+Run ``python -m benchmarks.decoding --help`` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from hoverdrive.storage.ookapi import OokLinksArray, OokLinksPayload
+
+from .harness import write_results
+
+__all__ = ["DecodingBenchmark", "DecodingResult", "main"]
+
+
+@dataclass(slots=True, frozen=True)
+class DecodingBenchmark:
+    """Parameters of a run of the decoding benchmark."""
+
+    sizes: tuple[int, ...] = (1, 10, 100, 1000)
+    """Numbers of links in the decoded arrays."""
+
+    min_time: float = 0.5
+    """Minimum seconds to spend timing each decoder at each size."""
+
+
+@dataclass(slots=True, frozen=True)
+class DecodingResult:
+    """Time to pick a redirect from a link array of one size."""
+
+    links: int
+    """Number of links in the array."""
+
+    payload_bytes: int
+    """Size of the JSON array."""
+
+    full_us: float
+    """Microseconds to decode full models and read the first URL."""
+
+    lean_us: float
+    """Microseconds to decode the lean targets and read the first URL."""
+
+    speedup: float
+    """Ratio of the full to the lean decoding time."""
+
+
+def make_payload(size: int) -> bytes:
+    """Make a JSON array of ``size`` links, shaped like Ook's."""
+    links = [
+        {
+            "url": f"https://sdm-schemas.lsst.io/dp02.html#Object.col{i}",
+            "title": f"dp02_dc2_catalogs.Object.col{i}",
+            "type": "schema_browser",
+            "collection_title": "SDM Schema Browser",
+        }
+        for i in range(size)
+    ]
+    return json.dumps(links).encode()
+
+
+def _time(func: Callable[[], object], min_time: float) -> float:
+    """Return the mean seconds per call of ``func``."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    repeat = max(1, int(min_time / (timer.timeit(number) or 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number
+
+
+def run_benchmark(benchmark: DecodingBenchmark) -> list[DecodingResult]:
+    """Time both decoders at every size.
+
+    Parameters
+    ----------
+    benchmark
+        Parameters of the run.
+
+    Returns
+    -------
+    list of DecodingResult
+        The timings for each size.
+    """
+    results = []
+    for size in benchmark.sizes:
+        data = make_payload(size)
+
+        def decode_full(data: bytes = data) -> str:
+            return OokLinksArray.model_validate_json(data).root[0].url
+
+        def decode_lean(data: bytes = data) -> str:
+            return OokLinksPayload(data).targets()[0]["url"]
+
+        full = _time(decode_full, benchmark.min_time)
+        lean = _time(decode_lean, benchmark.min_time)
+        results.append(
+            DecodingResult(
+                links=size,
+                payload_bytes=len(data),
+                full_us=full * 1e6,
+                lean_us=lean * 1e6,
+                speedup=full / lean,
+            )
+        )
+    return results
+
+
+def _format_table(results: list[DecodingResult]) -> str:
+    header = (
+        f"{'links':>6} {'bytes':>8} {'full us':>10} {'lean us':>10}"
+        f" {'speedup':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    lines.extend(
+        f"{r.links:>6} {r.payload_bytes:>8} {r.full_us:>10.2f}"
+        f" {r.lean_us:>10.2f} {r.speedup:>7.2f}x"
+        for r in results
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the decoding benchmark from the command line."""
+    defaults = DecodingBenchmark()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.decoding",
+        description=__doc__.split("\n\n")[0] if __doc__ else None,
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(defaults.sizes),
+        help="Numbers of links in the decoded arrays",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=defaults.min_time,
+        help="Minimum seconds to time each decoder at each size",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark-results/decoding.json"),
+        help="File to write the results to, as JSON",
+    )
+    args = parser.parse_args(argv)
+
+    benchmark = DecodingBenchmark(
+        sizes=tuple(args.sizes), min_time=args.min_time
+    )
+    results = run_benchmark(benchmark)
+    write_results(args.output, "decoding", benchmark, results)
+    print(_format_table(results))  # noqa: T201
+    print(f"\nWrote {args.output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
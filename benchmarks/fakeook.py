@@ -0,0 +1,293 @@
+"""A simulated Ook SDM links API for benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import random
+import socket
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qs
+
+from httpx import AsyncClient, HTTPError
+from starlette.types import Receive, Scope, Send
+from uvicorn import Config, Server
+
+__all__ = [
+    "STATS_PATH",
+    "FakeOok",
+    "FakeOokServer",
+    "FakeOokSettings",
+    "fake_ook_running",
+]
+
+STATS_PATH = "/_fakeook/stats"
+"""Path of the request counters, which is not itself counted."""
+
+_PREFIX = "/links/domains/sdm/schemas"
+
+
+@dataclass(slots=True, frozen=True)
+class FakeOokSettings:
+    """Shape and behavior of the simulated Ook."""
+
+    schemas: int = 2
+    """Number of SDM schemas."""
+
+    tables: int = 20
+    """Number of tables in each schema."""
+
+    columns: int = 100
+    """Number of columns in each table."""
+
+    latency: float = 0.005
+    """Time to answer each request, in seconds."""
+
+    jitter: float = 0.0
+    """Maximum random time added to ``latency``, in seconds."""
+
+    error_rate: float = 0.0
+    """Fraction of requests answered with a 503 error."""
+
+    page_size: int = 100
+    """Number of entries per page of a collection."""
+
+    seed: int = 0
+    """Seed for the random latency jitter and errors."""
+
+    @property
+    def catalog_size(self) -> int:
+        """Total number of columns."""
+        return self.schemas * self.tables * self.columns
+
+    def column_names(self) -> list[tuple[str, str, str]]:
+        """List the schema, table, and column names of every column."""
+        return [
+            (schema_name(s), table_name(t), column_name(c))
+            for s in range(self.schemas)
+            for t in range(self.tables)
+            for c in range(self.columns)
+        ]
+
+
+def schema_name(index: int) -> str:
+    """Name of the schema with the given index."""
+    return f"bench{index:02d}"
+
+
+def table_name(index: int) -> str:
+    """Name of the table with the given index."""
+    return f"Table{index:03d}"
+
+
+def column_name(index: int) -> str:
+    """Name of the column with the given index."""
+    return f"col{index:04d}"
+
+
+class FakeOok:
+    """An ASGI application simulating the Ook SDM links API.
+
+    Item and collection endpoints are served for a synthetic catalog. Item
+    responses carry an ``ETag`` and honor ``If-None-Match``. Every request
+    is counted, and the counts are served at `STATS_PATH`, so that
+    benchmarks can report how many upstream calls hoverdrive made.
+
+    Parameters
+    ----------
+    settings
+        Shape and behavior of the simulated Ook.
+    """
+
+    def __init__(self, settings: FakeOokSettings) -> None:
+        self.settings = settings
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(settings.seed)  # noqa: S311
+        self._schemas = {schema_name(i) for i in range(settings.schemas)}
+        self._tables = {table_name(i) for i in range(settings.tables)}
+        self._columns = {column_name(i) for i in range(settings.columns)}
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["path"] == STATS_PATH:
+            stats = {"requests": self.requests, "errors": self.errors}
+            await self._send(send, 200, self._json(stats))
+            return
+
+        self.requests += 1
+        delay = self.settings.latency
+        if self.settings.jitter:
+            delay += self._random.uniform(0, self.settings.jitter)
+        await asyncio.sleep(delay)
+        if self._random.random() < self.settings.error_rate:
+            self.errors += 1
+            await self._send(send, 503, b"")
+            return
+
+        body = self._route(scope)
+        if body is None:
+            await self._send(send, 404, b"")
+            return
+        content, link = body
+        headers = [(b"content-type", b"application/json")]
+        if link:
+            headers.append((b"link", f'<{link}>; rel="next"'.encode()))
+        else:
+            etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'.encode()
+            headers.append((b"etag", etag))
+            if (b"if-none-match", etag) in scope["headers"]:
+                await self._send(send, 304, b"", headers[1:])
+                return
+        await self._send(send, 200, content, headers)
+
+    def _route(self, scope: Scope) -> tuple[bytes, str | None] | None:
+        path: str = scope["path"]
+        if not path.startswith(_PREFIX):
+            return None
+        parts = [p for p in path.removeprefix(_PREFIX).split("/") if p]
+        query = parse_qs(scope["query_string"].decode())
+        cursor = int(query.get("cursor", ["0"])[0])
+        match parts:
+            case []:
+                names = sorted(self._schemas)
+                return self._page(scope, names, [], cursor)
+            case [schema, "tables"] if schema in self._schemas:
+                names = sorted(self._tables)
+                return self._page(scope, names, [schema], cursor)
+            case [schema, "tables", table] if self._has(schema, table):
+                return self._json([_link(schema, table)]), None
+            case [schema, "tables", table, "columns"] if self._has(
+                schema, table
+            ):
+                names = sorted(self._columns)
+                return self._page(scope, names, [schema, table], cursor)
+            case [schema, "tables", table, "columns", column] if self._has(
+                schema, table, column
+            ):
+                return self._json([_link(schema, table, column)]), None
+        return None
+
+    def _has(self, schema: str, table: str, column: str | None = None) -> bool:
+        return (
+            schema in self._schemas
+            and table in self._tables
+            and (column is None or column in self._columns)
+        )
+
+    def _page(
+        self, scope: Scope, names: list[str], parents: list[str], cursor: int
+    ) -> tuple[bytes, str | None]:
+        end = cursor + self.settings.page_size
+        items = [
+            {"name": n, "links": [_link(*parents, n)]}
+            for n in names[cursor:end]
+        ]
+        next_url = None
+        if end < len(names):
+            host, port = scope["server"]
+            next_url = f"http://{host}:{port}{scope['path']}?cursor={end}"
+        return self._json(items), next_url
+
+    @staticmethod
+    def _json(data: Any) -> bytes:
+        return json.dumps(data).encode()
+
+    @staticmethod
+    async def _send(
+        send: Send,
+        status: int,
+        body: bytes,
+        headers: list[tuple[bytes, bytes]] | None = None,
+    ) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": headers or [],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def _link(*names: str) -> dict[str, str]:
+    anchor = ".".join(names[1:])
+    return {
+        "url": f"https://sdm-schemas.lsst.io/{names[0]}.html#{anchor}",
+        "type": "schema_browser",
+        "title": ".".join(names),
+        "collection_title": "SDM Schema Browser",
+    }
+
+
+@dataclass(slots=True, frozen=True)
+class FakeOokServer:
+    """A running `FakeOok` server."""
+
+    url: str
+    """Base URL of the simulated Ook API."""
+
+    async def get_request_count(self) -> int:
+        """Get the number of API requests the server has answered."""
+        async with AsyncClient() as client:
+            response = await client.get(f"{self.url}{STATS_PATH}")
+            response.raise_for_status()
+            return response.json()["requests"]
+
+
+@asynccontextmanager
+async def fake_ook_running(
+    settings: FakeOokSettings,
+) -> AsyncIterator[FakeOokServer]:
+    """Serve a `FakeOok` from another process for the duration of the
+    context.
+
+    Running the simulated Ook in its own process keeps its CPU time out of
+    the measurements of hoverdrive.
+
+    Yields
+    ------
+    FakeOokServer
+        The running server.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = multiprocessing.get_context("spawn").Process(
+        target=_serve, args=(settings, port), daemon=True
+    )
+    process.start()
+    server = FakeOokServer(url=f"http://127.0.0.1:{port}")
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                await server.get_request_count()
+                break
+            except HTTPError:
+                if not process.is_alive() or time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.05)
+        yield server
+    finally:
+        process.terminate()
+        process.join()
+
+
+def _serve(settings: FakeOokSettings, port: int) -> None:
+    config = Config(
+        FakeOok(settings),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+        access_log=False,
+        lifespan="off",
+    )
+    Server(config).run()
@@ -0,0 +1,169 @@
+"""Shared machinery for running hoverdrive in-process under load."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import platform
+import statistics
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+from safir.logging import configure_logging
+
+from hoverdrive.config import config
+from hoverdrive.main import app
+
+__all__ = [
+    "LatencySummary",
+    "hoverdrive_running",
+    "run_concurrently",
+    "write_results",
+]
+
+
+@dataclass(slots=True, frozen=True)
+class LatencySummary:
+    """Summary statistics of a set of latencies, in milliseconds."""
+
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    @classmethod
+    def from_seconds(cls, latencies: list[float]) -> LatencySummary:
+        """Summarize latencies measured in seconds."""
+        if len(latencies) < 2:
+            latencies = latencies * 2 or [0.0, 0.0]
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        return cls(
+            mean=statistics.fmean(latencies) * 1000,
+            p50=cuts[49] * 1000,
+            p90=cuts[89] * 1000,
+            p99=cuts[98] * 1000,
+            max=max(latencies) * 1000,
+        )
+
+
+@asynccontextmanager
+async def hoverdrive_running(
+    ook_url: str, *, log_level: str = "WARNING", **settings: Any
+) -> AsyncIterator[AsyncClient]:
+    """Start a fresh instance of the hoverdrive app in this process.
+
+    Each instance starts with empty caches. Requests are sent to the ASGI app
+    directly, without a network hop, so the measurements include all of
+    hoverdrive's request handling but none of the client's networking.
+
+    Parameters
+    ----------
+    ook_url
+        Base URL of the Ook API to use.
+    log_level
+        Log level for hoverdrive. Logging every Ook request at the default
+        level would dominate the measurements.
+    **settings
+        Other configuration settings to override for this instance.
+
+    Yields
+    ------
+    httpx.AsyncClient
+        A client that sends requests to the app.
+    """
+    # Replace the logging configured when the app was imported.
+    configure_logging(
+        profile=config.profile, log_level=log_level, name="hoverdrive"
+    )
+    overrides = {"ook_url": ook_url, **settings}
+    saved = {name: getattr(config, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    try:
+        async with LifespanManager(app):
+            transport = ASGITransport(app=app)
+            async with AsyncClient(
+                transport=transport, base_url="http://hoverdrive.test"
+            ) as client:
+                yield client
+    finally:
+        for name, value in saved.items():
+            setattr(config, name, value)
+
+
+async def run_concurrently[T](
+    items: Iterable[T],
+    func: Callable[[T], Awaitable[bool]],
+    *,
+    concurrency: int,
+) -> tuple[list[float], int]:
+    """Call ``func`` on every item, with a fixed number of workers.
+
+    Parameters
+    ----------
+    items
+        Work items, taken in order by whichever worker is free.
+    func
+        Called for each item. Returns whether the call succeeded.
+    concurrency
+        Number of workers.
+
+    Returns
+    -------
+    tuple of list of float and int
+        The latency of every call, in seconds, and the number of calls that
+        failed.
+    """
+    iterator = iter(items)
+    latencies: list[float] = []
+    failures = 0
+
+    async def worker() -> None:
+        nonlocal failures
+        for item in iterator:
+            start = time.perf_counter()
+            ok = await func(item)
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                failures += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, failures
+
+
+def write_results(
+    path: Path, benchmark: str, parameters: Any, results: list[Any]
+) -> None:
+    """Write benchmark results as JSON.
+
+    Parameters
+    ----------
+    path
+        File to write.
+    benchmark
+        Name of the benchmark.
+    parameters
+        Dataclass of the parameters of the run.
+    results
+        Dataclasses of the results of each scenario.
+    """
+    document = {
+        "benchmark": benchmark,
+        "created_at": datetime.now(tz=UTC).isoformat(),
+        "hoverdrive_version": version("hoverdrive"),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": asdict(parameters),
+        "results": [asdict(r) for r in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2) + "\n")
@@ -0,0 +1,217 @@
+"""Memory benchmark of the link index of a multi-release catalog.
+
+Builds the link index of a synthetic catalog with several data releases whose
+tables share most of their column names, as the link index refresh does from
+Ook's JSON responses, and measures the memory it holds with `tracemalloc`:
+
+dict
+    Each table's column links in a plain `dict`, as the index stored them
+    before `~hoverdrive.storage.linkindex.ColumnLinks`.
+compact
+    Each table's column links in a
+    `~hoverdrive.storage.linkindex.ColumnLinks`.
+search
+    The `~hoverdrive.storage.nameindex.SdmNameIndex` of the compact index,
+    on top of it.
+
+Run ``python -m benchmarks.memory --help`` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from hoverdrive.storage.linkindex import (
+    ColumnLinks,
+    SdmSchemaIndex,
+    SdmTableIndex,
+)
+from hoverdrive.storage.nameindex import SdmNameIndex
+
+from .harness import write_results
+from .search import SearchBenchmark, make_catalog
+
+__all__ = ["MemoryBenchmark", "MemoryResult", "main"]
+
+type _Catalog = dict[str, dict[str, dict[str, str]]]
+"""Column links by schema, table, and column name, as decoded from JSON."""
+
+
+@dataclass(slots=True, frozen=True)
+class MemoryBenchmark:
+    """Parameters of a run of the memory benchmark."""
+
+    releases: int = 4
+    """Number of data releases, each with its own schemas."""
+
+    schemas: int = 3
+    """Number of SDM schemas in each release."""
+
+    tables: int = 50
+    """Number of tables in each schema."""
+
+    columns: int = 400
+    """Number of columns in each table."""
+
+
+@dataclass(slots=True, frozen=True)
+class MemoryResult:
+    """Memory held by one representation of the link index."""
+
+    representation: str
+    """Name of the representation."""
+
+    bytes: int
+    """Bytes allocated and still held after building it."""
+
+    bytes_per_column: float
+    """Bytes held per indexed column."""
+
+
+def make_responses(benchmark: MemoryBenchmark) -> list[bytes]:
+    """Make the JSON column links of every table, as Ook would return them.
+
+    Tables with the same name in different releases and schemas have mostly
+    the same columns, and decoding each response creates new strings for
+    them, as the refresh of the link index does.
+    """
+    catalog = make_catalog(
+        SearchBenchmark(
+            schemas=benchmark.schemas,
+            tables=benchmark.tables,
+            columns=benchmark.columns,
+        )
+    )
+    responses = []
+    for release in range(benchmark.releases):
+        for schema_name, tables in catalog.items():
+            schema = f"{schema_name}_r{release}"
+            for table_name, table in tables.items():
+                base = (
+                    f"https://sdm-schemas.lsst.io/{schema}.html#{table_name}"
+                )
+                links = {c: f"{base}.{c}" for c in table.columns}
+                body = {"schema": schema, "table": table_name, "links": links}
+                responses.append(json.dumps(body).encode())
+    return responses
+
+
+def _build_dict(responses: list[bytes]) -> _Catalog:
+    catalog: _Catalog = {}
+    for response in responses:
+        body = json.loads(response)
+        tables = catalog.setdefault(body["schema"], {})
+        tables[body["table"]] = body["links"]
+    return catalog
+
+
+def _build_compact(responses: list[bytes]) -> SdmSchemaIndex:
+    catalog: SdmSchemaIndex = {}
+    for response in responses:
+        body = json.loads(response)
+        tables = catalog.setdefault(body["schema"], {})
+        tables[body["table"]] = SdmTableIndex(
+            columns=ColumnLinks(body["links"])
+        )
+    return catalog
+
+
+def _measure(build: Callable[[], Any]) -> tuple[int, Any]:
+    """Measure the memory held by the result of a function."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return held, result
+
+
+def run_benchmark(benchmark: MemoryBenchmark) -> list[MemoryResult]:
+    """Build each representation of the link index and measure it.
+
+    Parameters
+    ----------
+    benchmark
+        Parameters of the run.
+
+    Returns
+    -------
+    list of MemoryResult
+        The memory held by each representation.
+    """
+    responses = make_responses(benchmark)
+    columns = (
+        benchmark.releases
+        * benchmark.schemas
+        * benchmark.tables
+        * benchmark.columns
+    )
+    held_dict, catalog = _measure(lambda: _build_dict(responses))
+    del catalog
+    held_compact, schemas = _measure(lambda: _build_compact(responses))
+    held_search, _ = _measure(lambda: SdmNameIndex.build(schemas))
+
+    return [
+        MemoryResult(name, held, held / columns)
+        for name, held in (
+            ("dict", held_dict),
+            ("compact", held_compact),
+            ("search", held_search),
+        )
+    ]
+
+
+def _format_table(results: list[MemoryResult]) -> str:
+    header = f"{'representation':<14} {'MiB':>8} {'bytes/column':>12}"
+    lines = [header, "-" * len(header)]
+    lines.extend(
+        f"{r.representation:<14} {r.bytes / 2**20:>8.1f}"
+        f" {r.bytes_per_column:>12.1f}"
+        for r in results
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the memory benchmark from the command line."""
+    defaults = MemoryBenchmark()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.memory",
+        description=__doc__.split("\n\n")[0] if __doc__ else None,
+    )
+    parser.add_argument("--releases", type=int, default=defaults.releases)
+    parser.add_argument("--schemas", type=int, default=defaults.schemas)
+    parser.add_argument("--tables", type=int, default=defaults.tables)
+    parser.add_argument("--columns", type=int, default=defaults.columns)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark-results/memory.json"),
+        help="File to write the results to, as JSON",
+    )
+    args = parser.parse_args(argv)
+
+    benchmark = MemoryBenchmark(
+        releases=args.releases,
+        schemas=args.schemas,
+        tables=args.tables,
+        columns=args.columns,
+    )
+    results = run_benchmark(benchmark)
+    write_results(args.output, "memory", benchmark, results)
+    print(_format_table(results))  # noqa: T201
+    print(f"\nWrote {args.output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
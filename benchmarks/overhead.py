@@ -0,0 +1,170 @@
+"""Benchmark of hoverdrive's own per-request overhead.
+
+Each scenario sends the same request sequentially, one at a time, to an app
+whose caches have already been filled, so that no time is spent waiting on
+Ook and the latency is the cost of hoverdrive's request handling:
+
+index
+    The external application metadata, ``/hoverdrive/``.
+redirect
+    A column documentation redirect answered from the link cache.
+datalink
+    A column DataLink document answered from the link and response caches.
+
+Run ``python -m benchmarks.overhead --help`` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from httpx import AsyncClient
+
+from .fakeook import (
+    FakeOokSettings,
+    column_name,
+    fake_ook_running,
+    schema_name,
+    table_name,
+)
+from .harness import LatencySummary, hoverdrive_running, write_results
+
+__all__ = ["OverheadBenchmark", "OverheadResult", "main"]
+
+_TABLE = f"{schema_name(0)}.{table_name(0)}"
+
+_SCENARIOS = {
+    "index": ("/hoverdrive/", {}),
+    "redirect": (
+        "/hoverdrive/column-docs-redirect",
+        {"table": _TABLE, "column": column_name(0)},
+    ),
+    "datalink": (
+        "/hoverdrive/column-docs-links",
+        {"table": _TABLE, "column": column_name(0)},
+    ),
+}
+
+
+@dataclass(slots=True, frozen=True)
+class OverheadBenchmark:
+    """Parameters of a run of the overhead benchmark."""
+
+    requests: int = 5000
+    """Timed requests per scenario."""
+
+    warmup: int = 200
+    """Untimed requests per scenario, sent before the timed ones."""
+
+
+@dataclass(slots=True, frozen=True)
+class OverheadResult:
+    """Measurements of one scenario."""
+
+    scenario: str
+    """Name of the scenario."""
+
+    requests: int
+    """Number of timed requests."""
+
+    failures: int
+    """Requests that were not answered successfully."""
+
+    latency_us: LatencySummary
+    """Latency of the timed requests, in microseconds."""
+
+
+async def _measure(
+    client: AsyncClient, scenario: str, benchmark: OverheadBenchmark
+) -> OverheadResult:
+    path, params = _SCENARIOS[scenario]
+    for _ in range(benchmark.warmup):
+        await client.get(path, params=params)
+    latencies = []
+    failures = 0
+    for _ in range(benchmark.requests):
+        start = time.perf_counter()
+        response = await client.get(path, params=params)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            failures += 1
+    # LatencySummary reports milliseconds, so scale seconds to report
+    # microseconds instead.
+    summary = LatencySummary.from_seconds([t * 1000 for t in latencies])
+    return OverheadResult(
+        scenario=scenario,
+        requests=len(latencies),
+        failures=failures,
+        latency_us=summary,
+    )
+
+
+async def run_benchmark(
+    benchmark: OverheadBenchmark,
+) -> list[OverheadResult]:
+    """Run every scenario of the overhead benchmark.
+
+    Parameters
+    ----------
+    benchmark
+        Parameters of the run.
+
+    Returns
+    -------
+    list of OverheadResult
+        The measurements of each scenario.
+    """
+    settings = FakeOokSettings(schemas=1, tables=1, columns=1, latency=0)
+    async with fake_ook_running(settings) as ook:
+        async with hoverdrive_running(ook.url) as client:
+            return [
+                await _measure(client, scenario, benchmark)
+                for scenario in _SCENARIOS
+            ]
+
+
+def _format_table(results: list[OverheadResult]) -> str:
+    header = (
+        f"{'scenario':<9} {'requests':>8} {'failed':>6} {'mean us':>9}"
+        f" {'p50 us':>9} {'p99 us':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    lines.extend(
+        f"{r.scenario:<9} {r.requests:>8} {r.failures:>6}"
+        f" {r.latency_us.mean:>9.1f} {r.latency_us.p50:>9.1f}"
+        f" {r.latency_us.p99:>9.1f}"
+        for r in results
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the overhead benchmark from the command line."""
+    defaults = OverheadBenchmark()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.overhead",
+        description=__doc__.split("\n\n")[0] if __doc__ else None,
+    )
+    parser.add_argument("--requests", type=int, default=defaults.requests)
+    parser.add_argument("--warmup", type=int, default=defaults.warmup)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark-results/overhead.json"),
+        help="File to write the results to, as JSON",
+    )
+    args = parser.parse_args(argv)
+
+    benchmark = OverheadBenchmark(requests=args.requests, warmup=args.warmup)
+    results = asyncio.run(run_benchmark(benchmark))
+    write_results(args.output, "overhead", benchmark, results)
+    print(_format_table(results))  # noqa: T201
+    print(f"\nWrote {args.output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Load test of the redirect endpoints against a simulated Ook.
+
+Each scenario starts a fresh instance of the app, with empty caches, and
+sends column redirect requests to it in-process:
+
+cold
+    Every request is for a different column, so every request is a cache
+    miss that waits on Ook.
+warm
+    A set of columns is requested once, untimed, and then requested
+    repeatedly, so requests are answered from the cache.
+burst
+    Waves of simultaneous requests for a few uncached columns, as when many
+    users open the same table at once. Concurrent requests for the same
+    column should share one Ook request.
+
+Run ``python -m benchmarks.redirects --help`` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from httpx import AsyncClient
+
+from .fakeook import FakeOokServer, FakeOokSettings, fake_ook_running
+from .harness import (
+    LatencySummary,
+    hoverdrive_running,
+    run_concurrently,
+    write_results,
+)
+
+__all__ = ["RedirectBenchmark", "ScenarioResult", "main"]
+
+type Column = tuple[str, str, str]
+
+
+@dataclass(slots=True, frozen=True)
+class RedirectBenchmark:
+    """Parameters of a run of the redirect benchmark."""
+
+    ook: FakeOokSettings
+    """Shape and behavior of the simulated Ook."""
+
+    requests: int = 2000
+    """Timed requests per scenario."""
+
+    concurrency: int = 32
+    """Concurrent clients in the cold and warm scenarios."""
+
+    warm_columns: int = 200
+    """Distinct columns requested in the warm scenario."""
+
+    burst_size: int = 200
+    """Simultaneous requests in each wave of the burst scenario."""
+
+    burst_columns: int = 5
+    """Distinct columns requested in each wave of the burst scenario."""
+
+    seed: int = 0
+    """Seed for the order of requests."""
+
+
+@dataclass(slots=True, frozen=True)
+class ScenarioResult:
+    """Measurements of one scenario."""
+
+    scenario: str
+    """Name of the scenario."""
+
+    requests: int
+    """Number of timed requests."""
+
+    failures: int
+    """Requests that were not answered with a redirect."""
+
+    duration_seconds: float
+    """Wall-clock time of the timed requests."""
+
+    throughput_rps: float
+    """Requests answered per second."""
+
+    latency_ms: LatencySummary
+    """Latency of the timed requests."""
+
+    upstream_requests: int
+    """Requests that hoverdrive sent to Ook during the timed requests."""
+
+
+class _Runner:
+    def __init__(
+        self, benchmark: RedirectBenchmark, ook: FakeOokServer
+    ) -> None:
+        self._benchmark = benchmark
+        self._ook = ook
+        self._columns = benchmark.ook.column_names()
+        random.Random(benchmark.seed).shuffle(self._columns)  # noqa: S311
+
+    async def run(self) -> list[ScenarioResult]:
+        return [await self.cold(), await self.warm(), await self.burst()]
+
+    async def cold(self) -> ScenarioResult:
+        columns = self._columns[: self._benchmark.requests]
+        async with hoverdrive_running(self._ook.url) as client:
+            return await self._measure(
+                "cold",
+                client,
+                columns,
+                concurrency=self._benchmark.concurrency,
+            )
+
+    async def warm(self) -> ScenarioResult:
+        hot = self._columns[: self._benchmark.warm_columns]
+        columns = [hot[i % len(hot)] for i in range(self._benchmark.requests)]
+        async with hoverdrive_running(self._ook.url) as client:
+            await run_concurrently(
+                hot,
+                lambda c: self._redirect(client, c),
+                concurrency=self._benchmark.concurrency,
+            )
+            return await self._measure(
+                "warm",
+                client,
+                columns,
+                concurrency=self._benchmark.concurrency,
+            )
+
+    async def burst(self) -> ScenarioResult:
+        size = self._benchmark.burst_size
+        per_wave = self._benchmark.burst_columns
+        waves = max(1, self._benchmark.requests // size)
+        latencies: list[float] = []
+        failures = 0
+        async with hoverdrive_running(self._ook.url) as client:
+            upstream_start = await self._ook.get_request_count()
+            start = time.perf_counter()
+            for wave in range(waves):
+                hot = self._columns[wave * per_wave : (wave + 1) * per_wave]
+                columns = [hot[i % len(hot)] for i in range(size)]
+                wave_latencies, wave_failures = await run_concurrently(
+                    columns,
+                    lambda c: self._redirect(client, c),
+                    concurrency=size,
+                )
+                latencies.extend(wave_latencies)
+                failures += wave_failures
+            duration = time.perf_counter() - start
+        return self._result(
+            "burst",
+            latencies,
+            failures,
+            duration,
+            await self._ook.get_request_count() - upstream_start,
+        )
+
+    async def _measure(
+        self,
+        scenario: str,
+        client: AsyncClient,
+        columns: list[Column],
+        *,
+        concurrency: int,
+    ) -> ScenarioResult:
+        upstream_start = await self._ook.get_request_count()
+        start = time.perf_counter()
+        latencies, failures = await run_concurrently(
+            columns,
+            lambda c: self._redirect(client, c),
+            concurrency=concurrency,
+        )
+        duration = time.perf_counter() - start
+        return self._result(
+            scenario,
+            latencies,
+            failures,
+            duration,
+            await self._ook.get_request_count() - upstream_start,
+        )
+
+    @staticmethod
+    def _result(
+        scenario: str,
+        latencies: list[float],
+        failures: int,
+        duration: float,
+        upstream_requests: int,
+    ) -> ScenarioResult:
+        return ScenarioResult(
+            scenario=scenario,
+            requests=len(latencies),
+            failures=failures,
+            duration_seconds=duration,
+            throughput_rps=len(latencies) / duration if duration else 0.0,
+            latency_ms=LatencySummary.from_seconds(latencies),
+            upstream_requests=upstream_requests,
+        )
+
+    @staticmethod
+    async def _redirect(client: AsyncClient, column: Column) -> bool:
+        schema, table, column_name = column
+        response = await client.get(
+            "/hoverdrive/column-docs-redirect",
+            params={"table": f"{schema}.{table}", "column": column_name},
+        )
+        return response.status_code == 307
+
+
+async def run_benchmark(benchmark: RedirectBenchmark) -> list[ScenarioResult]:
+    """Run every scenario of the redirect benchmark.
+
+    Parameters
+    ----------
+    benchmark
+        Parameters of the run.
+
+    Returns
+    -------
+    list of ScenarioResult
+        The measurements of each scenario.
+    """
+    if benchmark.ook.catalog_size < benchmark.requests:
+        msg = (
+            f"Catalog of {benchmark.ook.catalog_size} columns is too small"
+            f" for {benchmark.requests} cold requests"
+        )
+        raise ValueError(msg)
+    async with fake_ook_running(benchmark.ook) as ook:
+        return await _Runner(benchmark, ook).run()
+
+
+def _format_table(results: list[ScenarioResult]) -> str:
+    header = (
+        f"{'scenario':<8} {'requests':>8} {'failed':>6} {'req/s':>9}"
+        f" {'p50 ms':>8} {'p99 ms':>8} {'upstream':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    lines.extend(
+        f"{r.scenario:<8} {r.requests:>8} {r.failures:>6}"
+        f" {r.throughput_rps:>9.1f} {r.latency_ms.p50:>8.2f}"
+        f" {r.latency_ms.p99:>8.2f} {r.upstream_requests:>8}"
+        for r in results
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the redirect benchmark from the command line."""
+    defaults = RedirectBenchmark(ook=FakeOokSettings())
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.redirects",
+        description=__doc__.split("\n\n")[0] if __doc__ else None,
+    )
+    parser.add_argument("--requests", type=int, default=defaults.requests)
+    parser.add_argument(
+        "--concurrency", type=int, default=defaults.concurrency
+    )
+    parser.add_argument(
+        "--warm-columns", type=int, default=defaults.warm_columns
+    )
+    parser.add_argument("--burst-size", type=int, default=defaults.burst_size)
+    parser.add_argument(
+        "--burst-columns", type=int, default=defaults.burst_columns
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--ook-latency",
+        type=float,
+        default=defaults.ook.latency,
+        help="Seconds for the simulated Ook to answer each request",
+    )
+    parser.add_argument(
+        "--ook-jitter",
+        type=float,
+        default=defaults.ook.jitter,
+        help="Maximum random seconds added to the Ook latency",
+    )
+    parser.add_argument(
+        "--ook-error-rate",
+        type=float,
+        default=defaults.ook.error_rate,
+        help="Fraction of Ook requests that fail with a 503",
+    )
+    parser.add_argument("--schemas", type=int, default=defaults.ook.schemas)
+    parser.add_argument("--tables", type=int, default=defaults.ook.tables)
+    parser.add_argument("--columns", type=int, default=defaults.ook.columns)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark-results/redirects.json"),
+        help="File to write the results to, as JSON",
+    )
+    args = parser.parse_args(argv)
+
+    benchmark = RedirectBenchmark(
+        ook=FakeOokSettings(
+            schemas=args.schemas,
+            tables=args.tables,
+            columns=args.columns,
+            latency=args.ook_latency,
+            jitter=args.ook_jitter,
+            error_rate=args.ook_error_rate,
+            seed=args.seed,
+        ),
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warm_columns=args.warm_columns,
+        burst_size=args.burst_size,
+        burst_columns=args.burst_columns,
+        seed=args.seed,
+    )
+    results = asyncio.run(run_benchmark(benchmark))
+    write_results(args.output, "redirects", benchmark, results)
+    print(_format_table(results))  # noqa: T201
+    print(f"\nWrote {args.output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Micro-benchmark of typeahead searches of table and column names.
+
+Builds an `~hoverdrive.storage.nameindex.SdmNameIndex` of a synthetic catalog
+with realistic, overlapping column names, and times searches of each kind,
+as sent on each keystroke:
+
+short
+    A one-character prefix, matching a large share of the names.
+prefix
+    A longer prefix.
+fragment
+    A fragment from the middle of names.
+qualified
+    A column prefix within a table.
+miss
+    A fragment that matches nothing.
+
+Run ``python -m benchmarks.search --help`` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from hoverdrive.storage.linkindex import (
+    ColumnLinks,
+    SdmSchemaIndex,
+    SdmTableIndex,
+)
+from hoverdrive.storage.nameindex import SdmNameIndex
+
+from .harness import LatencySummary, write_results
+
+__all__ = ["SearchBenchmark", "SearchResult", "main"]
+
+_WORDS = (
+    *("coord", "ra", "dec", "flux", "psf", "cModel", "ap", "gaussian"),
+    *("kron", "shape", "xx", "yy", "xy", "err", "flag", "centroid", "pixel"),
+    *("band", "mag", "sky", "bg", "extendedness", "blendedness", "id"),
+    *("parent", "detect", "primary", "deblend", "footprint", "area", "mjd"),
+    *("epoch", "parallax", "pm", "snr", "chi2", "calib", "inst", "sersic"),
+    *("bulge", "disk", "ellipticity", "size"),
+)
+_BANDS = ("", "u_", "g_", "r_", "i_", "z_", "y_")
+
+_QUERIES = {
+    "short": "g",
+    "prefix": "r_psf",
+    "fragment": "flux_err",
+    "qualified": "Table007.g_ap",
+    "miss": "zzzz",
+}
+
+
+@dataclass(slots=True, frozen=True)
+class SearchBenchmark:
+    """Parameters of a run of the search benchmark."""
+
+    schemas: int = 10
+    """Number of SDM schemas."""
+
+    tables: int = 100
+    """Number of tables in each schema."""
+
+    columns: int = 500
+    """Number of columns in each table."""
+
+    limit: int = 10
+    """Maximum number of matches per search."""
+
+    searches: int = 20000
+    """Timed searches per query."""
+
+
+@dataclass(slots=True, frozen=True)
+class SearchResult:
+    """Measurements of one kind of query."""
+
+    scenario: str
+    """Name of the kind of query."""
+
+    query: str
+    """The query."""
+
+    matches: int
+    """Number of matches returned."""
+
+    latency_us: LatencySummary
+    """Latency of the searches, in microseconds."""
+
+
+def make_catalog(benchmark: SearchBenchmark) -> SdmSchemaIndex:
+    """Make a synthetic link index whose tables share column names."""
+    rng = random.Random(42)  # noqa: S311
+    vocabulary = sorted(
+        {
+            f"{band}{a}_{b}"
+            for band in _BANDS
+            for a in _WORDS
+            for b in _WORDS
+            if a != b
+        }
+    )
+    schemas: SdmSchemaIndex = {}
+    for s in range(benchmark.schemas):
+        schema = f"dp{s:02d}_catalogs"
+        tables = {}
+        for t in range(benchmark.tables):
+            table = f"Table{t:03d}"
+            base = f"https://sdm-schemas.lsst.io/{schema}.html#{table}"
+            names = rng.sample(vocabulary, benchmark.columns)
+            tables[table] = SdmTableIndex(
+                link=base,
+                columns=ColumnLinks({c: f"{base}.{c}" for c in names}),
+            )
+        schemas[schema] = tables
+    return schemas
+
+
+def run_benchmark(
+    benchmark: SearchBenchmark,
+) -> tuple[float, list[SearchResult]]:
+    """Build the index and time every kind of query.
+
+    Parameters
+    ----------
+    benchmark
+        Parameters of the run.
+
+    Returns
+    -------
+    tuple
+        Seconds to build the index, and the measurements of each query.
+    """
+    schemas = make_catalog(benchmark)
+    start = time.perf_counter()
+    index = SdmNameIndex.build(schemas)
+    build = time.perf_counter() - start
+
+    results = []
+    for scenario, query in _QUERIES.items():
+        latencies = []
+        for _ in range(benchmark.searches):
+            start = time.perf_counter()
+            matches = index.search(query, benchmark.limit)
+            latencies.append(time.perf_counter() - start)
+        # LatencySummary reports milliseconds, so scale seconds to report
+        # microseconds instead.
+        summary = LatencySummary.from_seconds([t * 1000 for t in latencies])
+        results.append(
+            SearchResult(
+                scenario=scenario,
+                query=query,
+                matches=len(matches),
+                latency_us=summary,
+            )
+        )
+    return build, results
+
+
+def _format_table(results: list[SearchResult]) -> str:
+    header = (
+        f"{'scenario':<10} {'query':<14} {'matches':>7} {'mean us':>8}"
+        f" {'p50 us':>8} {'p99 us':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    lines.extend(
+        f"{r.scenario:<10} {r.query:<14} {r.matches:>7}"
+        f" {r.latency_us.mean:>8.1f} {r.latency_us.p50:>8.1f}"
+        f" {r.latency_us.p99:>8.1f}"
+        for r in results
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the search benchmark from the command line."""
+    defaults = SearchBenchmark()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.search",
+        description=__doc__.split("\n\n")[0] if __doc__ else None,
+    )
+    parser.add_argument("--schemas", type=int, default=defaults.schemas)
+    parser.add_argument("--tables", type=int, default=defaults.tables)
+    parser.add_argument("--columns", type=int, default=defaults.columns)
+    parser.add_argument("--limit", type=int, default=defaults.limit)
+    parser.add_argument("--searches", type=int, default=defaults.searches)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark-results/search.json"),
+        help="File to write the results to, as JSON",
+    )
+    args = parser.parse_args(argv)
+
+    benchmark = SearchBenchmark(
+        schemas=args.schemas,
+        tables=args.tables,
+        columns=args.columns,
+        limit=args.limit,
+        searches=args.searches,
+    )
+    build, results = run_benchmark(benchmark)
+    write_results(args.output, "search", benchmark, results)
+    columns = benchmark.schemas * benchmark.tables * benchmark.columns
+    print(f"Built index of {columns} columns in {build:.2f} s\n")  # noqa: T201
+    print(_format_table(results))  # noqa: T201
+    print(f"\nWrote {args.output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Administrative command-line interface."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import click
+import structlog
+from safir.asyncio import run_with_asyncio
+from safir.click import display_help
+from safir.logging import configure_logging
+
+from .config import config
+from .factory import Factory
+from .storage.redirectmap import RedirectMapFormat
+
+__all__ = ["help", "main"]
+
+
+@click.group(context_settings={"help_option_names": ["-h", "--help"]})
+@click.version_option(message="%(version)s")
+def main() -> None:
+    """Administrative command-line interface for hoverdrive."""
+    configure_logging(
+        profile=config.profile, log_level=config.log_level, name="hoverdrive"
+    )
+
+
+@main.command()
+@click.argument("topic", default=None, required=False, nargs=1)
+@click.argument("subtopic", default=None, required=False, nargs=1)
+@click.pass_context
+def help(ctx: click.Context, topic: str | None, subtopic: str | None) -> None:
+    """Show help for any command."""
+    display_help(main, ctx, topic, subtopic)
+
+
+@main.command()
+@click.option(
+    "--format",
+    "map_format",
+    type=click.Choice([f.value for f in RedirectMapFormat]),
+    default=RedirectMapFormat.nginx.value,
+    show_default=True,
+    help="Format of the redirect map.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=True,
+    help="File to write the redirect map to.",
+)
+@click.option(
+    "--table-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Also write the column links of each table to this directory.",
+)
+@run_with_asyncio
+async def export_redirects(
+    *, map_format: str, output: Path, table_dir: Path | None
+) -> None:
+    """Write a static map of every table and column redirect.
+
+    The SDM links are crawled from Ook and written in a form that an ingress
+    or CDN can serve the redirects from, so that only the misses reach
+    hoverdrive.
+    """
+    logger = structlog.get_logger("hoverdrive")
+    async with Factory.create_standalone(logger=logger) as factory:
+        export_service = factory.get_redirect_export_service()
+        result = await export_service.export(
+            output, RedirectMapFormat(map_format), table_dir=table_dir
+        )
+    click.echo(f"Wrote {result.redirects} redirects to {output}")
+    if table_dir:
+        click.echo(f"Wrote {result.table_files} table files to {table_dir}")
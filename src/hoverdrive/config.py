@@ -2,11 +2,54 @@
 
 from __future__ import annotations
 
-from pydantic import Field, SecretStr
+from datetime import timedelta
+from enum import StrEnum
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Self
+
+from pydantic import Field, RedisDsn, SecretStr, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from safir.logging import LogLevel, Profile
+from safir.pydantic import HumanTimedelta
+
+__all__ = [
+    "CacheBackendType",
+    "Config",
+    "LinkFallback",
+    "SpanExporterType",
+    "config",
+]
+
+
+class CacheBackendType(StrEnum):
+    """Where cached links are stored."""
+
+    memory = "memory"
+    """In the memory of each process."""
+
+    redis = "redis"
+    """In a Redis-compatible server shared by every replica."""
+
 
-__all__ = ["Config", "config"]
+class LinkFallback(StrEnum):
+    """How to redirect when no link has a preferred type or collection."""
+
+    first = "first"
+    """To the first link in Ook's order."""
+
+    none = "none"
+    """Not at all, as if there were no documentation."""
+
+
+class SpanExporterType(StrEnum):
+    """Where the timing spans of requests are sent."""
+
+    log = "log"
+    """To the application log, one message per request."""
+
+    opentelemetry = "opentelemetry"
+    """To the OpenTelemetry tracer provider, if the SDK is configured."""
 
 
 class Config(BaseSettings):
@@ -28,6 +71,27 @@ class Config(BaseSettings):
         Profile.development, title="Application logging profile"
     )
 
+    server_timing: bool = Field(
+        False,
+        title="Return Server-Timing headers",
+        description=(
+            "Report the time spent in each stage of handling an external"
+            " request, such as cache lookups and Ook requests, in a"
+            " Server-Timing response header, which browser developer tools"
+            " display."
+        ),
+    )
+
+    span_exporter: SpanExporterType | None = Field(
+        None,
+        title="Destination of request timing spans",
+        description=(
+            "If set, the timed stages of every external request are also"
+            " exported as trace spans. The opentelemetry exporter requires"
+            " the opentelemetry extra of hoverdrive."
+        ),
+    )
+
     slack_webhook: SecretStr | None = Field(
         None,
         title="Slack webhook for alerts",
@@ -36,9 +100,433 @@ class Config(BaseSettings):
 
     ook_url: str = Field(
         "https://roundtable.lsst.cloud/ook",
-        description="Base URL for the Ook API",
+        description=(
+            "Base URL for the Ook API. Requests to it go through the proxy"
+            " set by HTTP_PROXY, HTTPS_PROXY, or ALL_PROXY, unless NO_PROXY"
+            " excludes it."
+        ),
+    )
+
+    ook_max_connections: int = Field(
+        100,
+        ge=1,
+        title="Maximum connections to Ook",
+        description=(
+            "Size of the HTTP connection pool for Ook. Requests beyond this"
+            " wait for a free connection, up to the pool timeout."
+        ),
+    )
+
+    ook_max_keepalive_connections: int = Field(
+        20,
+        ge=0,
+        title="Maximum idle connections to Ook",
+        description="Idle connections kept open for reuse in the pool.",
+    )
+
+    ook_keepalive_expiry: HumanTimedelta = Field(
+        timedelta(seconds=30),
+        title="Idle connection lifetime",
+        description="Idle pooled connections are closed after this long.",
+    )
+
+    ook_connect_timeout: HumanTimedelta = Field(
+        timedelta(seconds=5),
+        title="Timeout for connecting to Ook",
+    )
+
+    ook_read_timeout: HumanTimedelta = Field(
+        timedelta(seconds=10),
+        title="Timeout for reading or writing data to Ook",
+    )
+
+    ook_pool_timeout: HumanTimedelta = Field(
+        timedelta(seconds=5),
+        title="Timeout for acquiring a pooled connection to Ook",
+    )
+
+    ook_max_in_flight: int = Field(
+        100,
+        ge=0,
+        title="Maximum concurrent requests to Ook",
+        description=(
+            "Requests to Ook beyond this wait in a queue, bounding the load"
+            " that a burst of uncached lookups puts on Ook. Lookups answered"
+            " from the caches are not limited. Set to 0 to disable admission"
+            " control."
+        ),
+    )
+
+    ook_max_queued: int = Field(
+        200,
+        ge=0,
+        title="Maximum requests waiting to query Ook",
+        description=(
+            "Once this many requests are waiting for a free slot, further"
+            " requests that need Ook fail immediately with a 503 and a"
+            " Retry-After header."
+        ),
+    )
+
+    ook_queue_timeout: HumanTimedelta = Field(
+        timedelta(seconds=2),
+        title="Maximum wait to query Ook",
+        description=(
+            "Requests that wait this long for a free slot fail with a 503 and"
+            " a Retry-After header."
+        ),
+    )
+
+    ook_retries: int = Field(
+        1,
+        ge=0,
+        title="Retries of failed Ook requests",
+        description=(
+            "Maximum number of times a request to Ook that could not connect,"
+            " timed out, or got a 502, 503, or 504 is retried."
+        ),
+    )
+
+    ook_retry_backoff: HumanTimedelta = Field(
+        timedelta(milliseconds=100),
+        title="Maximum delay before retrying an Ook request",
+        description=(
+            "Retries wait a random delay of up to this long, doubled for"
+            " every further retry of the same request."
+        ),
+    )
+
+    ook_hedge_percentile: float | None = Field(
+        None,
+        gt=0,
+        lt=100,
+        title="Percentile of Ook latency after which requests are hedged",
+        description=(
+            "If set, a request to Ook that has not answered after this"
+            " percentile of the latency of recent requests is sent again,"
+            " and the first response is used."
+        ),
+    )
+
+    ook_hedge_min_delay: HumanTimedelta = Field(
+        timedelta(milliseconds=20),
+        title="Minimum delay before hedging an Ook request",
+    )
+
+    ook_retry_budget: float = Field(
+        0.1,
+        ge=0,
+        title="Retries and hedges per Ook request",
+        description=(
+            "Retries and hedged requests together are limited to this"
+            " fraction of requests to Ook, after a small burst, so that they"
+            " cannot multiply the load on Ook while it is failing or slow."
+        ),
+    )
+
+    ook_breaker_failure_threshold: int = Field(
+        5,
+        ge=0,
+        title="Consecutive Ook failures that open the circuit breaker",
+        description=(
+            "After this many consecutive failed or slow requests, requests"
+            " to Ook fail fast, and only cached and indexed links are served,"
+            " until a probe request succeeds. Set to 0 to disable the"
+            " circuit breaker."
+        ),
+    )
+
+    ook_breaker_slow_call: HumanTimedelta = Field(
+        timedelta(seconds=5),
+        title="Duration at which an Ook request counts as failed",
+        description=(
+            "Successful requests that take at least this long count towards"
+            " opening the circuit breaker, so that it opens when Ook's"
+            " latency climbs, before requests start to time out."
+        ),
+    )
+
+    ook_breaker_reset_timeout: HumanTimedelta = Field(
+        timedelta(seconds=30),
+        title="Time before probing Ook after the circuit breaker opens",
+    )
+
+    ook_http2: bool = Field(
+        False,
+        title="Use HTTP/2 for Ook",
+        description=(
+            "Negotiate HTTP/2 with Ook, multiplexing requests over fewer"
+            " connections. Requires the h2 package, which is installed with"
+            " the http2 extra of hoverdrive."
+        ),
     )
 
+    ook_preconnect: bool = Field(
+        True,
+        title="Connect to Ook at startup",
+        description=(
+            "Open a connection to Ook while the application starts so that"
+            " the first request doesn't pay for DNS, TCP, and TLS setup."
+        ),
+    )
+
+    link_cache_size: int = Field(
+        10_000,
+        ge=0,
+        title="Maximum number of cached link sets",
+        description=(
+            "Links fetched from Ook are cached in memory, keyed by schema,"
+            " table, and column. The least recently used entries are evicted"
+            " beyond this size. Set to 0 to disable the cache."
+        ),
+    )
+
+    cache_backend: CacheBackendType = Field(
+        CacheBackendType.memory,
+        title="Link cache storage backend",
+        description=(
+            "Store cached links in process memory, or in a Redis-compatible"
+            " server shared between replicas so that only one replica needs"
+            " to fetch each link from Ook."
+        ),
+    )
+
+    redis_url: RedisDsn | None = Field(
+        None,
+        title="Redis URL for the link cache",
+        description="Required if the cache backend is redis",
+        examples=["redis://hoverdrive-redis:6379/0"],
+    )
+
+    redis_password: SecretStr | None = Field(
+        None, title="Password for the link cache Redis server"
+    )
+
+    link_cache_ttl: HumanTimedelta = Field(
+        timedelta(hours=1),
+        title="Freshness lifetime of cached links",
+        description=(
+            "Cached links older than this are still served, but trigger a"
+            " background refresh from Ook."
+        ),
+    )
+
+    link_cache_max_stale: HumanTimedelta = Field(
+        timedelta(days=1),
+        title="Maximum staleness of cached links",
+        description=(
+            "How long past the TTL a cached entry may still be served while"
+            " it is refreshed in the background."
+        ),
+    )
+
+    link_cache_stale_if_error: HumanTimedelta = Field(
+        timedelta(days=7),
+        title="Maximum staleness of cached links while Ook fails",
+        description=(
+            "How long past the maximum staleness a cached entry is kept, to"
+            " be served if Ook fails while it is being refreshed."
+        ),
+    )
+
+    negative_cache_ttl: HumanTimedelta = Field(
+        timedelta(minutes=5),
+        title="Lifetime of cached lookups without links",
+        description=(
+            "Tables and columns for which Ook has no links, including those"
+            " Ook does not know, are remembered for this long so that"
+            " repeated lookups don't reach Ook. Set to 0 to disable."
+        ),
+    )
+
+    link_index_enabled: bool = Field(
+        False,
+        title="Preload the SDM link index",
+        description=(
+            "If true, the links for every SDM schema, table, and column are"
+            " fetched from Ook at startup and redirects are served from"
+            " memory. Entities missing from the index fall back to Ook."
+        ),
+    )
+
+    link_index_refresh_interval: HumanTimedelta = Field(
+        timedelta(hours=1),
+        title="Interval between SDM link index refreshes",
+    )
+
+    crawl_concurrency: int = Field(
+        8,
+        ge=1,
+        title="Concurrent tables per crawl of Ook",
+        description=(
+            "Maximum number of tables whose column links are fetched at once"
+            " while crawling the whole SDM links domain, such as to refresh"
+            " the link index, or while updating the links of a schema."
+        ),
+    )
+
+    crawl_rate_limit: float | None = Field(
+        None,
+        gt=0,
+        title="Maximum requests per second of a crawl of Ook",
+        description=(
+            "If set, requests to Ook while crawling the whole SDM links"
+            " domain are spaced out to this rate, to spare Ook."
+        ),
+    )
+
+    datalink_cache_size: int = Field(
+        10_000,
+        ge=0,
+        title="Maximum number of cached DataLink responses",
+        description=(
+            "Serialized DataLink VOTables are cached and reused for as long"
+            " as the links they were built from are unchanged. Set to 0 to"
+            " disable the cache."
+        ),
+    )
+
+    link_snapshot_path: Path | None = Field(
+        None,
+        title="Path of the SDM link index snapshot",
+        description=(
+            "If set and the link index is enabled, the index is saved to this"
+            " SQLite file after every refresh and loaded from it at startup,"
+            " so that a restarted pod can serve redirects immediately, even"
+            " while Ook is unavailable."
+        ),
+        examples=["/var/cache/hoverdrive/links.sqlite"],
+    )
+
+    batch_concurrency: int = Field(
+        10,
+        ge=1,
+        title="Concurrent Ook lookups per batch request",
+        description=(
+            "Maximum number of column lookups sent to Ook at once while"
+            " resolving a batch of column links."
+        ),
+    )
+
+    prefetch_columns: bool = Field(
+        False,
+        title="Prefetch the column links of hovered tables",
+        description=(
+            "If true, the first time a table or one of its columns is looked"
+            " up in Ook, the links of all of the table's columns are fetched"
+            " into the link cache in the background, so that hovers over its"
+            " other columns are cache hits. A table is prefetched again once"
+            " its links expire from the cache."
+        ),
+    )
+
+    prefetch_concurrency: int = Field(
+        4,
+        ge=1,
+        title="Concurrent column link prefetches",
+    )
+
+    prefetch_max_pending: int = Field(
+        100,
+        ge=1,
+        title="Maximum queued column link prefetches",
+        description=(
+            "Prefetches triggered while this many are queued or running are"
+            " skipped."
+        ),
+    )
+
+    http_cache_max_age: HumanTimedelta = Field(
+        timedelta(minutes=5),
+        title="Lifetime of documentation responses in HTTP caches",
+        description=(
+            "Sent as max-age in the Cache-Control header of redirects and"
+            " link responses, which also carry an ETag so that clients can"
+            " revalidate them with If-None-Match. Set to 0 to require"
+            " revalidation on every use."
+        ),
+    )
+
+    link_type_priority: list[str] = Field(
+        ["schema_browser"],
+        title="Preferred documentation link types",
+        description=(
+            "Redirects go to the link whose type comes first in this list."
+            " Links of other types rank after every listed type. Set as a"
+            " JSON array in the environment."
+        ),
+        examples=[["schema_browser", "user_guide"]],
+    )
+
+    link_collection_priority: list[str] = Field(
+        [],
+        title="Preferred documentation collections",
+        description=(
+            "Titles of documentation collections, most preferred first. This"
+            " breaks ties between links of equally preferred types. Set as a"
+            " JSON array in the environment."
+        ),
+        examples=[["SDM Schema Browser"]],
+    )
+
+    link_fallback: LinkFallback = Field(
+        LinkFallback.first,
+        title="Redirect for links of no preferred type or collection",
+        description=(
+            "If first, links are otherwise ranked in Ook's order. If none,"
+            " entities documented only by such links are not redirected."
+        ),
+    )
+
+    @model_validator(mode="after")
+    def _validate_cache_backend(self) -> Self:
+        if self.cache_backend == CacheBackendType.redis and not self.redis_url:
+            raise ValueError("redis_url is required for the redis backend")
+        return self
+
+    @model_validator(mode="after")
+    def _validate_ook_http2(self) -> Self:
+        if self.ook_http2 and not _can_import("h2"):
+            msg = (
+                "ook_http2 requires the h2 package, which is installed with"
+                " the http2 extra of hoverdrive"
+            )
+            raise ValueError(msg)
+        return self
+
+    @model_validator(mode="after")
+    def _validate_span_exporter(self) -> Self:
+        if self.span_exporter == SpanExporterType.opentelemetry and not (
+            _can_import("opentelemetry.trace")
+        ):
+            msg = (
+                "span_exporter opentelemetry requires the OpenTelemetry API,"
+                " which is installed with the opentelemetry extra of"
+                " hoverdrive"
+            )
+            raise ValueError(msg)
+        return self
+
+    @model_validator(mode="after")
+    def _validate_link_ranking(self) -> Self:
+        if self.link_fallback == LinkFallback.none and not (
+            self.link_type_priority or self.link_collection_priority
+        ):
+            msg = (
+                "link_fallback none requires a link_type_priority or"
+                " link_collection_priority"
+            )
+            raise ValueError(msg)
+        return self
+
+
+def _can_import(name: str) -> bool:
+    """Check whether a module is installed, without importing it."""
+    try:
+        return find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
 
 config = Config()
 """Configuration for hoverdrive."""
@@ -9,11 +9,14 @@ including from dependencies.
 from dataclasses import dataclass
 from typing import Annotated, Any
 
+import structlog
 from fastapi import Depends, Request, Response
 from safir.dependencies.logger import logger_dependency
 from structlog.stdlib import BoundLogger
 
 from ..factory import Factory, ProcessContext
+from ..logcontext import set_request_logger
+from ..timing import mark
 
 __all__ = [
     "ContextDependency",
@@ -42,7 +45,7 @@ class RequestContext:
     """The request logger, rebound with discovered context."""
 
     factory: Factory
-    """The component factory."""
+    """The component factory, shared by all requests."""
 
     def rebind_logger(self, **values: Any) -> None:
         """Add the given values to the logging context.
@@ -53,7 +56,7 @@ class RequestContext:
             Additional values that should be added to the logging context.
         """
         self.logger = self.logger.bind(**values)
-        self.factory.set_logger(self.logger)
+        set_request_logger(self.logger)
 
 
 class ContextDependency:
@@ -62,11 +65,14 @@ class ContextDependency:
     Each request gets a `RequestContext`.  To save overhead, the portions of
     the context that are shared by all requests are collected into the single
     process-global `~hoverdrive.factory.ProcessContext` and reused with each
-    request.
+    request, along with a single `~hoverdrive.factory.Factory`. The request
+    logger reaches the shared services through
+    `~hoverdrive.logcontext.set_request_logger`.
     """
 
     def __init__(self) -> None:
         self._process_context: ProcessContext | None = None
+        self._factory: Factory | None = None
 
     async def __call__(
         self,
@@ -75,14 +81,15 @@ class ContextDependency:
         logger: Annotated[BoundLogger, Depends(logger_dependency)],
     ) -> RequestContext:
         """Create a per-request context and return it."""
+        if not self._factory:
+            raise RuntimeError("ContextDependency not initialized")
+        set_request_logger(logger)
+        mark("setup")
         return RequestContext(
             request=request,
             response=response,
             logger=logger,
-            factory=Factory(
-                logger=logger,
-                process_context=self.process_context,
-            ),
+            factory=self._factory,
         )
 
     @property
@@ -103,12 +110,17 @@ class ContextDependency:
         if self._process_context:
             await self._process_context.aclose()
         self._process_context = await ProcessContext.create()
+        self._factory = Factory(
+            logger=structlog.get_logger("hoverdrive"),
+            process_context=self._process_context,
+        )
 
     async def aclose(self) -> None:
         """Clean up the per-process configuration."""
         if self._process_context:
             await self._process_context.aclose()
         self._process_context = None
+        self._factory = None
 
 
 context_dependency = ContextDependency()
@@ -4,9 +4,13 @@ from fastapi import status
 from safir.fastapi import ClientRequestError
 
 __all__ = [
+    "CacheBackendError",
     "EndpointNotImplementedError",
     "LinkRedirectRequestError",
     "NotFoundError",
+    "UpstreamOverloadedError",
+    "UpstreamTransientError",
+    "UpstreamUnavailableError",
 ]
 
 
@@ -29,3 +33,37 @@ class LinkRedirectRequestError(ClientRequestError):
 
     error = "bad_link_redirect_request"
     status_code = status.HTTP_400_BAD_REQUEST
+
+
+class UpstreamUnavailableError(ClientRequestError):
+    """Ook, which hoverdrive depends on, is failing or not being called.
+
+    This is not reported to Slack, since an outage of Ook would otherwise
+    raise an alert for every request.
+    """
+
+    error = "upstream_unavailable"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def __init__(
+        self, message: str, *, retry_after: int | None = None
+    ) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        """Seconds after which the client may retry, sent as
+        ``Retry-After`` if set.
+        """
+
+
+class UpstreamTransientError(UpstreamUnavailableError):
+    """Ook failed in a way that a retry of the request may not."""
+
+
+class UpstreamOverloadedError(UpstreamUnavailableError):
+    """Too many requests are already waiting on Ook to accept another."""
+
+    error = "upstream_overloaded"
+
+
+class CacheBackendError(Exception):
+    """The link cache storage backend could not be used."""
@@ -2,18 +2,47 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from contextlib import aclosing, asynccontextmanager
 from dataclasses import dataclass
 from typing import Self
 
-from httpx import AsyncClient
+import structlog
+from httpx import AsyncClient, HTTPError, Limits, Response, Timeout
+from safir.metadata import Metadata, get_metadata
 from structlog.stdlib import BoundLogger
 
-from hoverdrive.services.links import LinksService
-
-from .config import config
+from .config import CacheBackendType, SpanExporterType, config
+from .metrics import Counter, Gauge, Metric, Metrics
+from .services.datalink import DataLinkService
+from .services.export import RedirectExportService
+from .services.linkindex import LinkIndexRefresher
+from .services.links import LinksService
+from .services.linkupdates import LinkUpdateService
+from .services.ranking import LinkRanker
+from .services.search import SearchService
+from .storage.admission import AdmissionLimiter
+from .storage.cachebackend import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+)
+from .storage.circuitbreaker import CircuitBreaker, CircuitState
+from .storage.crawler import OokCrawler
+from .storage.http import MonitoredTransport, get_environment_proxy
+from .storage.linkcache import LinkCache, LinkKey
+from .storage.linkindex import SdmLinkIndex
 from .storage.ookapi import OokClient
+from .storage.prefetch import Prefetcher
+from .storage.responsecache import ResponseCache
+from .storage.retry import RetryController
+from .storage.singleflight import SingleFlight
+from .storage.snapshot import LinkSnapshotStore
+from .timing import (
+    LoggingSpanExporter,
+    OpenTelemetrySpanExporter,
+    SpanExporter,
+)
 
 __all__ = ["Factory", "ProcessContext"]
 
@@ -27,14 +56,419 @@ class ProcessContext:
     http_client: AsyncClient
     """Shared HTTP client."""
 
+    ook_transport: MonitoredTransport
+    """Transport of ``http_client``, which reports pool utilization."""
+
+    link_cache: LinkCache
+    """Shared cache of links fetched from Ook."""
+
+    ook_single_flight: SingleFlight[str, Response]
+    """Coalesces concurrent identical requests to Ook, keyed by URL."""
+
+    ook_circuit_breaker: CircuitBreaker | None
+    """Fails requests to Ook fast while Ook is failing, if enabled."""
+
+    ook_admission: AdmissionLimiter | None
+    """Caps concurrent requests to Ook, if enabled."""
+
+    ook_retry: RetryController | None
+    """Retries and hedges requests to Ook, if enabled."""
+
+    column_prefetcher: Prefetcher[tuple[str, str]] | None
+    """Prefetches the column links of hovered tables, if enabled."""
+
+    link_index: SdmLinkIndex
+    """Preloaded index of the best link per SDM entity, possibly empty."""
+
+    link_index_refresher: LinkIndexRefresher
+    """Loads and periodically refreshes ``link_index``."""
+
+    metrics: Metrics
+    """Prometheus metrics for the process."""
+
+    datalink_cache: ResponseCache[LinkKey]
+    """Serialized DataLink VOTables, keyed by schema, table, and column."""
+
+    ook_client: OokClient
+    """Client for the Ook API, using the shared caches."""
+
+    links_service: LinksService
+    """Service for redirect links."""
+
+    datalink_service: DataLinkService
+    """Service for DataLink documents."""
+
+    link_update_service: LinkUpdateService
+    """Service reloading links that Ook reports have changed."""
+
+    search_service: SearchService
+    """Service finding documented tables and columns by name."""
+
+    redirect_export_service: RedirectExportService
+    """Service writing static redirect maps."""
+
+    span_exporter: SpanExporter | None
+    """Destination of the timing spans of requests, if enabled."""
+
+    metadata: Metadata
+    """Metadata about the application, which does not change while it
+    runs.
+    """
+
     @classmethod
     async def create(cls) -> Self:
         """Create a ProcessContext."""
-        http_client = AsyncClient()
+        logger = structlog.get_logger("hoverdrive")
+        metrics = Metrics()
+        ook_transport = MonitoredTransport(
+            limits=Limits(
+                max_connections=config.ook_max_connections,
+                max_keepalive_connections=config.ook_max_keepalive_connections,
+                keepalive_expiry=config.ook_keepalive_expiry.total_seconds(),
+            ),
+            http2=config.ook_http2,
+            proxy=get_environment_proxy(config.ook_url),
+        )
+        http_client = AsyncClient(
+            transport=ook_transport,
+            timeout=Timeout(
+                connect=config.ook_connect_timeout.total_seconds(),
+                read=config.ook_read_timeout.total_seconds(),
+                write=config.ook_read_timeout.total_seconds(),
+                pool=config.ook_pool_timeout.total_seconds(),
+            ),
+        )
+        link_cache = LinkCache(
+            backend=cls._create_cache_backend(),
+            ttl=config.link_cache_ttl,
+            negative_ttl=config.negative_cache_ttl,
+            max_stale=config.link_cache_max_stale,
+            stale_if_error=config.link_cache_stale_if_error,
+            logger=logger,
+        )
+        ranker = LinkRanker(
+            type_priority=config.link_type_priority,
+            collection_priority=config.link_collection_priority,
+            fallback=config.link_fallback,
+        )
+        ook_single_flight: SingleFlight[str, Response] = SingleFlight()
+        ook_circuit_breaker = None
+        if config.ook_breaker_failure_threshold:
+            ook_circuit_breaker = CircuitBreaker(
+                failure_threshold=config.ook_breaker_failure_threshold,
+                slow_call_duration=config.ook_breaker_slow_call,
+                reset_timeout=config.ook_breaker_reset_timeout,
+            )
+        ook_admission = None
+        if config.ook_max_in_flight:
+            ook_admission = AdmissionLimiter(
+                max_in_flight=config.ook_max_in_flight,
+                max_queued=config.ook_max_queued,
+                queue_timeout=config.ook_queue_timeout,
+            )
+        ook_retry = None
+        if config.ook_retries or config.ook_hedge_percentile:
+            ook_retry = RetryController(
+                max_retries=config.ook_retries,
+                backoff=config.ook_retry_backoff,
+                hedge_percentile=config.ook_hedge_percentile,
+                hedge_min_delay=config.ook_hedge_min_delay,
+                budget_ratio=config.ook_retry_budget,
+            )
+        ook_client = OokClient(
+            base_url=config.ook_url,
+            http_client=http_client,
+            logger=logger,
+            link_cache=link_cache,
+            single_flight=ook_single_flight,
+            metrics=metrics,
+            ranking=ranker,
+            circuit_breaker=ook_circuit_breaker,
+            admission=ook_admission,
+            retry=ook_retry,
+        )
+        column_prefetcher: Prefetcher[tuple[str, str]] | None = None
+        if config.prefetch_columns:
+            column_prefetcher = Prefetcher(
+                concurrency=config.prefetch_concurrency,
+                max_pending=config.prefetch_max_pending,
+                ttl=config.link_cache_ttl,
+                logger=logger,
+            )
+        link_index = SdmLinkIndex()
+        link_index_refresher = LinkIndexRefresher(
+            index=link_index,
+            ook_client=ook_client,
+            interval=config.link_index_refresh_interval,
+            logger=logger,
+            ranker=ranker,
+            snapshot_store=(
+                LinkSnapshotStore(config.link_snapshot_path)
+                if config.link_snapshot_path
+                else None
+            ),
+            crawler=OokCrawler(
+                ook_client=ook_client,
+                logger=logger,
+                concurrency=config.crawl_concurrency,
+                rate_limit=config.crawl_rate_limit,
+            ),
+        )
 
-        return cls(
+        datalink_cache: ResponseCache[LinkKey] = ResponseCache(
+            max_size=config.datalink_cache_size
+        )
+
+        context = cls(
             http_client=http_client,
+            ook_transport=ook_transport,
+            link_cache=link_cache,
+            ook_single_flight=ook_single_flight,
+            ook_circuit_breaker=ook_circuit_breaker,
+            ook_admission=ook_admission,
+            ook_retry=ook_retry,
+            column_prefetcher=column_prefetcher,
+            link_index=link_index,
+            link_index_refresher=link_index_refresher,
+            datalink_cache=datalink_cache,
+            metrics=metrics,
+            ook_client=ook_client,
+            links_service=LinksService(
+                ook_client=ook_client,
+                link_index=link_index,
+                ranker=ranker,
+                batch_concurrency=config.batch_concurrency,
+                prefetcher=column_prefetcher,
+            ),
+            datalink_service=DataLinkService(
+                ook_client=ook_client, response_cache=datalink_cache
+            ),
+            link_update_service=LinkUpdateService(
+                ook_client=ook_client,
+                link_cache=link_cache,
+                link_index=link_index,
+                ranker=ranker,
+                logger=logger,
+                concurrency=config.crawl_concurrency,
+            ),
+            search_service=SearchService(
+                link_index=link_index,
+                enabled=config.link_index_enabled,
+                logger=logger,
+            ),
+            redirect_export_service=RedirectExportService(
+                link_index=link_index,
+                link_index_refresher=link_index_refresher,
+                logger=logger,
+            ),
+            span_exporter=cls._create_span_exporter(logger),
+            metadata=get_metadata(
+                package_name="hoverdrive", application_name=config.name
+            ),
         )
+        metrics.add_collector(context._collect_metrics)
+        return context
+
+    @staticmethod
+    def _create_cache_backend() -> CacheBackend:
+        if config.cache_backend == CacheBackendType.redis and config.redis_url:
+            url = config.redis_url
+            password = url.password
+            if config.redis_password:
+                password = config.redis_password.get_secret_value()
+            return RedisCacheBackend(
+                host=url.host or "localhost",
+                port=url.port or 6379,
+                password=password,
+                database=int((url.path or "/0").lstrip("/") or 0),
+            )
+        return MemoryCacheBackend(max_size=config.link_cache_size)
+
+    @staticmethod
+    def _create_span_exporter(logger: BoundLogger) -> SpanExporter | None:
+        match config.span_exporter:
+            case SpanExporterType.log:
+                return LoggingSpanExporter(logger)
+            case SpanExporterType.opentelemetry:
+                return OpenTelemetrySpanExporter()
+            case None:
+                return None
+
+    def _collect_metrics(self) -> Iterable[Metric]:
+        """Convert the statistics of the shared components to metrics."""
+        pool = self.ook_transport.get_stats()
+        yield _gauge(
+            "hoverdrive_ook_pool_connections",
+            "Connections held by the Ook connection pool.",
+            pool.connections,
+        )
+        yield _gauge(
+            "hoverdrive_ook_pool_idle_connections",
+            "Open Ook connections not serving a request.",
+            pool.idle_connections,
+        )
+        yield _gauge(
+            "hoverdrive_ook_requests_in_flight",
+            "Requests to Ook currently awaiting a response.",
+            pool.in_flight,
+        )
+        yield _counter(
+            "hoverdrive_ook_connections_opened_total",
+            "New connections opened to Ook.",
+            pool.connects,
+        )
+        yield _counter(
+            "hoverdrive_ook_pool_wait_seconds_total",
+            "Time requests spent waiting for a pooled Ook connection.",
+            pool.pool_wait_seconds_total,
+        )
+        yield _counter(
+            "hoverdrive_ook_single_flight_merged_total",
+            "Requests to Ook avoided by sharing a concurrent request.",
+            self.ook_single_flight.stats.merged,
+        )
+        if self.ook_circuit_breaker:
+            breaker = self.ook_circuit_breaker
+            state = breaker.state
+            states = Gauge(
+                "hoverdrive_ook_circuit_state",
+                "State of the Ook circuit breaker, 1 for the current state.",
+                ("state",),
+            )
+            for candidate in CircuitState:
+                states.set(1 if candidate == state else 0, candidate.value)
+            yield states
+            yield _counter(
+                "hoverdrive_ook_circuit_opened_total",
+                "Times the Ook circuit breaker opened.",
+                breaker.stats.opened,
+            )
+            yield _counter(
+                "hoverdrive_ook_circuit_rejected_total",
+                "Requests to Ook failed fast by the circuit breaker.",
+                breaker.stats.rejected,
+            )
+        if self.ook_admission:
+            admission = self.ook_admission.stats
+            yield _gauge(
+                "hoverdrive_ook_admission_waiting",
+                "Requests currently waiting for a slot to query Ook.",
+                admission.waiting,
+            )
+            yield _counter(
+                "hoverdrive_ook_admission_queued_total",
+                "Requests that waited for a slot to query Ook.",
+                admission.queued,
+            )
+            rejected = Counter(
+                "hoverdrive_ook_admission_rejected_total",
+                "Requests to Ook shed by admission control, by reason.",
+                ("reason",),
+            )
+            rejected.inc("queue_full", amount=admission.rejected)
+            rejected.inc("timeout", amount=admission.timed_out)
+            yield rejected
+        if self.ook_retry:
+            retry = self.ook_retry.stats
+            yield _counter(
+                "hoverdrive_ook_retries_total",
+                "Failed requests to Ook that were retried.",
+                retry.retries,
+            )
+            yield _counter(
+                "hoverdrive_ook_hedges_total",
+                "Slow requests to Ook that were hedged with a second request.",
+                retry.hedges,
+            )
+            yield _counter(
+                "hoverdrive_ook_hedge_wins_total",
+                "Hedge requests to Ook that answered first.",
+                retry.hedge_wins,
+            )
+            yield _counter(
+                "hoverdrive_ook_retry_budget_exhausted_total",
+                "Retries and hedges to Ook not sent because of the budget.",
+                retry.budget_exhausted,
+            )
+        yield from self._collect_prefetch_metrics()
+
+        link_cache = self.link_cache.stats
+        lookups = Counter(
+            "hoverdrive_link_cache_lookups_total",
+            "Link cache lookups, by result.",
+            ("result",),
+        )
+        lookups.inc("hit", amount=link_cache.hits)
+        lookups.inc("stale", amount=link_cache.stale_hits)
+        lookups.inc("negative", amount=link_cache.negative_hits)
+        lookups.inc("miss", amount=link_cache.misses)
+        lookups.inc("stale_on_error", amount=link_cache.stale_on_error)
+        yield lookups
+        yield _counter(
+            "hoverdrive_link_cache_refreshes_total",
+            "Background refreshes of stale cached links.",
+            link_cache.refreshes,
+        )
+        yield _counter(
+            "hoverdrive_link_cache_not_modified_total",
+            "Refreshes that Ook answered with 304 Not Modified.",
+            link_cache.not_modified,
+        )
+        yield _counter(
+            "hoverdrive_link_cache_backend_errors_total",
+            "Link cache operations that failed in the backend.",
+            link_cache.backend_errors,
+        )
+
+        datalink_lookups = Counter(
+            "hoverdrive_datalink_cache_lookups_total",
+            "DataLink response cache lookups, by result.",
+            ("result",),
+        )
+        datalink_lookups.inc("hit", amount=self.datalink_cache.stats.hits)
+        datalink_lookups.inc("miss", amount=self.datalink_cache.stats.misses)
+        yield datalink_lookups
+
+        yield _gauge(
+            "hoverdrive_link_index_tables",
+            "Tables in the preloaded SDM link index.",
+            len(self.link_index),
+        )
+
+    def _collect_prefetch_metrics(self) -> Iterable[Metric]:
+        """Convert the statistics of the column prefetcher to metrics."""
+        if not self.column_prefetcher:
+            return
+        prefetch = self.column_prefetcher.stats
+        yield _gauge(
+            "hoverdrive_column_prefetch_pending",
+            "Column link prefetches currently queued or running.",
+            prefetch.pending,
+        )
+        prefetches = Counter(
+            "hoverdrive_column_prefetches_total",
+            "Column link prefetches of hovered tables, by outcome.",
+            ("outcome",),
+        )
+        prefetches.inc("completed", amount=prefetch.completed)
+        prefetches.inc("failed", amount=prefetch.failed)
+        prefetches.inc("deduplicated", amount=prefetch.deduplicated)
+        prefetches.inc("dropped", amount=prefetch.dropped)
+        yield prefetches
+
+    async def preconnect_ook(self) -> None:
+        """Open a pooled connection to Ook ahead of the first request.
+
+        Any response will do, so the status is ignored, and a failure is only
+        logged since Ook may legitimately be unavailable at startup.
+        """
+        logger = structlog.get_logger("hoverdrive")
+        try:
+            await self.http_client.head(config.ook_url)
+        except HTTPError as e:
+            logger.warning("Unable to pre-connect to Ook", error=str(e))
+        else:
+            logger.debug("Pre-connected to Ook", url=config.ook_url)
 
     async def aclose(self) -> None:
         """Clean up a process context.
@@ -42,11 +476,26 @@ class ProcessContext:
         Called during shutdown, or before recreating the process context using
         a different configuration.
         """
+        await self.link_index_refresher.stop()
+        if self.column_prefetcher:
+            await self.column_prefetcher.aclose()
+        await self.link_cache.aclose()
         await self.http_client.aclose()
 
 
 class Factory:
-    """Service factory."""
+    """Service factory.
+
+    The services are built once, with the process context, and shared by
+    every request, so getting one is cheap.
+
+    Parameters
+    ----------
+    logger
+        Logger to use outside of a request.
+    process_context
+        Shared process-wide components and services.
+    """
 
     def __init__(
         self,
@@ -93,15 +542,51 @@ class Factory:
         finally:
             ...
 
-    def set_logger(self, logger: BoundLogger) -> None:
-        """Set the logger for the factory."""
-        self._logger = logger
-
     @property
     def http_client(self) -> AsyncClient:
         """The shared HTTP client."""
         return self._process_context.http_client
 
+    def get_datalink_service(self) -> DataLinkService:
+        """Get the DataLink service.
+
+        Returns
+        -------
+        DataLinkService
+            The DataLink service.
+        """
+        return self._process_context.datalink_service
+
+    def get_link_update_service(self) -> LinkUpdateService:
+        """Get the service that reloads changed links.
+
+        Returns
+        -------
+        LinkUpdateService
+            The link update service.
+        """
+        return self._process_context.link_update_service
+
+    def get_search_service(self) -> SearchService:
+        """Get the name search service.
+
+        Returns
+        -------
+        SearchService
+            The name search service.
+        """
+        return self._process_context.search_service
+
+    def get_redirect_export_service(self) -> RedirectExportService:
+        """Get the service that writes static redirect maps.
+
+        Returns
+        -------
+        RedirectExportService
+            The redirect export service.
+        """
+        return self._process_context.redirect_export_service
+
     def get_links_service(self) -> LinksService:
         """Get the links service.
 
@@ -110,7 +595,7 @@ class Factory:
         LinksService
             The links service.
         """
-        return LinksService(ook_client=self.get_ook_client())
+        return self._process_context.links_service
 
     def get_ook_client(self) -> OokClient:
         """Get the Ook client.
@@ -120,8 +605,16 @@ class Factory:
         OokClient
             The Ook client.
         """
-        return OokClient(
-            base_url=config.ook_url,
-            http_client=self.http_client,
-            logger=self._logger,
-        )
+        return self._process_context.ook_client
+
+
+def _counter(name: str, help_text: str, value: float) -> Counter:
+    counter = Counter(name, help_text)
+    counter.inc(amount=value)
+    return counter
+
+
+def _gauge(name: str, help_text: str, value: float) -> Gauge:
+    gauge = Gauge(name, help_text)
+    gauge.set(value)
+    return gauge
@@ -0,0 +1,68 @@
+"""HTTP caching headers for external responses."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import timedelta
+
+from fastapi import Request, Response
+
+__all__ = ["cacheable"]
+
+
+def cacheable(
+    request: Request, response: Response, *, max_age: timedelta
+) -> Response:
+    """Add ``Cache-Control`` and ``ETag`` headers to a response.
+
+    The ``ETag`` is a hash of the status code, redirect location, and body,
+    so it changes whenever the documentation a response points to changes.
+    If the request's ``If-None-Match`` header matches it, a 304 response with
+    the same caching headers is returned instead, so the client reuses its
+    copy.
+
+    Parameters
+    ----------
+    request
+        The incoming request.
+    response
+        The complete response to the request.
+    max_age
+        How long clients and shared caches may reuse the response without
+        revalidating it.
+
+    Returns
+    -------
+    fastapi.Response
+        Either ``response`` with the caching headers added, or an empty 304
+        response.
+    """
+    digest = hashlib.sha256(str(response.status_code).encode())
+    digest.update(response.headers.get("Location", "").encode())
+    digest.update(response.body)
+    etag = f'"{digest.hexdigest()[:32]}"'
+    seconds = int(max_age.total_seconds())
+    headers = {
+        "Cache-Control": (
+            f"public, max-age={seconds}" if seconds > 0 else "no-cache"
+        ),
+        "ETag": etag,
+    }
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Apply the weak comparison that RFC 9110 requires for
+    ``If-None-Match``.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (
+        t.strip().removeprefix("W/") for t in if_none_match.split(",")
+    )
+    return etag in candidates
@@ -3,13 +3,16 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response
 from safir.slack.webhook import SlackRouteErrorHandler
 
+from hoverdrive.config import config
 from hoverdrive.dependencies.context import RequestContext, context_dependency
 from hoverdrive.exceptions import NotFoundError
+from hoverdrive.services.datalink import DATALINK_MEDIA_TYPE
 
-from .models import Index
+from .caching import cacheable
+from .models import ColumnDocsUrls, Index, NameMatch, NameSearchResults
 
 __all__ = ["router"]
 
@@ -26,7 +29,7 @@ async def get_index(request: Request) -> Index:
     """Provides the application's version and links to API documentation and
     endpoints.
     """
-    return Index.create(request)
+    return Index.create(request, context_dependency.process_context.metadata)
 
 
 @router.get(
@@ -53,8 +56,9 @@ async def get_column_docs_redirect(
             examples=["detect_isPrimary"],
         ),
     ],
+    request: Request,
     context: Annotated[RequestContext, Depends(context_dependency)],
-) -> RedirectResponse:
+) -> Response:
     factory = context.factory
     links_service = factory.get_links_service()
 
@@ -66,7 +70,11 @@ async def get_column_docs_redirect(
             "No documentation link found for column "
             f"{table_name}.{column_name}"
         )
-    return RedirectResponse(url=link, status_code=307)
+    return cacheable(
+        request,
+        RedirectResponse(url=link, status_code=307),
+        max_age=config.http_cache_max_age,
+    )
 
 
 @router.get(
@@ -84,8 +92,9 @@ async def get_table_docs_redirect(
             examples=["dp02_dc2_catalogs.Object"],
         ),
     ],
+    request: Request,
     context: Annotated[RequestContext, Depends(context_dependency)],
-) -> RedirectResponse:
+) -> Response:
     """Use a `redirect=true` query parameter to get a redirect to the most
     documentation link for this table.
     """
@@ -96,4 +105,173 @@ async def get_table_docs_redirect(
         raise NotFoundError(
             f"No documentation link found for table {table_name}"
         )
-    return RedirectResponse(url=link, status_code=307)
+    return cacheable(
+        request,
+        RedirectResponse(url=link, status_code=307),
+        max_age=config.http_cache_max_age,
+    )
+
+
+@router.get(
+    "/column-docs-urls",
+    response_model=ColumnDocsUrls,
+    summary="Get the most relevant documentation links for many columns",
+)
+async def get_column_docs_urls(
+    *,
+    table_name: Annotated[
+        str,
+        Query(
+            ...,
+            alias="table",
+            title="Table name",
+            examples=["dp02_dc2_catalogs.Object"],
+        ),
+    ],
+    column_names: Annotated[
+        list[str] | None,
+        Query(
+            alias="column",
+            max_length=200,
+            title="Column names",
+            description=(
+                "Repeat to request up to 200 columns. If omitted, every"
+                " documented column of the table is returned."
+            ),
+            examples=[["coord_ra", "coord_dec"]],
+        ),
+    ] = None,
+    request: Request,
+    context: Annotated[RequestContext, Depends(context_dependency)],
+) -> Response:
+    """Resolve the documentation links for the columns of a table in a single
+    request, such as for every column header of a TAP result.
+    """
+    links_service = context.factory.get_links_service()
+    links = await links_service.get_redirect_links_for_columns(
+        table_name, column_names
+    )
+    result = ColumnDocsUrls(table=table_name, columns=links)
+    return cacheable(
+        request,
+        JSONResponse(result.model_dump(mode="json")),
+        max_age=config.http_cache_max_age,
+    )
+
+
+@router.get(
+    "/column-docs-links",
+    response_class=Response,
+    responses={200: {"content": {DATALINK_MEDIA_TYPE: {}}}},
+    summary="DataLink VOTable of documentation links for a column",
+)
+async def get_column_docs_links(
+    *,
+    table_name: Annotated[
+        str,
+        Query(
+            ...,
+            alias="table",
+            title="Table name",
+            examples=["dp02_dc2_catalogs.Object"],
+        ),
+    ],
+    column_name: Annotated[
+        str,
+        Query(
+            ...,
+            alias="column",
+            title="Column name",
+            examples=["detect_isPrimary"],
+        ),
+    ],
+    request: Request,
+    context: Annotated[RequestContext, Depends(context_dependency)],
+) -> Response:
+    """Returns every documentation link for the column as an IVOA DataLink
+    ``{links}`` VOTable.
+    """
+    datalink_service = context.factory.get_datalink_service()
+    body = await datalink_service.get_column_links(table_name, column_name)
+    return cacheable(
+        request,
+        Response(content=body, media_type=DATALINK_MEDIA_TYPE),
+        max_age=config.http_cache_max_age,
+    )
+
+
+@router.get(
+    "/table-docs-links",
+    response_class=Response,
+    responses={200: {"content": {DATALINK_MEDIA_TYPE: {}}}},
+    summary="DataLink VOTable of documentation links for a table",
+)
+async def get_table_docs_links(
+    *,
+    table_name: Annotated[
+        str,
+        Query(
+            ...,
+            alias="table",
+            title="Table name",
+            examples=["dp02_dc2_catalogs.Object"],
+        ),
+    ],
+    request: Request,
+    context: Annotated[RequestContext, Depends(context_dependency)],
+) -> Response:
+    """Returns every documentation link for the table as an IVOA DataLink
+    ``{links}`` VOTable.
+    """
+    datalink_service = context.factory.get_datalink_service()
+    body = await datalink_service.get_table_links(table_name)
+    return cacheable(
+        request,
+        Response(content=body, media_type=DATALINK_MEDIA_TYPE),
+        max_age=config.http_cache_max_age,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=NameSearchResults,
+    response_model_exclude_none=True,
+    summary="Find documented tables and columns by name",
+)
+async def get_search(
+    *,
+    query: Annotated[
+        str,
+        Query(
+            ...,
+            alias="q",
+            min_length=1,
+            max_length=256,
+            title="Name prefix or fragment",
+            description=(
+                "Case-insensitive start or, if at least three characters long,"
+                " part of a table or column name. Qualify a name with its"
+                " table or schema, separated by dots, to search within them."
+            ),
+            examples=["coord", "Object.coord_r"],
+        ),
+    ],
+    limit: Annotated[
+        int, Query(ge=1, le=50, title="Maximum number of matches")
+    ] = 10,
+    request: Request,
+    context: Annotated[RequestContext, Depends(context_dependency)],
+) -> Response:
+    """Find documented tables and columns as the user types their name, for
+    typeahead. Requires the link index.
+    """
+    search_service = context.factory.get_search_service()
+    matches = await search_service.search(query, limit)
+    result = NameSearchResults(
+        query=query, matches=[NameMatch.from_match(m) for m in matches]
+    )
+    return cacheable(
+        request,
+        JSONResponse(result.model_dump(mode="json", exclude_none=True)),
+        max_age=config.http_cache_max_age,
+    )
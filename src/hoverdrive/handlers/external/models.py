@@ -5,11 +5,11 @@ from typing import Self
 from fastapi import Request
 from pydantic import AnyHttpUrl, BaseModel, Field
 from safir.metadata import Metadata as SafirMetadata
-from safir.metadata import get_metadata
 
 from hoverdrive.config import config
+from hoverdrive.storage.nameindex import SdmNameMatch
 
-__all__ = ["Index"]
+__all__ = ["ColumnDocsUrls", "Index", "NameMatch", "NameSearchResults"]
 
 
 class Index(BaseModel):
@@ -24,23 +24,21 @@ class Index(BaseModel):
     )
 
     @classmethod
-    def create(cls, request: Request) -> Self:
+    def create(cls, request: Request, metadata: SafirMetadata) -> Self:
         """Create an Index model from a request.
 
         Parameters
         ----------
         request
             The incoming request.
+        metadata
+            Metadata about the application.
 
         Returns
         -------
         Index
             The Index model.
         """
-        metadata = get_metadata(
-            package_name="hoverdrive",
-            application_name=config.name,
-        )
         api_docs_url = AnyHttpUrl(
             str(request.url.replace(path=f"/{config.path_prefix}/docs"))
         )
@@ -50,3 +48,77 @@ class Index(BaseModel):
         return cls(
             metadata=metadata, api_docs=api_docs_url, redoc_api_docs=redoc_url
         )
+
+
+class ColumnDocsUrls(BaseModel):
+    """The most relevant documentation link for each column of a table."""
+
+    table: str = Field(
+        ..., title="Table name", examples=["dp02_dc2_catalogs.Object"]
+    )
+
+    columns: dict[str, str | None] = Field(
+        ...,
+        title="Documentation URLs by column name",
+        description=(
+            "Columns that were requested but have no documentation, or"
+            " whose lookup failed while others succeeded, map to null."
+        ),
+        examples=[
+            {
+                "detect_isPrimary": (
+                    "https://sdm-schemas.lsst.io/dp02.html"
+                    "#Object.detect_isPrimary"
+                )
+            }
+        ],
+    )
+
+
+class NameMatch(BaseModel):
+    """A documented table or column whose name matches a search."""
+
+    table: str = Field(
+        ..., title="Table name", examples=["dp02_dc2_catalogs.Object"]
+    )
+
+    column: str | None = Field(
+        None,
+        title="Column name",
+        description="Omitted if the match is the table itself.",
+        examples=["coord_ra"],
+    )
+
+    url: str = Field(
+        ...,
+        title="Documentation URL",
+        examples=["https://sdm-schemas.lsst.io/dp02.html#Object.coord_ra"],
+    )
+
+    @classmethod
+    def from_match(cls, match: SdmNameMatch) -> Self:
+        """Create the model of a match found in the name index.
+
+        Parameters
+        ----------
+        match
+            The match.
+
+        Returns
+        -------
+        NameMatch
+            The model of the match.
+        """
+        return cls(
+            table=f"{match.schema_name}.{match.table_name}",
+            column=match.column_name,
+            url=match.url,
+        )
+
+
+class NameSearchResults(BaseModel):
+    """Documented tables and columns whose names match a search."""
+
+    query: str = Field(..., title="Search query", examples=["coord"])
+
+    matches: list[NameMatch] = Field(..., title="Matches, best first")
@@ -8,13 +8,24 @@ These handlers should be used for monitoring, health checks, internal status,
 or other information that should not be visible outside the Kubernetes cluster.
 """
 
-from fastapi import APIRouter
-from safir.metadata import Metadata, get_metadata
+from fastapi import APIRouter, Response
+from pydantic import BaseModel, Field
+from safir.metadata import Metadata
 from safir.slack.webhook import SlackRouteErrorHandler
 
-from ..config import config
+from ..dependencies.context import context_dependency
+from ..metrics import PROMETHEUS_MEDIA_TYPE
+from ..services.linkupdates import LinkUpdateResult
+from ..storage.admission import AdmissionStats
+from ..storage.circuitbreaker import CircuitBreakerStats
+from ..storage.http import HttpPoolStats
+from ..storage.linkcache import LinkCacheStats
+from ..storage.prefetch import PrefetchStats
+from ..storage.responsecache import ResponseCacheStats
+from ..storage.retry import RetryStats
+from ..storage.singleflight import SingleFlightStats
 
-__all__ = ["internal_router"]
+__all__ = ["SdmLinksChange", "ServiceStats", "internal_router"]
 
 internal_router = APIRouter(route_class=SlackRouteErrorHandler)
 """FastAPI router for all internal handlers."""
@@ -32,7 +43,125 @@ internal_router = APIRouter(route_class=SlackRouteErrorHandler)
     summary="Application metadata",
 )
 async def get_index() -> Metadata:
-    return get_metadata(
-        package_name="hoverdrive",
-        application_name=config.name,
+    return context_dependency.process_context.metadata
+
+
+class ServiceStats(BaseModel):
+    """Counters for the caches and the Ook connection pool."""
+
+    ook_pool: HttpPoolStats = Field(..., title="Ook connection pool")
+
+    ook_single_flight: SingleFlightStats = Field(
+        ..., title="Coalescing of concurrent Ook requests"
+    )
+
+    ook_circuit_breaker: CircuitBreakerStats | None = Field(
+        None, title="Ook circuit breaker, if enabled"
+    )
+
+    ook_admission: AdmissionStats | None = Field(
+        None, title="Ook admission control, if enabled"
+    )
+
+    ook_retry: RetryStats | None = Field(
+        None, title="Retries and hedges of Ook requests, if enabled"
+    )
+
+    column_prefetch: PrefetchStats | None = Field(
+        None, title="Prefetches of the column links of tables, if enabled"
+    )
+
+    link_cache: LinkCacheStats = Field(..., title="Link cache")
+
+    datalink_cache: ResponseCacheStats = Field(
+        ..., title="Serialized DataLink response cache"
+    )
+
+
+@internal_router.get(
+    "/stats",
+    description=(
+        "Return counters for the link caches and the Ook connection pool,"
+        " for sizing pods and tuning cache lifetimes. This route is not"
+        " exposed outside the cluster."
+    ),
+    include_in_schema=False,
+    summary="Service statistics",
+)
+async def get_stats() -> ServiceStats:
+    process_context = context_dependency.process_context
+    return ServiceStats(
+        ook_pool=process_context.ook_transport.get_stats(),
+        ook_single_flight=process_context.ook_single_flight.stats,
+        ook_circuit_breaker=(
+            process_context.ook_circuit_breaker.stats
+            if process_context.ook_circuit_breaker
+            else None
+        ),
+        ook_admission=(
+            process_context.ook_admission.stats
+            if process_context.ook_admission
+            else None
+        ),
+        ook_retry=(
+            process_context.ook_retry.stats
+            if process_context.ook_retry
+            else None
+        ),
+        column_prefetch=(
+            process_context.column_prefetcher.stats
+            if process_context.column_prefetcher
+            else None
+        ),
+        link_cache=process_context.link_cache.stats,
+        datalink_cache=process_context.datalink_cache.stats,
     )
+
+
+@internal_router.get(
+    "/metrics",
+    description=(
+        "Return request, Ook, and cache metrics in the Prometheus text"
+        " exposition format. This route is not exposed outside the cluster."
+    ),
+    include_in_schema=False,
+    response_class=Response,
+    summary="Prometheus metrics",
+)
+async def get_metrics() -> Response:
+    metrics = context_dependency.process_context.metrics
+    return Response(content=metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+class SdmLinksChange(BaseModel):
+    """Notification that Ook's links for an SDM schema or table changed."""
+
+    schema_name: str = Field(
+        ..., title="SDM schema name", examples=["dp02_dc2_catalogs"]
+    )
+
+    table_name: str | None = Field(
+        None,
+        title="Table name within the schema",
+        description="If omitted, every table of the schema is reloaded.",
+        examples=["Object"],
+    )
+
+
+@internal_router.post(
+    "/events/sdm-links-changed",
+    description=(
+        "Reload the links of an SDM schema or table from Ook after Ook has"
+        " ingested new documentation for it, replacing them in the link cache"
+        " and link index. Send this to every replica, since each has its own"
+        " link index, and its own link cache unless the cache backend is"
+        " shared. This route is not exposed outside the cluster."
+    ),
+    include_in_schema=False,
+    summary="Reload changed links",
+)
+async def post_sdm_links_changed(change: SdmLinksChange) -> LinkUpdateResult:
+    service = context_dependency.process_context.link_update_service
+    if change.table_name is None:
+        return await service.update_schema(change.schema_name)
+    return await service.update_table(change.schema_name, change.table_name)
@@ -0,0 +1,48 @@
+"""The logger of the request being handled.
+
+Services and clients are shared by every request, so they cannot hold the
+logger of any one request. The request context dependency instead records the
+request logger in a context variable, which is local to the task handling the
+request, and shared components look it up when they log.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+
+from structlog.stdlib import BoundLogger
+
+__all__ = ["get_request_logger", "set_request_logger"]
+
+_request_logger: ContextVar[BoundLogger | None] = ContextVar(
+    "hoverdrive_request_logger", default=None
+)
+
+
+def get_request_logger(default: BoundLogger) -> BoundLogger:
+    """Get the logger of the current request.
+
+    Parameters
+    ----------
+    default
+        Logger to return outside of a request, such as in background tasks
+        started at startup or in CLI commands.
+
+    Returns
+    -------
+    structlog.stdlib.BoundLogger
+        The request logger, bound with the request's context, or ``default``.
+    """
+    logger = _request_logger.get()
+    return default if logger is None else logger
+
+
+def set_request_logger(logger: BoundLogger) -> None:
+    """Set the logger of the current request.
+
+    Parameters
+    ----------
+    logger
+        The request logger.
+    """
+    _request_logger.set(logger)
@@ -12,7 +12,8 @@ from contextlib import asynccontextmanager
 from importlib.metadata import metadata, version
 
 import structlog
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from safir.fastapi import ClientRequestError, client_request_error_handler
 from safir.logging import configure_logging, configure_uvicorn_logging
 from safir.middleware.x_forwarded import XForwardedMiddleware
@@ -20,8 +21,10 @@ from safir.slack.webhook import SlackRouteErrorHandler
 
 from .config import config
 from .dependencies.context import context_dependency
+from .exceptions import UpstreamUnavailableError
 from .handlers.external import external_router
 from .handlers.internal import internal_router
+from .middleware import MetricsMiddleware, TimingMiddleware
 
 __all__ = ["app"]
 
@@ -31,6 +34,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     """Set up and tear down the application."""
     # Any code here will be run when the application starts up.
     await context_dependency.initialize()
+    if config.ook_preconnect:
+        await context_dependency.process_context.preconnect_ook()
+    if config.link_index_enabled:
+        await context_dependency.process_context.link_index_refresher.start()
 
     yield
 
@@ -38,6 +45,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     await context_dependency.aclose()
 
 
+async def upstream_unavailable_error_handler(
+    request: Request, exc: UpstreamUnavailableError
+) -> JSONResponse:
+    """Serialize an `UpstreamUnavailableError` with its ``Retry-After``."""
+    response = await client_request_error_handler(request, exc)
+    if exc.retry_after is not None:
+        response.headers["Retry-After"] = str(exc.retry_after)
+    return response
+
+
 configure_logging(
     profile=config.profile,
     log_level=config.log_level,
@@ -61,8 +78,13 @@ app.include_router(internal_router, include_in_schema=False)
 app.include_router(external_router, prefix=f"{config.path_prefix}")
 
 # Add middleware.
+app.add_middleware(TimingMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(XForwardedMiddleware)
 app.exception_handler(ClientRequestError)(client_request_error_handler)
+app.exception_handler(UpstreamUnavailableError)(
+    upstream_unavailable_error_handler
+)
 
 # Configure Slack alerts.
 if config.slack_webhook:
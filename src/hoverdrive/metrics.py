@@ -0,0 +1,257 @@
+"""Prometheus metrics.
+
+The metrics are kept in plain Python counters and rendered in the Prometheus
+text exposition format when scraped, so recording a sample costs a dict
+lookup and a few additions.
+"""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+
+__all__ = [
+    "PROMETHEUS_MEDIA_TYPE",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Metric",
+    "Metrics",
+]
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Media type of the Prometheus text exposition format."""
+
+_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Histogram buckets for latencies, in seconds."""
+
+
+class Metric(ABC):
+    """A named family of samples, one per combination of label values.
+
+    Label values are passed positionally in the order of ``label_names`` and
+    may be any value that converts to the intended string, such as an integer
+    status code. They are only converted when the metric is rendered.
+
+    Parameters
+    ----------
+    name
+        Metric name.
+    help_text
+        Description of the metric.
+    label_names
+        Names of the labels that distinguish samples.
+    """
+
+    type_name = "untyped"
+    """Prometheus type of the metric."""
+
+    def __init__(
+        self, name: str, help_text: str, label_names: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+
+    def render(self, lines: list[str]) -> None:
+        """Append the metric in the Prometheus text format to ``lines``."""
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} {self.type_name}")
+        self._render_samples(lines)
+
+    @abstractmethod
+    def _render_samples(self, lines: list[str]) -> None:
+        """Append the sample lines of the metric."""
+
+    def _labels(self, values: tuple[Hashable, ...], extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(str(value))}"'
+            for name, value in zip(self.label_names, values, strict=True)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(Metric):
+    """A value that only increases."""
+
+    type_name = "counter"
+
+    def __init__(
+        self, name: str, help_text: str, label_names: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(name, help_text, label_names)
+        self._values: dict[tuple[Hashable, ...], float] = {}
+
+    def inc(self, *label_values: Hashable, amount: float = 1) -> None:
+        """Increase the sample for the given label values."""
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def _render_samples(self, lines: list[str]) -> None:
+        for values, value in self._values.items():
+            labels = self._labels(values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+
+
+class Gauge(Counter):
+    """A value that may go up and down."""
+
+    type_name = "gauge"
+
+    def dec(self, *label_values: Hashable, amount: float = 1) -> None:
+        """Decrease the sample for the given label values."""
+        self._values[label_values] = self._values.get(label_values, 0) - amount
+
+    def set(self, value: float, *label_values: Hashable) -> None:
+        """Set the sample for the given label values."""
+        self._values[label_values] = value
+
+
+@dataclass(slots=True)
+class _HistogramSample:
+    counts: list[int]
+    """Number of observations in each bucket, not cumulative."""
+
+    total: float = 0.0
+
+    count: int = 0
+
+
+class Histogram(Metric):
+    """A distribution of observations in fixed buckets.
+
+    Parameters
+    ----------
+    name
+        Metric name.
+    help_text
+        Description of the metric.
+    label_names
+        Names of the labels that distinguish samples.
+    buckets
+        Upper bounds of the buckets, in increasing order. A final unbounded
+        bucket is added automatically.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = _LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, label_names)
+        self._buckets = buckets
+        self._samples: dict[tuple[Hashable, ...], _HistogramSample] = {}
+
+    def observe(self, value: float, *label_values: Hashable) -> None:
+        """Record an observation for the given label values."""
+        sample = self._samples.get(label_values)
+        if sample is None:
+            sample = _HistogramSample(counts=[0] * (len(self._buckets) + 1))
+            self._samples[label_values] = sample
+        sample.counts[bisect_left(self._buckets, value)] += 1
+        sample.total += value
+        sample.count += 1
+
+    def _render_samples(self, lines: list[str]) -> None:
+        bounds = [*self._buckets, math.inf]
+        for values, sample in self._samples.items():
+            cumulative = 0
+            for bound, count in zip(bounds, sample.counts, strict=True):
+                cumulative += count
+                labels = self._labels(values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = self._labels(values)
+            lines.append(f"{self.name}_sum{labels} {sample.total!r}")
+            lines.append(f"{self.name}_count{labels} {sample.count}")
+
+
+@dataclass(slots=True)
+class Metrics:
+    """The metrics recorded by hoverdrive.
+
+    Counters that other components already keep, such as cache statistics,
+    are not duplicated here. Instead, collectors registered with
+    `add_collector` convert them to metrics when the metrics are scraped.
+    """
+
+    http_request_duration: Histogram = field(
+        default_factory=lambda: Histogram(
+            "hoverdrive_http_request_duration_seconds",
+            "Time to respond to external requests, by route and status.",
+            ("route", "status"),
+        )
+    )
+    """Latency of external requests."""
+
+    http_requests_in_flight: Gauge = field(
+        default_factory=lambda: Gauge(
+            "hoverdrive_http_requests_in_flight",
+            "External requests currently being handled.",
+        )
+    )
+    """External requests currently being handled."""
+
+    ook_request_duration: Histogram = field(
+        default_factory=lambda: Histogram(
+            "hoverdrive_ook_request_duration_seconds",
+            "Time for Ook to respond, by HTTP status or error.",
+            ("status",),
+        )
+    )
+    """Latency of requests to Ook, whose counts are also the status counts."""
+
+    _collectors: list[Callable[[], Iterable[Metric]]] = field(
+        default_factory=list
+    )
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        """Add a function that provides more metrics at every scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        self.http_request_duration.render(lines)
+        self.http_requests_in_flight.render(lines)
+        self.ook_request_duration.render(lines)
+        for collector in self._collectors:
+            for metric in collector():
+                metric.render(lines)
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
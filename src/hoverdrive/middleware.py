@@ -0,0 +1,129 @@
+"""ASGI middleware for hoverdrive."""
+
+from __future__ import annotations
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import config
+from .dependencies.context import context_dependency
+from .timing import time_request
+
+__all__ = ["MetricsMiddleware", "TimingMiddleware"]
+
+
+def _is_under(path: str, prefix: str) -> bool:
+    """Check whether a path is the prefix or below it, so that
+    ``/hoverdrive`` doesn't also match ``/hoverdrive-other``.
+    """
+    return path == prefix or path.startswith(prefix + "/")
+
+
+class MetricsMiddleware:
+    """Record the latency and concurrency of external requests.
+
+    Only requests under the external path prefix are measured, so health
+    checks and metrics scrapes don't skew the results. Requests are labeled
+    with the path template of the route that handled them, rather than the
+    request path, to keep the number of samples bounded.
+
+    Parameters
+    ----------
+    app
+        The wrapped ASGI application.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+        self._prefix = config.path_prefix
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http" or not _is_under(
+            scope["path"], self._prefix
+        ):
+            await self._app(scope, receive, send)
+            return
+
+        metrics = context_dependency.process_context.metrics
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        metrics.http_requests_in_flight.inc()
+        try:
+            await self._app(scope, receive, send_with_status)
+        finally:
+            metrics.http_requests_in_flight.dec()
+            # FastAPI records the matched route in the scope. Depending on
+            # the FastAPI version, its path may be relative to the prefix the
+            # router was included with.
+            route = scope.get("route")
+            if route is not None:
+                path = route.path
+                if not _is_under(path, self._prefix):
+                    path = self._prefix + path
+                metrics.http_request_duration.observe(
+                    time.perf_counter() - start, path, status
+                )
+
+
+class TimingMiddleware:
+    """Time the stages of external requests.
+
+    If enabled, the stages timed with `~hoverdrive.timing.timed` while an
+    external request is handled are reported in a ``Server-Timing`` response
+    header, exported as spans, or both.
+
+    Parameters
+    ----------
+    app
+        The wrapped ASGI application.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+        self._prefix = config.path_prefix
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http" or not _is_under(
+            scope["path"], self._prefix
+        ):
+            await self._app(scope, receive, send)
+            return
+        exporter = context_dependency.process_context.span_exporter
+        server_timing = config.server_timing
+        if not (exporter or server_timing):
+            await self._app(scope, receive, send)
+            return
+
+        with time_request(scope["method"]) as timer:
+
+            async def send_with_timing(message: Message) -> None:
+                if server_timing and message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timer.server_timing())
+                await send(message)
+
+            try:
+                await self._app(scope, receive, send_with_timing)
+            finally:
+                if exporter:
+                    # Name the request span after the route template, as for
+                    # metrics, to keep the number of span names bounded.
+                    if route := scope.get("route"):
+                        path = route.path
+                        if not _is_under(path, self._prefix):
+                            path = self._prefix + path
+                        timer.name = f"{scope['method']} {path}"
+                    exporter.export(timer.finish())
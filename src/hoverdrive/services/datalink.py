@@ -0,0 +1,189 @@
+"""IVOA DataLink responses for documentation links."""
+
+from __future__ import annotations
+
+from xml.etree import ElementTree as ET
+
+from ..storage.linkcache import LinkKey
+from ..storage.ookapi import (
+    OokClient,
+    OokLinksArray,
+    OokLinksPayload,
+    parse_tap_table_name,
+)
+from ..storage.responsecache import ResponseCache
+
+__all__ = ["DATALINK_MEDIA_TYPE", "DataLinkService", "build_links_votable"]
+
+DATALINK_MEDIA_TYPE = "application/x-votable+xml;content=datalink"
+"""Media type of a DataLink ``{links}`` response."""
+
+_VOTABLE_NS = "http://www.ivoa.net/xml/VOTable/v1.3"
+
+_DATALINK_STANDARD_ID = "ivo://ivoa.net/std/DataLink#links-1.1"
+
+_FIELDS: list[dict[str, str]] = [
+    {"name": "ID", "ucd": "meta.id;meta.main"},
+    {"name": "access_url", "ucd": "meta.ref.url"},
+    {"name": "service_def", "ucd": "meta.ref"},
+    {"name": "error_message", "ucd": "meta.code.error"},
+    {"name": "semantics", "ucd": "meta.code"},
+    {"name": "description", "ucd": "meta.note"},
+    {"name": "content_type", "ucd": "meta.code.mime"},
+    {"name": "content_length", "ucd": "phys.size;meta.file"},
+    {"name": "local_semantics", "ucd": "meta.code"},
+]
+"""The DataLink columns, in order.
+
+Every column is a string except ``content_length``, which is a ``long``.
+``local_semantics`` carries the Ook link type, such as ``schema_browser``.
+"""
+
+ET.register_namespace("", _VOTABLE_NS)
+
+
+class DataLinkService:
+    """Build DataLink ``{links}`` VOTables of the documentation links for
+    tables and columns.
+
+    Parameters
+    ----------
+    ook_client
+        Client for the Ook API.
+    response_cache
+        Cache of serialized VOTables, keyed by ``(schema, table, column)``.
+    """
+
+    def __init__(
+        self,
+        *,
+        ook_client: OokClient,
+        response_cache: ResponseCache[LinkKey],
+    ) -> None:
+        self._ook_client = ook_client
+        self._response_cache = response_cache
+
+    async def get_column_links(
+        self, tap_table_name: str, column_name: str
+    ) -> bytes:
+        """Get the DataLink VOTable of every documentation link for a column.
+
+        Parameters
+        ----------
+        tap_table_name
+            The name of the TAP table.
+        column_name
+            The name of the column.
+
+        Returns
+        -------
+        bytes
+            The serialized VOTable.
+        """
+        schema_name, table_name = parse_tap_table_name(tap_table_name)
+        links = await self._ook_client.get_sdm_column_links(
+            tap_table_name, column_name
+        )
+        return self._serialize(
+            (schema_name, table_name, column_name),
+            f"{tap_table_name}.{column_name}",
+            links,
+        )
+
+    async def get_table_links(self, tap_table_name: str) -> bytes:
+        """Get the DataLink VOTable of every documentation link for a table.
+
+        Parameters
+        ----------
+        tap_table_name
+            The name of the TAP table.
+
+        Returns
+        -------
+        bytes
+            The serialized VOTable.
+        """
+        schema_name, table_name = parse_tap_table_name(tap_table_name)
+        links = await self._ook_client.get_sdm_table_links(tap_table_name)
+        return self._serialize(
+            (schema_name, table_name, None), tap_table_name, links
+        )
+
+    def _serialize(
+        self, key: LinkKey, entity_id: str, links: OokLinksPayload
+    ) -> bytes:
+        # Compare the JSON from Ook, so that the links are only decoded when
+        # the VOTable has to be rebuilt.
+        body = self._response_cache.get(key, links.data)
+        if body is None:
+            body = build_links_votable(entity_id, links.to_model())
+            self._response_cache.set(key, links.data, body)
+        return body
+
+
+def build_links_votable(entity_id: str, links: OokLinksArray) -> bytes:
+    """Serialize documentation links as a DataLink ``{links}`` VOTable.
+
+    Parameters
+    ----------
+    entity_id
+        The identifier of the table or column, used as the ``ID`` of every
+        row.
+    links
+        The documentation links. If there are none, the table contains a
+        single ``NotFoundFault`` error row, as DataLink requires.
+
+    Returns
+    -------
+    bytes
+        The UTF-8 encoded VOTable document.
+    """
+    votable = ET.Element(f"{{{_VOTABLE_NS}}}VOTABLE", version="1.3")
+    resource = ET.SubElement(
+        votable, f"{{{_VOTABLE_NS}}}RESOURCE", type="results"
+    )
+    ET.SubElement(
+        resource,
+        f"{{{_VOTABLE_NS}}}INFO",
+        name="standardID",
+        value=_DATALINK_STANDARD_ID,
+    )
+    table = ET.SubElement(resource, f"{{{_VOTABLE_NS}}}TABLE")
+    for field in _FIELDS:
+        if field["name"] == "content_length":
+            attrs = {"datatype": "long", "unit": "byte"}
+        else:
+            attrs = {"datatype": "char", "arraysize": "*"}
+        ET.SubElement(table, f"{{{_VOTABLE_NS}}}FIELD", {**field, **attrs})
+    data = ET.SubElement(table, f"{{{_VOTABLE_NS}}}DATA")
+    tabledata = ET.SubElement(data, f"{{{_VOTABLE_NS}}}TABLEDATA")
+
+    rows: list[list[str]] = []
+    for link in links.root:
+        description = (
+            f"{link.collection_title}: {link.title}"
+            if link.collection_title
+            else link.title
+        )
+        rows.append(
+            [
+                entity_id,
+                link.url,
+                "",
+                "",
+                "#documentation",
+                description,
+                "text/html",
+                "",
+                link.type,
+            ]
+        )
+    if not rows:
+        error = f"NotFoundFault: No documentation links for {entity_id}"
+        rows.append([entity_id, "", "", error, "", "", "", "", ""])
+
+    for row in rows:
+        tr = ET.SubElement(tabledata, f"{{{_VOTABLE_NS}}}TR")
+        for value in row:
+            ET.SubElement(tr, f"{{{_VOTABLE_NS}}}TD").text = value
+    return ET.tostring(votable, encoding="UTF-8", xml_declaration=True)
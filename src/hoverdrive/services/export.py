@@ -0,0 +1,108 @@
+"""Export of static redirect maps."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+
+from structlog.stdlib import BoundLogger
+
+from ..storage.linkindex import SdmLinkIndex
+from ..storage.redirectmap import (
+    RedirectMapFormat,
+    write_redirect_map,
+    write_table_files,
+)
+from .linkindex import LinkIndexRefresher
+
+__all__ = ["RedirectExportResult", "RedirectExportService"]
+
+
+@dataclass(slots=True, frozen=True)
+class RedirectExportResult:
+    """What an export wrote."""
+
+    redirects: int
+    """Number of redirects in the redirect map."""
+
+    table_files: int
+    """Number of per-table link files written."""
+
+
+class RedirectExportService:
+    """Write the redirects of the whole SDM links domain to static files.
+
+    The links are crawled from Ook by a full refresh of the link index, and
+    then written in a format that an ingress or CDN can serve redirects from
+    without calling hoverdrive.
+
+    Parameters
+    ----------
+    link_index
+        The link index to export.
+    link_index_refresher
+        Loads ``link_index`` from Ook.
+    logger
+        Logger for export progress.
+    """
+
+    def __init__(
+        self,
+        *,
+        link_index: SdmLinkIndex,
+        link_index_refresher: LinkIndexRefresher,
+        logger: BoundLogger,
+    ) -> None:
+        self._link_index = link_index
+        self._refresher = link_index_refresher
+        self._logger = logger
+
+    async def export(
+        self,
+        path: Path,
+        map_format: RedirectMapFormat,
+        *,
+        table_dir: Path | None = None,
+    ) -> RedirectExportResult:
+        """Crawl the links from Ook and write them out.
+
+        Parameters
+        ----------
+        path
+            Path of the redirect map to write.
+        map_format
+            Format of the redirect map.
+        table_dir
+            If given, also write the column links of each table to a JSON
+            file in this directory.
+
+        Returns
+        -------
+        RedirectExportResult
+            What was written.
+        """
+        await self._refresher.refresh()
+        schemas = self._link_index.schemas
+        redirects = await asyncio.to_thread(
+            write_redirect_map, schemas, path, map_format
+        )
+        self._logger.info(
+            "Wrote redirect map",
+            path=str(path),
+            format=map_format.value,
+            redirects=redirects,
+        )
+        table_files = 0
+        if table_dir:
+            table_files = await asyncio.to_thread(
+                write_table_files, schemas, table_dir
+            )
+            self._logger.info(
+                "Wrote table link files",
+                path=str(table_dir),
+                files=table_files,
+            )
+        return RedirectExportResult(
+            redirects=redirects, table_files=table_files
+        )
@@ -0,0 +1,172 @@
+"""Preloading and periodic refresh of the SDM link index."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from datetime import UTC, datetime, timedelta
+
+from structlog.stdlib import BoundLogger
+
+from ..storage.crawler import OokCrawler
+from ..storage.linkindex import (
+    ColumnLinks,
+    SdmLinkIndex,
+    SdmSchemaIndex,
+    SdmTableIndex,
+)
+from ..storage.ookapi import OokClient
+from ..storage.snapshot import LinkSnapshotStore
+from .ranking import LinkRanker
+
+__all__ = ["LinkIndexRefresher"]
+
+
+class LinkIndexRefresher:
+    """Load the whole SDM links domain from Ook into a `SdmLinkIndex`.
+
+    Parameters
+    ----------
+    index
+        The index to populate. Each refresh builds a complete replacement and
+        swaps it in at once.
+    ook_client
+        Client used to walk the SDM links domain.
+    interval
+        Time between the end of one refresh and the start of the next.
+    logger
+        Logger for refresh progress and failures.
+    ranker
+        Policy for choosing the link of each entity. By default, the first
+        link from Ook is chosen.
+    snapshot_store
+        If provided, the index is loaded from this snapshot at startup, and
+        the snapshot is rewritten after every successful refresh.
+    crawler
+        Crawler of the SDM links domain. By default, a crawler of
+        ``ook_client`` without a rate limit is used.
+    """
+
+    def __init__(
+        self,
+        *,
+        index: SdmLinkIndex,
+        ook_client: OokClient,
+        interval: timedelta,
+        logger: BoundLogger,
+        ranker: LinkRanker | None = None,
+        snapshot_store: LinkSnapshotStore | None = None,
+        crawler: OokCrawler | None = None,
+    ) -> None:
+        self._index = index
+        self._interval = interval.total_seconds()
+        self._logger = logger
+        self._ranker = ranker or LinkRanker()
+        self._snapshot_store = snapshot_store
+        self._crawler = crawler or OokCrawler(
+            ook_client=ook_client, logger=logger
+        )
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Load the index and start refreshing it in the background.
+
+        If a snapshot is available, the index is loaded from it and the first
+        refresh from Ook happens in the background once the snapshot is older
+        than the refresh interval. Otherwise the index is loaded from Ook
+        before returning. A failure of that initial load is logged rather
+        than raised so that the application still starts; lookups fall back
+        to Ook until a later refresh succeeds.
+        """
+        first_delay = self._interval
+        snapshot_age = await self._load_snapshot()
+        if snapshot_age is None:
+            await self._refresh_logging_errors()
+        else:
+            first_delay = max(0.0, self._interval - snapshot_age)
+        self._task = asyncio.create_task(self._run(first_delay))
+
+    async def stop(self) -> None:
+        """Stop the background refresh, if running."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def refresh(self) -> None:
+        """Rebuild the index from Ook and swap it in."""
+        schemas: SdmSchemaIndex = {}
+        columns: dict[tuple[str, str], dict[str, str]] = {}
+        async for entry in self._crawler.crawl():
+            tables = schemas.setdefault(entry.schema_name, {})
+            if entry.table_name is None:
+                continue
+            link = self._ranker.best_url(entry.links)
+            if entry.column_name is None:
+                tables[entry.table_name] = SdmTableIndex(link=link)
+            elif link:
+                key = (entry.schema_name, entry.table_name)
+                columns.setdefault(key, {})[entry.column_name] = link
+        for (schema_name, table_name), links in columns.items():
+            schemas[schema_name][table_name].columns = ColumnLinks(links)
+
+        self._index.replace(schemas)
+        self._logger.info(
+            "Refreshed SDM link index",
+            schemas=len(schemas),
+            tables=len(self._index),
+        )
+        if self._snapshot_store:
+            try:
+                await asyncio.to_thread(
+                    self._snapshot_store.save,
+                    schemas,
+                    ranking=self._ranker.key,
+                )
+            except Exception as e:
+                self._logger.exception(
+                    "Failed to save SDM link index snapshot", error=str(e)
+                )
+
+    async def _load_snapshot(self) -> float | None:
+        """Load the index from the snapshot, returning its age in seconds.
+
+        A snapshot ranked with a different policy is still served, but is
+        reported as infinitely old so that it is refreshed right away.
+        """
+        if not self._snapshot_store:
+            return None
+        try:
+            snapshot = await asyncio.to_thread(self._snapshot_store.load)
+        except Exception as e:
+            self._logger.exception(
+                "Failed to load SDM link index snapshot", error=str(e)
+            )
+            return None
+        if snapshot is None:
+            return None
+        self._index.replace(snapshot.schemas, loaded_at=snapshot.created_at)
+        age = datetime.now(tz=UTC) - snapshot.created_at
+        self._logger.info(
+            "Loaded SDM link index snapshot",
+            tables=len(self._index),
+            age_seconds=int(age.total_seconds()),
+        )
+        if snapshot.ranking != self._ranker.key:
+            self._logger.info("Link ranking policy changed since snapshot")
+            return math.inf
+        return age.total_seconds()
+
+    async def _run(self, first_delay: float) -> None:
+        await asyncio.sleep(first_delay)
+        while True:
+            await self._refresh_logging_errors()
+            await asyncio.sleep(self._interval)
+
+    async def _refresh_logging_errors(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            self._logger.exception(
+                "Failed to refresh SDM link index", error=str(e)
+            )
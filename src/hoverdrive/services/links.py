@@ -2,16 +2,63 @@
 
 from __future__ import annotations
 
-from hoverdrive.storage.ookapi import OokClient
+import asyncio
+
+from hoverdrive.storage.linkindex import SdmLinkIndex
+from hoverdrive.storage.ookapi import OokClient, parse_tap_table_name
+from hoverdrive.storage.prefetch import Prefetcher
+
+from ..exceptions import UpstreamUnavailableError
+from ..timing import timed
+from .ranking import LinkRanker
 
 __all__ = ["LinksService"]
 
 
 class LinksService:
-    """A service for getting links."""
+    """A service for getting links.
+
+    Parameters
+    ----------
+    ook_client
+        Client for the Ook API.
+    link_index
+        If provided, redirect links are looked up in this preloaded index
+        first, once it has been loaded, and Ook is only queried for entities
+        the index doesn't know.
+    ranker
+        Policy for choosing the link to redirect to. By default, the first
+        link from Ook is chosen.
+    batch_concurrency
+        Maximum number of concurrent Ook lookups when resolving links for a
+        list of columns.
+    prefetcher
+        If provided, the first time a table, or one of its columns, is looked
+        up in Ook, the links of all of its columns are prefetched into the
+        link cache with this prefetcher, since hovers over the other columns
+        of the table usually follow.
+    """
 
-    def __init__(self, ook_client: OokClient) -> None:
+    def __init__(
+        self,
+        ook_client: OokClient,
+        link_index: SdmLinkIndex | None = None,
+        *,
+        ranker: LinkRanker | None = None,
+        batch_concurrency: int = 10,
+        prefetcher: Prefetcher[tuple[str, str]] | None = None,
+    ) -> None:
         self._ook_client = ook_client
+        self._link_index = link_index
+        self._ranker = ranker or LinkRanker()
+        self._batch_concurrency = batch_concurrency
+        self._prefetcher = prefetcher
+
+    @property
+    def _loaded_link_index(self) -> SdmLinkIndex | None:
+        if self._link_index is not None and self._link_index.is_loaded:
+            return self._link_index
+        return None
 
     async def get_redirect_link_for_column(
         self, tap_table_name: str, column_name: str
@@ -19,14 +66,22 @@ class LinksService:
         """Get the most relevant documentation link for this column to use
         as a redirect.
         """
+        if (link_index := self._loaded_link_index) is not None:
+            with timed("index"):
+                schema_name, table_name = parse_tap_table_name(tap_table_name)
+                link = link_index.get_column_link(
+                    schema_name, table_name, column_name
+                )
+            if link:
+                return link
+
         links = await self._ook_client.get_sdm_column_links(
             tap_table_name, column_name
         )
-        if len(links.root) == 0:
-            return None
-        # TODO(jonathansick): preferentiallly get specific types of links,
-        # like "schema_browser"
-        return links.root[0].url
+        link = links.best_url(self._ranker)
+        if link:
+            self._prefetch_columns(tap_table_name)
+        return link
 
     async def get_redirect_link_for_table(
         self, tap_table_name: str
@@ -34,9 +89,95 @@ class LinksService:
         """Get the most relevant documentation link for this table to use
         as a redirect.
         """
+        if (link_index := self._loaded_link_index) is not None:
+            with timed("index"):
+                schema_name, table_name = parse_tap_table_name(tap_table_name)
+                link = link_index.get_table_link(schema_name, table_name)
+            if link:
+                return link
+
         links = await self._ook_client.get_sdm_table_links(tap_table_name)
-        if len(links.root) == 0:
-            return None
-        # TODO(jonathansick): preferentiallly get specific types of links,
-        # like "schema_browser"
-        return links.root[0].url
+        link = links.best_url(self._ranker)
+        if link:
+            self._prefetch_columns(tap_table_name)
+        return link
+
+    async def get_redirect_links_for_columns(
+        self, tap_table_name: str, column_names: list[str] | None = None
+    ) -> dict[str, str | None]:
+        """Get the most relevant documentation link for many columns of a
+        table at once.
+
+        Parameters
+        ----------
+        tap_table_name
+            The name of the TAP table.
+        column_names
+            The columns to resolve. If `None`, every documented column of the
+            table is returned, using a single table-level query to Ook.
+
+        Returns
+        -------
+        dict
+            Mapping of column name to its documentation link. Requested
+            columns without any documentation, or whose lookup in Ook
+            failed, map to `None`.
+
+        Raises
+        ------
+        UpstreamUnavailableError
+            Raised if the lookup in Ook failed for every requested column.
+        """
+        if column_names is None:
+            return await self._get_all_column_links(tap_table_name)
+
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
+        errors: list[UpstreamUnavailableError] = []
+
+        async def resolve(column_name: str) -> str | None:
+            async with semaphore:
+                try:
+                    return await self.get_redirect_link_for_column(
+                        tap_table_name, column_name
+                    )
+                except UpstreamUnavailableError as e:
+                    errors.append(e)
+                    return None
+
+        unique_names = list(dict.fromkeys(column_names))
+        links = await asyncio.gather(*(resolve(c) for c in unique_names))
+        if errors and len(errors) == len(unique_names):
+            raise errors[0]
+        return dict(zip(unique_names, links, strict=True))
+
+    async def _get_all_column_links(
+        self, tap_table_name: str
+    ) -> dict[str, str | None]:
+        schema_name, table_name = parse_tap_table_name(tap_table_name)
+        if (link_index := self._loaded_link_index) is not None:
+            table = link_index.get_table(schema_name, table_name)
+            if table:
+                return dict(table.columns)
+
+        columns = await self._ook_client.get_sdm_columns(
+            schema_name, table_name
+        )
+        links = {
+            column.name: self._ranker.best_url(column.links)
+            for column in columns
+        }
+        return {name: url for name, url in links.items() if url}
+
+    def _prefetch_columns(self, tap_table_name: str) -> None:
+        """Prefetch the column links of a table in the background, if
+        enabled and not already done.
+        """
+        if self._prefetcher is None:
+            return
+        schema_name, table_name = parse_tap_table_name(tap_table_name)
+        self._prefetcher.schedule(
+            (schema_name, table_name),
+            lambda: self._ook_client.prefetch_sdm_columns(
+                schema_name, table_name
+            ),
+        )
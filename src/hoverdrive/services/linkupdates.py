@@ -0,0 +1,214 @@
+"""Updates of hoverdrive's links when Ook reports that they changed."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from structlog.stdlib import BoundLogger
+
+from ..storage.linkcache import LinkCache, LinkKey
+from ..storage.linkindex import ColumnLinks, SdmLinkIndex, SdmTableIndex
+from ..storage.ookapi import OokClient, OokLink, OokLinksArray, OokLinksPayload
+from .ranking import LinkRanker
+
+__all__ = ["LinkUpdateResult", "LinkUpdateService"]
+
+
+@dataclass(slots=True)
+class LinkUpdateResult:
+    """What an update changed."""
+
+    tables: int = 0
+    """Tables whose links were reloaded from Ook."""
+
+    columns: int = 0
+    """Columns whose cached links were replaced."""
+
+    removed: int = 0
+    """Tables and columns no longer in Ook whose links were dropped."""
+
+
+class LinkUpdateService:
+    """Reload the links of an SDM schema or table after Ook changes them.
+
+    The links are reloaded with a single paginated Ook request per table, for
+    all of its columns at once, and replace the entries for that schema or
+    table in the link cache and the link index. Everything else is left
+    alone. Notifying hoverdrive of every change in Ook therefore allows very
+    long cache lifetimes without serving outdated links.
+
+    Parameters
+    ----------
+    ook_client
+        Client for the Ook API.
+    link_cache
+        The link cache whose entries are replaced.
+    link_index
+        The link index whose tables are replaced, once it has been loaded.
+    ranker
+        Policy for choosing the link of each entity.
+    logger
+        Logger for the updates.
+    concurrency
+        Maximum number of tables whose column links are fetched at once when
+        a schema is updated.
+    """
+
+    def __init__(
+        self,
+        *,
+        ook_client: OokClient,
+        link_cache: LinkCache,
+        link_index: SdmLinkIndex,
+        ranker: LinkRanker,
+        logger: BoundLogger,
+        concurrency: int = 8,
+    ) -> None:
+        self._ook_client = ook_client
+        self._link_cache = link_cache
+        self._link_index = link_index
+        self._ranker = ranker
+        self._logger = logger
+        self._concurrency = concurrency
+
+    async def update_schema(self, schema_name: str) -> LinkUpdateResult:
+        """Reload the links of a schema and of all of its tables.
+
+        Parameters
+        ----------
+        schema_name
+            The name of the SDM schema.
+
+        Returns
+        -------
+        LinkUpdateResult
+            What the update changed.
+        """
+        result = LinkUpdateResult()
+        ook_tables = await self._ook_client.get_sdm_tables(schema_name)
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def load(
+            table_name: str, links: list[OokLink]
+        ) -> tuple[str, SdmTableIndex]:
+            async with semaphore:
+                return table_name, await self._load_table(
+                    schema_name, table_name, links, result
+                )
+
+        tables = dict(
+            await asyncio.gather(*(load(t.name, t.links) for t in ook_tables))
+        )
+        for table_name in (
+            self._link_index.get_tables(schema_name).keys() - tables
+        ):
+            await self._drop_table(schema_name, table_name, result)
+        if self._link_index.is_loaded:
+            self._link_index.replace_schema(schema_name, tables)
+        self._log_update(result, schema=schema_name)
+        return result
+
+    async def update_table(
+        self, schema_name: str, table_name: str
+    ) -> LinkUpdateResult:
+        """Reload the links of a table and of all of its columns.
+
+        Parameters
+        ----------
+        schema_name
+            The name of the SDM schema.
+        table_name
+            The name of the table within the schema.
+
+        Returns
+        -------
+        LinkUpdateResult
+            What the update changed.
+        """
+        result = LinkUpdateResult()
+        # The table's own links come from the request that the link cache
+        # makes, so drop the table's entry and let the cache reload it.
+        await self._link_cache.invalidate((schema_name, table_name, None))
+        links = await self._ook_client.get_sdm_table_links(
+            f"{schema_name}.{table_name}"
+        )
+        table = await self._load_table(schema_name, table_name, None, result)
+        table.link = links.best_url(self._ranker)
+        if self._link_index.is_loaded:
+            if table.link or table.columns:
+                self._link_index.replace_table(schema_name, table_name, table)
+            else:
+                self._link_index.replace_table(schema_name, table_name, None)
+        self._log_update(result, schema=schema_name, table=table_name)
+        return result
+
+    async def _load_table(
+        self,
+        schema_name: str,
+        table_name: str,
+        links: list[OokLink] | None,
+        result: LinkUpdateResult,
+    ) -> SdmTableIndex:
+        """Replace the cached links of a table's columns.
+
+        If ``links`` is given, they also replace the table's own entry.
+        Columns that were in the link index but are no longer in Ook are
+        dropped from the cache. Removals can only be found this way, so
+        without a link index, the cache entries of removed columns expire on
+        their own.
+        """
+        table = SdmTableIndex()
+        if links is not None:
+            table.link = await self._store(
+                (schema_name, table_name, None), links
+            )
+        columns = await self._ook_client.get_sdm_columns(
+            schema_name, table_name
+        )
+        column_links = {}
+        for column in columns:
+            link = await self._store(
+                (schema_name, table_name, column.name), column.links
+            )
+            if link:
+                column_links[column.name] = link
+        table.columns = ColumnLinks(column_links)
+        result.tables += 1
+        result.columns += len(columns)
+
+        indexed = self._link_index.get_tables(schema_name).get(table_name)
+        if indexed:
+            current = {column.name for column in columns}
+            for column_name in indexed.columns.keys() - current:
+                key = (schema_name, table_name, column_name)
+                await self._link_cache.invalidate(key)
+                result.removed += 1
+        return table
+
+    async def _drop_table(
+        self, schema_name: str, table_name: str, result: LinkUpdateResult
+    ) -> None:
+        indexed = self._link_index.get_tables(schema_name).get(table_name)
+        await self._link_cache.invalidate((schema_name, table_name, None))
+        result.removed += 1
+        if indexed:
+            for column_name in indexed.columns:
+                key = (schema_name, table_name, column_name)
+                await self._link_cache.invalidate(key)
+                result.removed += 1
+
+    async def _store(self, key: LinkKey, links: list[OokLink]) -> str | None:
+        payload = OokLinksPayload.from_model(OokLinksArray(links))
+        best_url = payload.best_url(self._ranker)
+        await self._link_cache.set(key, payload)
+        return best_url
+
+    def _log_update(self, result: LinkUpdateResult, **entity: str) -> None:
+        self._logger.info(
+            "Reloaded changed links from Ook",
+            **entity,
+            tables=result.tables,
+            columns=result.columns,
+            removed=result.removed,
+        )
@@ -0,0 +1,91 @@
+"""Choice of the documentation link to redirect to."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable, Sequence
+
+from ..config import LinkFallback
+from ..storage.ookapi import OokLink, OokLinkTarget
+
+__all__ = ["LinkRanker"]
+
+
+class LinkRanker:
+    """Choose the best documentation link to redirect to.
+
+    Links are ranked first by the position of their type in
+    ``type_priority``, then by the position of their collection title in
+    ``collection_priority``, and finally by their order in Ook's response.
+    Types and collections that are not listed rank after every listed one.
+
+    Parameters
+    ----------
+    type_priority
+        Link types, most preferred first.
+    collection_priority
+        Titles of documentation collections, most preferred first.
+    fallback
+        What to do with links that match neither a listed type nor a listed
+        collection.
+    """
+
+    def __init__(
+        self,
+        *,
+        type_priority: Sequence[str] = (),
+        collection_priority: Sequence[str] = (),
+        fallback: LinkFallback = LinkFallback.first,
+    ) -> None:
+        self._type_ranks = {t: i for i, t in enumerate(type_priority)}
+        self._collection_ranks = {
+            c: i for i, c in enumerate(collection_priority)
+        }
+        self._unranked = (len(self._type_ranks), len(self._collection_ranks))
+        self._fallback = fallback
+        policy = [list(type_priority), list(collection_priority), fallback]
+        digest = hashlib.sha256(json.dumps(policy).encode()).hexdigest()
+        self.key = digest[:16]
+        """Identifies the policy, so that links ranked with a different
+        policy, such as by another version of the configuration, can be
+        recognized and ranked again.
+        """
+
+    def best_url(self, links: Iterable[OokLinkTarget | OokLink]) -> str | None:
+        """Choose the link to redirect to.
+
+        Parameters
+        ----------
+        links
+            The links, in Ook's order.
+
+        Returns
+        -------
+        str or None
+            URL of the best link, or `None` if there are no links or, if the
+            policy does not fall back to unlisted links, none of them match
+            the listed types or collections.
+        """
+        best_url = None
+        best_rank = None
+        for link in links:
+            if isinstance(link, OokLink):
+                url, link_type = link.url, link.type
+                collection = link.collection_title
+            else:
+                url, link_type = link["url"], link["type"]
+                collection = link.get("collection_title")
+            rank = (
+                self._type_ranks.get(link_type, self._unranked[0]),
+                self._collection_ranks.get(
+                    collection or "", self._unranked[1]
+                ),
+            )
+            if rank == self._unranked and self._fallback == LinkFallback.none:
+                continue
+            if best_rank is None or rank < best_rank:
+                best_url, best_rank = url, rank
+                if rank == (0, 0):
+                    break
+        return best_url
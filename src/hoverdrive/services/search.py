@@ -0,0 +1,102 @@
+"""Search of documented SDM table and column names."""
+
+from __future__ import annotations
+
+import asyncio
+
+from structlog.stdlib import BoundLogger
+
+from ..exceptions import EndpointNotImplementedError, UpstreamUnavailableError
+from ..storage.linkindex import SdmLinkIndex
+from ..storage.nameindex import SdmNameIndex, SdmNameMatch
+
+__all__ = ["SearchService"]
+
+
+class SearchService:
+    """Find documented tables and columns by name, as the user types.
+
+    Searches are answered from an `~hoverdrive.storage.nameindex.SdmNameIndex`
+    of the link index, which is rebuilt in a thread whenever the link index
+    changes. While it is rebuilt, searches are answered from the previous
+    one, so that no keystroke waits for a rebuild once the first index has
+    been built.
+
+    Parameters
+    ----------
+    link_index
+        The link index whose entities are searched.
+    enabled
+        Whether the link index is loaded at all. Without it, there is nothing
+        to search.
+    logger
+        Logger for rebuilds of the search index.
+    """
+
+    def __init__(
+        self, *, link_index: SdmLinkIndex, enabled: bool, logger: BoundLogger
+    ) -> None:
+        self._link_index = link_index
+        self._enabled = enabled
+        self._logger = logger
+        self._name_index: SdmNameIndex | None = None
+        self._version = -1
+        self._rebuild: asyncio.Task[SdmNameIndex] | None = None
+
+    async def search(self, query: str, limit: int) -> list[SdmNameMatch]:
+        """Find the tables and columns whose names match a query.
+
+        Parameters
+        ----------
+        query
+            The prefix or fragment typed so far.
+        limit
+            Maximum number of matches.
+
+        Returns
+        -------
+        list of SdmNameMatch
+            The best matches, best first. See
+            `~hoverdrive.storage.nameindex.SdmNameIndex.search` for how they
+            are matched and ranked.
+
+        Raises
+        ------
+        EndpointNotImplementedError
+            Raised if the link index is disabled.
+        UpstreamUnavailableError
+            Raised if the link index has not been loaded yet.
+        """
+        name_index = await self._get_name_index()
+        return name_index.search(query, limit)
+
+    async def _get_name_index(self) -> SdmNameIndex:
+        if not self._enabled:
+            msg = "Search requires the link index, which is disabled"
+            raise EndpointNotImplementedError(msg)
+        if not self._link_index.is_loaded:
+            msg = "The link index has not been loaded yet"
+            raise UpstreamUnavailableError(msg, retry_after=5)
+        if self._version != self._link_index.version and not self._rebuild:
+            self._rebuild = asyncio.create_task(self._build())
+        if self._name_index is not None:
+            return self._name_index
+        if self._rebuild is None:
+            raise RuntimeError("Search index neither built nor building")
+        # Only the first build is awaited, and by every search that arrives
+        # before it finishes.
+        return await asyncio.shield(self._rebuild)
+
+    async def _build(self) -> SdmNameIndex:
+        version = self._link_index.version
+        schemas = self._link_index.schemas
+        try:
+            name_index = await asyncio.to_thread(SdmNameIndex.build, schemas)
+        finally:
+            self._rebuild = None
+        self._name_index = name_index
+        self._version = version
+        self._logger.debug(
+            "Rebuilt search index", version=version, names=len(name_index)
+        )
+        return name_index
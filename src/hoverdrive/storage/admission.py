@@ -0,0 +1,119 @@
+"""Admission control for calls to an upstream service."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+
+from ..exceptions import UpstreamOverloadedError
+from ..timing import timed
+
+__all__ = ["AdmissionLimiter", "AdmissionStats"]
+
+
+@dataclass(slots=True)
+class AdmissionStats:
+    """State and counters of an `AdmissionLimiter`."""
+
+    in_flight: int = 0
+    """Calls currently admitted."""
+
+    waiting: int = 0
+    """Calls currently waiting to be admitted."""
+
+    admitted: int = 0
+    """Calls admitted, immediately or after waiting."""
+
+    queued: int = 0
+    """Calls that had to wait before being admitted or rejected."""
+
+    rejected: int = 0
+    """Calls rejected without waiting because the queue was full."""
+
+    timed_out: int = 0
+    """Calls rejected because they waited too long."""
+
+
+class AdmissionLimiter:
+    """Cap the number of concurrent calls to an upstream service.
+
+    Up to ``max_in_flight`` calls are admitted at once. Further calls wait, in
+    order of arrival, for up to ``queue_timeout``, but only ``max_queued`` of
+    them at a time: once the queue is full, or once a call has waited too
+    long, it is rejected with `~hoverdrive.exceptions.UpstreamOverloadedError`.
+    Under a burst of requests, the upstream service therefore sees a bounded
+    load, and the requests that cannot be served in time fail fast with a
+    hint of when to retry instead of piling up until they time out.
+
+    Parameters
+    ----------
+    max_in_flight
+        Maximum number of calls admitted at once.
+    max_queued
+        Maximum number of calls waiting to be admitted.
+    queue_timeout
+        Maximum time a call waits to be admitted.
+    """
+
+    def __init__(
+        self, *, max_in_flight: int, max_queued: int, queue_timeout: timedelta
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._max_queued = max_queued
+        self._queue_timeout = queue_timeout.total_seconds()
+        self._retry_after = max(1, math.ceil(self._queue_timeout))
+        self.stats = AdmissionStats()
+
+    @property
+    def has_capacity(self) -> bool:
+        """Whether a call would be admitted without waiting."""
+        return not self._semaphore.locked()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of a call.
+
+        Raises
+        ------
+        hoverdrive.exceptions.UpstreamOverloadedError
+            Raised if the queue is full or if no slot became free within the
+            queue timeout.
+        """
+        if self._semaphore.locked():
+            await self._wait()
+        else:
+            await self._semaphore.acquire()
+        self.stats.admitted += 1
+        self.stats.in_flight += 1
+        try:
+            yield
+        finally:
+            self.stats.in_flight -= 1
+            self._semaphore.release()
+
+    async def _wait(self) -> None:
+        """Wait in the queue for a slot."""
+        if self.stats.waiting >= self._max_queued:
+            self.stats.rejected += 1
+            raise UpstreamOverloadedError(
+                "Too many requests waiting on Ook",
+                retry_after=self._retry_after,
+            )
+        self.stats.queued += 1
+        self.stats.waiting += 1
+        try:
+            with timed("queue"):
+                async with asyncio.timeout(self._queue_timeout):
+                    await self._semaphore.acquire()
+        except TimeoutError:
+            self.stats.timed_out += 1
+            raise UpstreamOverloadedError(
+                "Timed out waiting to query Ook",
+                retry_after=self._retry_after,
+            ) from None
+        finally:
+            self.stats.waiting -= 1
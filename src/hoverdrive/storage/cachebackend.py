@@ -0,0 +1,266 @@
+"""Storage backends for cached link data."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from ..exceptions import CacheBackendError
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+]
+
+
+class CacheBackend(ABC):
+    """A key-value store of serialized cache entries with expiration."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Get the value of a key, or `None` if it is missing or expired.
+
+        Raises
+        ------
+        CacheBackendError
+            Raised if the store could not be reached.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: timedelta) -> None:
+        """Store a value that expires after ``ttl``.
+
+        Raises
+        ------
+        CacheBackendError
+            Raised if the store could not be reached.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete a key, if present.
+
+        Raises
+        ------
+        CacheBackendError
+            Raised if the store could not be reached.
+        """
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        """Release any resources held by the backend."""
+
+
+@dataclass(slots=True)
+class _MemoryEntry:
+    value: bytes
+    expires_at: float
+
+
+class MemoryCacheBackend(CacheBackend):
+    """A size-bounded, in-process LRU store.
+
+    Parameters
+    ----------
+    max_size
+        Maximum number of keys to hold. The least recently used key is
+        evicted when the store is full. Set to 0 to store nothing.
+    """
+
+    def __init__(self, *, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[str, _MemoryEntry] = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    async def set(self, key: str, value: bytes, ttl: timedelta) -> None:
+        if self._max_size <= 0:
+            return
+        expires_at = time.monotonic() + ttl.total_seconds()
+        self._entries[key] = _MemoryEntry(value=value, expires_at=expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def aclose(self) -> None:
+        self._entries.clear()
+
+
+type _RespValue = bytes | int | list[_RespValue] | None
+
+
+@dataclass(slots=True)
+class _RedisConnection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+
+class RedisCacheBackend(CacheBackend):
+    """A store shared between replicas, speaking the Redis protocol.
+
+    This is a minimal RESP2 client supporting only the commands the cache
+    needs, with a small pool of reusable connections. Any Redis-compatible
+    server can be used.
+
+    Parameters
+    ----------
+    host
+        Server hostname.
+    port
+        Server port.
+    password
+        Password to authenticate with, if any.
+    database
+        Database number to select.
+    key_prefix
+        Prepended to every key, so that the database can be shared.
+    max_connections
+        Maximum number of concurrent connections to the server.
+    timeout
+        Timeout for connecting and for each command.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int = 6379,
+        password: str | None = None,
+        database: int = 0,
+        key_prefix: str = "hoverdrive:",
+        max_connections: int = 10,
+        timeout: timedelta = timedelta(seconds=1),
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._password = password
+        self._database = database
+        self._key_prefix = key_prefix
+        self._timeout = timeout.total_seconds()
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: list[_RedisConnection] = []
+
+    async def get(self, key: str) -> bytes | None:
+        reply = await self._execute(b"GET", self._key(key))
+        if reply is not None and not isinstance(reply, bytes):
+            raise CacheBackendError(f"Unexpected reply to GET: {reply!r}")
+        return reply
+
+    async def set(self, key: str, value: bytes, ttl: timedelta) -> None:
+        milliseconds = int(ttl.total_seconds() * 1000)
+        if milliseconds <= 0:
+            await self.delete(key)
+            return
+        await self._execute(
+            b"SET", self._key(key), value, b"PX", str(milliseconds).encode()
+        )
+
+    async def delete(self, key: str) -> None:
+        await self._execute(b"DEL", self._key(key))
+
+    async def aclose(self) -> None:
+        while self._idle:
+            connection = self._idle.pop()
+            connection.writer.close()
+
+    def _key(self, key: str) -> bytes:
+        return f"{self._key_prefix}{key}".encode()
+
+    async def _execute(self, *args: bytes) -> _RespValue:
+        async with self._slots:
+            connection = None
+            try:
+                async with asyncio.timeout(self._timeout):
+                    connection = await self._acquire()
+                    reply = await self._command(connection, *args)
+            except CacheBackendError:
+                # The server answered with an error reply, so the connection
+                # is still in a usable state.
+                if connection:
+                    self._idle.append(connection)
+                raise
+            except (OSError, TimeoutError, asyncio.IncompleteReadError) as e:
+                if connection:
+                    connection.writer.close()
+                msg = f"Redis command {args[0].decode()} failed: {e!s}"
+                raise CacheBackendError(msg) from e
+            except BaseException:
+                # Cancelled mid-command, so the reply may still be pending.
+                if connection:
+                    connection.writer.close()
+                raise
+            self._idle.append(connection)
+            return reply
+
+    async def _acquire(self) -> _RedisConnection:
+        if self._idle:
+            return self._idle.pop()
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        connection = _RedisConnection(reader=reader, writer=writer)
+        try:
+            if self._password:
+                await self._command(
+                    connection, b"AUTH", self._password.encode()
+                )
+            if self._database:
+                await self._command(
+                    connection, b"SELECT", str(self._database).encode()
+                )
+        except BaseException:
+            writer.close()
+            raise
+        return connection
+
+    async def _command(
+        self, connection: _RedisConnection, *args: bytes
+    ) -> _RespValue:
+        parts = [b"*%d\r\n" % len(args)]
+        parts.extend(b"$%d\r\n%b\r\n" % (len(arg), arg) for arg in args)
+        connection.writer.write(b"".join(parts))
+        await connection.writer.drain()
+        return await self._read_reply(connection.reader)
+
+    async def _read_reply(self, reader: asyncio.StreamReader) -> _RespValue:
+        line = await reader.readuntil(b"\r\n")
+        kind, payload = line[:1], line[1:-2]
+        match kind:
+            case b"+":
+                return payload
+            case b"-":
+                raise CacheBackendError(f"Redis error: {payload.decode()}")
+            case b":":
+                return int(payload)
+            case b"$":
+                length = int(payload)
+                if length < 0:
+                    return None
+                data = await reader.readexactly(length + 2)
+                return data[:-2]
+            case b"*":
+                count = int(payload)
+                if count < 0:
+                    return None
+                return [await self._read_reply(reader) for _ in range(count)]
+            case _:
+                raise CacheBackendError(f"Invalid Redis reply: {line!r}")
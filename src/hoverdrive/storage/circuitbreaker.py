@@ -0,0 +1,203 @@
+"""Circuit breaker for calls to an upstream service."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import StrEnum
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitBreakerStats",
+    "CircuitPermit",
+    "CircuitState",
+]
+
+
+class CircuitState(StrEnum):
+    """State of a `CircuitBreaker`."""
+
+    closed = "closed"
+    """Calls are allowed."""
+
+    open = "open"
+    """Calls fail fast without reaching the upstream service."""
+
+    half_open = "half_open"
+    """A single probe call is allowed to test whether the service is back."""
+
+
+@dataclass(slots=True)
+class CircuitBreakerStats:
+    """State and counters of a `CircuitBreaker`."""
+
+    state: CircuitState = CircuitState.closed
+    """Current state."""
+
+    consecutive_failures: int = 0
+    """Failed or slow calls since the last successful one."""
+
+    opened: int = 0
+    """Times the breaker has opened."""
+
+    rejected: int = 0
+    """Calls failed fast because the breaker was open."""
+
+
+class CircuitPermit:
+    """Permission from `CircuitBreaker.allow` to make one call.
+
+    The permit is passed back with the outcome of the call, so that the
+    breaker can tell its probe call apart from calls allowed before it
+    opened that finish late.
+    """
+
+    __slots__ = ()
+
+
+class CircuitBreaker:
+    """Stop calling an upstream service while it is failing.
+
+    The breaker opens after ``failure_threshold`` consecutive failed calls,
+    where a call that succeeds but takes at least ``slow_call_duration``
+    also counts as failed, so that a service whose latency is climbing
+    towards the client timeout is treated as failing before it times out.
+    While open, `allow` returns `False` and callers should fail fast. After
+    ``reset_timeout``, the breaker becomes half-open and allows a single
+    probe call: if it succeeds, the breaker closes, and if it fails, the
+    breaker opens again for another ``reset_timeout``.
+
+    Callers must ask `allow` before each call and then report its outcome,
+    with the permit `allow` returned, to exactly one of `record_success`,
+    `record_failure`, or `record_abandoned`.
+
+    Parameters
+    ----------
+    failure_threshold
+        Consecutive failed or slow calls that open the breaker.
+    slow_call_duration
+        Duration at which a successful call counts as failed.
+    reset_timeout
+        How long the breaker stays open before allowing a probe call.
+    clock
+        Source of monotonic time in seconds, for tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        slow_call_duration: timedelta,
+        reset_timeout: timedelta,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._slow_call_duration = slow_call_duration.total_seconds()
+        self._reset_timeout = reset_timeout.total_seconds()
+        self._clock = clock
+        self._opened_at = 0.0
+        self._probe: CircuitPermit | None = None
+        self.stats = CircuitBreakerStats()
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state, which may move from open to half-open."""
+        if (
+            self.stats.state == CircuitState.open
+            and self._clock() - self._opened_at >= self._reset_timeout
+        ):
+            self.stats.state = CircuitState.half_open
+        return self.stats.state
+
+    def allow(self) -> CircuitPermit | None:
+        """Check whether a call may be made now.
+
+        Returns
+        -------
+        CircuitPermit or None
+            A permit if the call may be made, in which case its outcome must
+            be recorded with it, or `None` if the caller should fail fast.
+        """
+        match self.state:
+            case CircuitState.closed:
+                return CircuitPermit()
+            case CircuitState.half_open if self._probe is None:
+                self._probe = CircuitPermit()
+                return self._probe
+            case _:
+                self.stats.rejected += 1
+                return None
+
+    def record_success(self, permit: CircuitPermit, duration: float) -> bool:
+        """Record a call that completed.
+
+        Parameters
+        ----------
+        permit
+            The permit `allow` returned for the call.
+        duration
+            How long the call took, in seconds.
+
+        Returns
+        -------
+        bool
+            Whether this opened the breaker, because the call was slow.
+        """
+        if duration >= self._slow_call_duration:
+            return self.record_failure(permit)
+        if not self._settle(permit):
+            return False
+        self.stats.consecutive_failures = 0
+        self.stats.state = CircuitState.closed
+        return False
+
+    def record_failure(self, permit: CircuitPermit) -> bool:
+        """Record a call that failed.
+
+        Parameters
+        ----------
+        permit
+            The permit `allow` returned for the call.
+
+        Returns
+        -------
+        bool
+            Whether this opened the breaker.
+        """
+        self.stats.consecutive_failures += 1
+        if not self._settle(permit):
+            return False
+        if (
+            self.stats.state == CircuitState.half_open
+            or self.stats.consecutive_failures >= self._failure_threshold
+        ):
+            self.stats.state = CircuitState.open
+            self.stats.opened += 1
+            self._opened_at = self._clock()
+            return True
+        return False
+
+    def record_abandoned(self, permit: CircuitPermit) -> None:
+        """Record a call that was cancelled before it had an outcome.
+
+        Parameters
+        ----------
+        permit
+            The permit `allow` returned for the call.
+        """
+        if permit is self._probe:
+            self._probe = None
+
+    def _settle(self, permit: CircuitPermit) -> bool:
+        """Finish a call and check whether its outcome may change the state.
+
+        Once the breaker has opened, only the outcome of its probe may change
+        the state, not that of a call allowed before it opened that finishes
+        late.
+        """
+        if permit is self._probe:
+            self._probe = None
+            return True
+        return self.stats.state == CircuitState.closed
@@ -0,0 +1,380 @@
+"""Bulk crawl of the Ook SDM links domain."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from structlog.stdlib import BoundLogger
+
+from .ookapi import OokClient, OokLink
+
+__all__ = [
+    "CrawlEntry",
+    "CrawlProgress",
+    "CrawlRun",
+    "CrawlStats",
+    "OokCrawler",
+    "RateLimiter",
+]
+
+_SCHEMAS = "/links/domains/sdm/schemas"
+_TABLES = "/links/domains/sdm/schemas/{schema_name}/tables"
+_COLUMNS = (
+    "/links/domains/sdm/schemas/{schema_name}/tables/{table_name}/columns"
+)
+
+
+class RateLimiter:
+    """Space out calls to at most a given rate.
+
+    Parameters
+    ----------
+    rate
+        Maximum number of calls per second.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait until the next call is allowed."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+
+@dataclass(slots=True, frozen=True)
+class CrawlEntry:
+    """The documentation links of one SDM schema, table, or column."""
+
+    schema_name: str
+    """The name of the SDM schema."""
+
+    table_name: str | None
+    """The name of the table, or `None` for the schema itself."""
+
+    column_name: str | None
+    """The name of the column, or `None` for a schema or table."""
+
+    links: list[OokLink]
+    """The documentation links, in Ook's order."""
+
+
+@dataclass(slots=True)
+class CrawlStats:
+    """Progress and throughput of a crawl."""
+
+    schemas: int = 0
+    """Schemas crawled."""
+
+    tables: int = 0
+    """Tables whose columns were crawled."""
+
+    columns: int = 0
+    """Columns crawled."""
+
+    skipped_tables: int = 0
+    """Tables skipped because a previous run completed them."""
+
+    failed_tables: int = 0
+    """Tables whose columns could not be crawled."""
+
+    started: float = field(default_factory=time.perf_counter)
+    """When the crawl started, from `time.perf_counter`."""
+
+    duration: float = 0.0
+    """Seconds the crawl took, once it is over."""
+
+    @property
+    def entries(self) -> int:
+        """Number of entries crawled."""
+        return self.schemas + self.tables + self.columns
+
+    @property
+    def entries_per_second(self) -> float:
+        """Throughput of the crawl, once it is over."""
+        return self.entries / self.duration if self.duration else 0.0
+
+
+class CrawlProgress:
+    """The tables completed by a crawl, for resuming it.
+
+    Completed tables are appended to a file as they are completed, so that
+    a crawl that was interrupted, or that failed for some tables, can be
+    resumed without crawling the completed tables again.
+
+    Parameters
+    ----------
+    path
+        Path of the progress file, which is created if needed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self.completed: set[tuple[str, str]] = set()
+        if path.exists():
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        schema_name, table_name = json.loads(line)
+                        self.completed.add((schema_name, table_name))
+
+    def is_completed(self, schema_name: str, table_name: str) -> bool:
+        """Whether a previous run completed a table."""
+        return (schema_name, table_name) in self.completed
+
+    def complete(self, schema_name: str, table_name: str) -> None:
+        """Record that a table and all of its columns were consumed."""
+        self.completed.add((schema_name, table_name))
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps([schema_name, table_name]) + "\n")
+
+    def clear(self) -> None:
+        """Forget all progress, once a crawl is complete."""
+        self.completed.clear()
+        self._path.unlink(missing_ok=True)
+
+
+@dataclass(slots=True, frozen=True)
+class _TableDone:
+    """Marks that every entry of a table has been queued."""
+
+    schema_name: str
+    table_name: str
+    error: Exception | None = None
+
+
+class CrawlRun:
+    """A single crawl of the SDM links domain.
+
+    Iterate over the run to crawl. Entries are generated as they are
+    parsed, a table's entry before those of its columns, but the columns of
+    different tables are interleaved. The crawl runs ahead of the consumer by
+    at most the queue size, so a slow consumer slows down the crawl rather
+    than letting entries pile up in memory.
+
+    Parameters
+    ----------
+    crawler
+        The crawler that started the run.
+    progress
+        If provided, tables that it records as completed are skipped, and
+        tables are recorded as completed once the consumer has received all
+        of their entries. A table whose columns cannot be crawled is left
+        incomplete, and the crawl goes on. If every table was completed, the
+        progress is cleared at the end of the run. Without progress, the
+        crawl cannot be resumed, so the first table that cannot be crawled
+        ends it with its error, after the entries of its columns that were
+        crawled.
+    """
+
+    def __init__(
+        self, crawler: OokCrawler, progress: CrawlProgress | None
+    ) -> None:
+        self._crawler = crawler
+        self._progress = progress
+        self.stats = CrawlStats()
+
+    def __aiter__(self) -> AsyncIterator[CrawlEntry]:
+        return self._run()
+
+    async def _run(self) -> AsyncIterator[CrawlEntry]:
+        queue: asyncio.Queue[CrawlEntry | _TableDone | None] = asyncio.Queue(
+            self._crawler.queue_size
+        )
+        self.stats.started = time.perf_counter()
+        producer = asyncio.create_task(self._produce(queue))
+        try:
+            while (item := await queue.get()) is not None:
+                if isinstance(item, CrawlEntry):
+                    yield item
+                elif item.error:
+                    self.stats.failed_tables += 1
+                    if not self._progress:
+                        raise item.error
+                else:
+                    self.stats.tables += 1
+                    if self._progress:
+                        self._progress.complete(
+                            item.schema_name, item.table_name
+                        )
+            # Raise the error that ended the crawl, if any.
+            await producer
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            self.stats.duration = time.perf_counter() - self.stats.started
+        if self._progress and not self.stats.failed_tables:
+            self._progress.clear()
+        self._crawler.log_summary(self.stats)
+
+    async def _produce(
+        self, queue: asyncio.Queue[CrawlEntry | _TableDone | None]
+    ) -> None:
+        """Crawl the schemas and tables, and the columns of each table
+        concurrently.
+        """
+        crawler = self._crawler
+        semaphore = asyncio.Semaphore(crawler.concurrency)
+        tasks: set[asyncio.Task[None]] = set()
+        try:
+            schemas = crawler.ook_client.stream_collection(
+                _SCHEMAS, rate_limiter=crawler.rate_limiter
+            )
+            async for schema in schemas:
+                self.stats.schemas += 1
+                await queue.put(
+                    CrawlEntry(schema.name, None, None, schema.links)
+                )
+                tables = crawler.ook_client.stream_collection(
+                    _TABLES,
+                    url_params={"schema_name": schema.name},
+                    rate_limiter=crawler.rate_limiter,
+                )
+                async for table in tables:
+                    if self._progress and self._progress.is_completed(
+                        schema.name, table.name
+                    ):
+                        self.stats.skipped_tables += 1
+                        continue
+                    await queue.put(
+                        CrawlEntry(schema.name, table.name, None, table.links)
+                    )
+                    # Wait for a slot here, so that no more tasks are created
+                    # than can run.
+                    await semaphore.acquire()
+                    task = asyncio.create_task(
+                        self._produce_columns(
+                            queue, semaphore, schema.name, table.name
+                        )
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except BaseException as e:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Once cancelled, the consumer is gone and the queue may be full.
+            if not isinstance(e, asyncio.CancelledError):
+                await queue.put(None)
+            raise
+        await queue.put(None)
+
+    async def _produce_columns(
+        self,
+        queue: asyncio.Queue[CrawlEntry | _TableDone | None],
+        semaphore: asyncio.Semaphore,
+        schema_name: str,
+        table_name: str,
+    ) -> None:
+        """Crawl the columns of a table."""
+        crawler = self._crawler
+        error = None
+        try:
+            columns = crawler.ook_client.stream_collection(
+                _COLUMNS,
+                url_params={
+                    "schema_name": schema_name,
+                    "table_name": table_name,
+                },
+                rate_limiter=crawler.rate_limiter,
+            )
+            async for column in columns:
+                self.stats.columns += 1
+                await queue.put(
+                    CrawlEntry(
+                        schema_name, table_name, column.name, column.links
+                    )
+                )
+        except Exception as e:
+            crawler.logger.warning(
+                "Failed to crawl table columns",
+                schema=schema_name,
+                table=table_name,
+                error=str(e),
+            )
+            error = e
+        finally:
+            semaphore.release()
+        await queue.put(_TableDone(schema_name, table_name, error))
+
+
+class OokCrawler:
+    """Walk the whole SDM links domain of Ook.
+
+    The columns of several tables are crawled at once, each collection
+    page is parsed as it is received, and entries are passed to the consumer
+    one at a time, so that a crawl of a large catalog is fast and needs
+    little memory whatever the consumer does with the entries: build an
+    index, write a snapshot, or export them.
+
+    Parameters
+    ----------
+    ook_client
+        Client for the Ook API.
+    logger
+        Logger for crawl failures and summaries.
+    concurrency
+        Maximum number of tables whose columns are crawled at once.
+    rate_limit
+        If provided, maximum number of requests per second to Ook.
+    queue_size
+        Maximum number of entries crawled ahead of the consumer.
+    """
+
+    def __init__(
+        self,
+        *,
+        ook_client: OokClient,
+        logger: BoundLogger,
+        concurrency: int = 8,
+        rate_limit: float | None = None,
+        queue_size: int = 1000,
+    ) -> None:
+        self.ook_client = ook_client
+        self.logger = logger
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.queue_size = queue_size
+
+    def crawl(self, progress: CrawlProgress | None = None) -> CrawlRun:
+        """Start a crawl.
+
+        Parameters
+        ----------
+        progress
+            If provided, resume the crawl recorded by this progress, and
+            record the progress of this one.
+
+        Returns
+        -------
+        CrawlRun
+            The crawl, to iterate over. Its ``stats`` summarize it once the
+            iteration is over.
+        """
+        return CrawlRun(self, progress)
+
+    def log_summary(self, stats: CrawlStats) -> None:
+        """Log the summary of a finished crawl."""
+        self.logger.info(
+            "Crawled Ook SDM links",
+            schemas=stats.schemas,
+            tables=stats.tables,
+            columns=stats.columns,
+            skipped_tables=stats.skipped_tables,
+            failed_tables=stats.failed_tables,
+            duration=round(stats.duration, 3),
+            entries_per_second=round(stats.entries_per_second, 1),
+        )
@@ -0,0 +1,169 @@
+"""HTTP transport for the shared Ook client, with connection pool stats."""
+
+from __future__ import annotations
+
+import time
+import urllib.request
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from httpx import AsyncHTTPTransport, Limits, Request, Response
+
+__all__ = ["HttpPoolStats", "MonitoredTransport", "get_environment_proxy"]
+
+
+@dataclass(slots=True)
+class HttpPoolStats:
+    """A snapshot of connection pool utilization and request timing."""
+
+    max_connections: int | None
+    """Configured maximum number of connections."""
+
+    connections: int
+    """Connections currently held by the pool."""
+
+    idle_connections: int
+    """Pooled connections that are open but not serving a request."""
+
+    in_flight: int
+    """Requests currently being sent or awaiting a response."""
+
+    max_in_flight: int
+    """Highest number of concurrent requests seen."""
+
+    requests: int
+    """Total requests sent."""
+
+    connects: int
+    """Total new connections opened."""
+
+    pool_wait_seconds_total: float
+    """Time requests spent waiting for a pooled connection, summed."""
+
+    pool_wait_seconds_max: float
+    """Longest time a single request waited for a pooled connection."""
+
+    connect_seconds_total: float
+    """Time spent opening new connections, including TLS, summed."""
+
+
+class MonitoredTransport(AsyncHTTPTransport):
+    """An `httpx.AsyncHTTPTransport` that measures its connection pool.
+
+    Timing comes from the httpcore ``trace`` request extension. The time
+    from entering the transport to sending request headers, less any time
+    spent opening a new connection, is how long the request waited for a
+    connection to become available in the pool. The number of open and idle
+    connections is read from the httpcore pool behind the private ``_pool``
+    attribute of the transport, which is why httpx is pinned to a minor
+    release.
+
+    Parameters
+    ----------
+    limits
+        Connection pool limits.
+    http2
+        Whether to negotiate HTTP/2. Requires the ``h2`` package, which is
+        installed with ``httpx[http2]``.
+    proxy
+        URL of the proxy to send requests through, if any. Unlike an
+        `httpx.AsyncClient` without a transport, the transport does not read
+        proxies from the environment, so see `get_environment_proxy`.
+    """
+
+    def __init__(
+        self, *, limits: Limits, http2: bool = False, proxy: str | None = None
+    ) -> None:
+        super().__init__(limits=limits, http2=http2, proxy=proxy)
+        self._max_connections = limits.max_connections
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._requests = 0
+        self._connects = 0
+        self._pool_wait_total = 0.0
+        self._pool_wait_max = 0.0
+        self._connect_total = 0.0
+
+    async def handle_async_request(self, request: Request) -> Response:
+        start = time.perf_counter()
+        connect_started = 0.0
+        connect_time = 0.0
+        waited = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal connect_started, connect_time, waited
+            if event_name == "connection.connect_tcp.started":
+                connect_started = time.perf_counter()
+            elif event_name in (
+                "connection.connect_tcp.complete",
+                "connection.start_tls.complete",
+            ):
+                if event_name == "connection.connect_tcp.complete":
+                    self._connects += 1
+                elapsed = time.perf_counter() - connect_started
+                connect_time += elapsed
+                self._connect_total += elapsed
+                connect_started = time.perf_counter()
+            elif not waited and event_name.endswith(
+                ".send_request_headers.started"
+            ):
+                waited = True
+                wait = time.perf_counter() - start - connect_time
+                self._pool_wait_total += wait
+                self._pool_wait_max = max(self._pool_wait_max, wait)
+            if parent_trace:
+                await parent_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        self._requests += 1
+        self._in_flight += 1
+        self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            self._in_flight -= 1
+
+    def get_stats(self) -> HttpPoolStats:
+        """Get a snapshot of the pool utilization and timing counters."""
+        # httpx doesn't expose its httpcore pool, so this relies on the
+        # private attribute holding it. The tests check these counts, so an
+        # httpx upgrade that breaks them fails the tests.
+        connections = self._pool.connections
+        return HttpPoolStats(
+            max_connections=self._max_connections,
+            connections=len(connections),
+            idle_connections=sum(1 for c in connections if c.is_idle()),
+            in_flight=self._in_flight,
+            max_in_flight=self._max_in_flight,
+            requests=self._requests,
+            connects=self._connects,
+            pool_wait_seconds_total=self._pool_wait_total,
+            pool_wait_seconds_max=self._pool_wait_max,
+            connect_seconds_total=self._connect_total,
+        )
+
+
+def get_environment_proxy(url: str) -> str | None:
+    """Get the proxy that the environment configures for a URL.
+
+    This follows the ``HTTP_PROXY``, ``HTTPS_PROXY``, ``ALL_PROXY``, and
+    ``NO_PROXY`` environment variables, as `httpx.AsyncClient` does when it
+    creates its own transport.
+
+    Parameters
+    ----------
+    url
+        The URL that requests will be sent to.
+
+    Returns
+    -------
+    str or None
+        The URL of the proxy, or `None` to connect directly.
+    """
+    parts = urlsplit(url)
+    if parts.hostname and urllib.request.proxy_bypass(parts.hostname):
+        return None
+    proxies = urllib.request.getproxies()
+    return proxies.get(parts.scheme) or proxies.get("all")
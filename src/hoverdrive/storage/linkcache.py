@@ -0,0 +1,386 @@
+"""Cache of documentation links fetched from Ook."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from pydantic import BaseModel, ValidationError
+from structlog.stdlib import BoundLogger
+
+from ..exceptions import CacheBackendError
+from ..timing import timed
+from .cachebackend import CacheBackend
+from .ookapi import OokLinksPayload, OokLinksResult
+
+__all__ = ["LinkCache", "LinkCacheStats", "LinkKey", "LinkLoader"]
+
+type LinkKey = tuple[str, str, str | None]
+"""Cache key for a set of links: ``(schema, table, column)``.
+
+The column is `None` for table-level links.
+"""
+
+type LinkLoader = Callable[[OokLinksResult | None], Awaitable[OokLinksResult]]
+"""Fetches links from Ook.
+
+When refreshing a stale entry, the loader is passed the cached links and
+their validators so that it can make a conditional request, and returns them
+with ``not_modified`` set if Ook reports that they are unchanged. On a miss,
+it is passed `None`.
+"""
+
+
+@dataclass(slots=True)
+class LinkCacheStats:
+    """Counters describing the effectiveness of a `LinkCache`."""
+
+    hits: int = 0
+    """Lookups answered from a fresh entry."""
+
+    stale_hits: int = 0
+    """Lookups answered from an entry past its TTL."""
+
+    negative_hits: int = 0
+    """Lookups answered from the negative cache of keys without links."""
+
+    misses: int = 0
+    """Lookups that had to wait for Ook."""
+
+    stale_on_error: int = 0
+    """Lookups answered from an expired entry because Ook failed."""
+
+    refreshes: int = 0
+    """Background refreshes started for stale entries."""
+
+    not_modified: int = 0
+    """Background refreshes that Ook answered with 304 Not Modified."""
+
+    backend_errors: int = 0
+    """Lookups or stores that failed because the backend was unavailable, or
+    lookups of entries that could not be decoded.
+    """
+
+
+class _EntryHeader(BaseModel):
+    """Metadata stored with cached links.
+
+    A serialized entry is this header as JSON, a newline, and then the links
+    exactly as Ook sent them, so that a lookup only decodes the small header.
+    The header also carries the link chosen for redirects, so that a
+    redirect from the cache does not decode the links at all.
+    """
+
+    fetched_at: float
+    """When the links were fetched from Ook, in seconds since the epoch."""
+
+    count: int
+    """Number of links, which is zero for negative entries."""
+
+    etag: str | None = None
+    """The ``ETag`` Ook sent with the links."""
+
+    last_modified: str | None = None
+    """The ``Last-Modified`` date Ook sent with the links."""
+
+    ranking: str | None = None
+    """Key of the ranking policy that chose ``best_url``, if any."""
+
+    best_url: str | None = None
+    """URL of the link to redirect to, as chosen by ``ranking``."""
+
+
+@dataclass(slots=True)
+class _Entry:
+    header: _EntryHeader
+    links: OokLinksPayload
+
+
+class LinkCache:
+    """A cache of Ook links with stale-while-revalidate.
+
+    Entries are stored as serialized bytes in a `CacheBackend`, which may be
+    in-process or shared between replicas. Entries younger than the TTL are
+    served directly. Entries older than the TTL are still served for up to
+    ``max_stale`` longer, but the first such lookup in this process starts a
+    single background refresh so that later lookups see fresh data. Only
+    lookups for keys that are not in the backend wait on Ook. Refreshes are
+    conditional requests using the validators stored with the entry, so
+    unchanged links cost Ook a 304 response and are not parsed again.
+
+    Keys for which Ook has no links are stored with their own, usually much
+    shorter, TTL. These negative entries are not served stale: once they
+    expire, the next lookup asks Ook again so that newly documented columns
+    are picked up promptly.
+
+    Entries are kept for ``stale_if_error`` past the end of ``max_stale``.
+    Lookups of such expired entries wait on Ook, like misses, but if Ook
+    fails, the expired entry is served instead, so that a failing Ook does
+    not make known links unavailable.
+
+    If the backend fails, lookups fall through to Ook rather than failing.
+
+    Parameters
+    ----------
+    backend
+        Storage for the serialized entries.
+    ttl
+        How long an entry is considered fresh.
+    negative_ttl
+        How long a key with no links is remembered. Set to zero to disable
+        negative caching.
+    max_stale
+        How long past its TTL an entry may still be served while it is being
+        refreshed.
+    stale_if_error
+        How long past ``max_stale`` an entry may still be served if Ook
+        fails.
+    logger
+        Logger used for reporting refresh and backend failures.
+    """
+
+    def __init__(
+        self,
+        *,
+        backend: CacheBackend,
+        ttl: timedelta,
+        negative_ttl: timedelta = timedelta(0),
+        max_stale: timedelta = timedelta(days=1),
+        stale_if_error: timedelta = timedelta(0),
+        logger: BoundLogger,
+    ) -> None:
+        self._backend = backend
+        self._ttl = ttl.total_seconds()
+        self._max_age = (ttl + max_stale).total_seconds()
+        self._negative_ttl = negative_ttl
+        self._stored_ttl = ttl + max_stale + stale_if_error
+        self._logger = logger
+        self._refreshes: dict[LinkKey, asyncio.Task[None]] = {}
+        self.stats = LinkCacheStats()
+
+    async def get(
+        self,
+        key: LinkKey,
+        loader: LinkLoader,
+    ) -> OokLinksPayload:
+        """Get the links for a key, loading them if necessary.
+
+        Parameters
+        ----------
+        key
+            The ``(schema, table, column)`` key.
+        loader
+            Called to fetch the links from Ook on a miss, or in the background
+            when a stale entry is refreshed.
+
+        Returns
+        -------
+        OokLinksPayload
+            The cached or freshly loaded links.
+        """
+        with timed("cache"):
+            entry = await self._load_entry(key)
+        if entry is None:
+            self.stats.misses += 1
+            result = await loader(None)
+            await self._store(key, result)
+            return result.links
+
+        header = entry.header
+        age = time.time() - header.fetched_at
+        if header.count == 0:
+            self.stats.negative_hits += 1
+            return entry.links
+        if age < self._ttl:
+            self.stats.hits += 1
+            return entry.links
+        previous = OokLinksResult(
+            links=entry.links,
+            etag=header.etag,
+            last_modified=header.last_modified,
+        )
+        if age < self._max_age:
+            self.stats.stale_hits += 1
+            self._schedule_refresh(key, loader, previous)
+            return entry.links
+
+        self.stats.misses += 1
+        try:
+            result = await loader(previous)
+        except Exception as e:
+            self.stats.stale_on_error += 1
+            self._logger.warning(
+                "Serving expired links because Ook failed",
+                key=".".join(k for k in key if k),
+                error=str(e),
+            )
+            return entry.links
+        await self._store(key, result)
+        return result.links
+
+    async def set(
+        self,
+        key: LinkKey,
+        links: OokLinksPayload,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store links for a key.
+
+        An empty set of links is stored as a negative entry.
+
+        Parameters
+        ----------
+        key
+            The ``(schema, table, column)`` key.
+        links
+            The links to store.
+        etag
+            The ``ETag`` Ook sent with the links, used to revalidate them.
+        last_modified
+            The ``Last-Modified`` date Ook sent with the links, used to
+            revalidate them.
+        """
+        count = len(links)
+        ttl = self._stored_ttl if count else self._negative_ttl
+        ranking, best_url = links.ranked or (None, None)
+        header = _EntryHeader(
+            fetched_at=time.time(),
+            count=count,
+            etag=etag,
+            last_modified=last_modified,
+            ranking=ranking,
+            best_url=best_url,
+        )
+        try:
+            if ttl <= timedelta(0):
+                await self._backend.delete(self._backend_key(key))
+            else:
+                data = b"%b\n%b" % (
+                    header.model_dump_json(exclude_none=True).encode(),
+                    links.data,
+                )
+                await self._backend.set(self._backend_key(key), data, ttl)
+        except CacheBackendError as e:
+            self._report_backend_error(e)
+
+    async def is_fresh(self, key: LinkKey) -> bool:
+        """Whether a key has an entry that a lookup would serve without
+        refreshing it.
+
+        Parameters
+        ----------
+        key
+            The ``(schema, table, column)`` key.
+
+        Returns
+        -------
+        bool
+            Whether the key has a fresh or negative entry.
+        """
+        entry = await self._load_entry(key)
+        if entry is None:
+            return False
+        header = entry.header
+        return header.count == 0 or time.time() - header.fetched_at < self._ttl
+
+    async def invalidate(self, key: LinkKey) -> None:
+        """Drop the entry for a key, if present."""
+        try:
+            await self._backend.delete(self._backend_key(key))
+        except CacheBackendError as e:
+            self._report_backend_error(e)
+
+    async def aclose(self) -> None:
+        """Cancel any running background refreshes and close the backend."""
+        tasks = list(self._refreshes.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshes.clear()
+        await self._backend.aclose()
+
+    @staticmethod
+    def _backend_key(key: LinkKey) -> str:
+        schema_name, table_name, column_name = key
+        if column_name is None:
+            return f"links/{schema_name}/{table_name}"
+        return f"links/{schema_name}/{table_name}/{column_name}"
+
+    async def _load_entry(self, key: LinkKey) -> _Entry | None:
+        try:
+            data = await self._backend.get(self._backend_key(key))
+        except CacheBackendError as e:
+            self._report_backend_error(e)
+            return None
+        if data is None:
+            return None
+        header, newline, links = data.partition(b"\n")
+        if not newline:
+            # Written by an older version in a different format, so treat it
+            # as a miss and let it be overwritten.
+            return None
+        try:
+            entry_header = _EntryHeader.model_validate_json(header)
+        except ValidationError as e:
+            # Corrupt, or written by something else, so treat it as a miss
+            # and let it be overwritten.
+            self._report_backend_error(e)
+            return None
+        ranked = None
+        if entry_header.ranking is not None:
+            ranked = (entry_header.ranking, entry_header.best_url)
+        return _Entry(
+            header=entry_header,
+            links=OokLinksPayload(links, ranked=ranked),
+        )
+
+    async def _store(self, key: LinkKey, result: OokLinksResult) -> None:
+        await self.set(
+            key,
+            result.links,
+            etag=result.etag,
+            last_modified=result.last_modified,
+        )
+
+    def _report_backend_error(
+        self, error: CacheBackendError | ValidationError
+    ) -> None:
+        self.stats.backend_errors += 1
+        self._logger.warning("Link cache backend failed", error=str(error))
+
+    def _schedule_refresh(
+        self, key: LinkKey, loader: LinkLoader, previous: OokLinksResult
+    ) -> None:
+        if key in self._refreshes:
+            return
+        self.stats.refreshes += 1
+        # The refresh outlives the request that triggered it, so it must not
+        # be timed or logged as part of that request.
+        task = asyncio.create_task(
+            self._refresh(key, loader, previous), context=contextvars.Context()
+        )
+        self._refreshes[key] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+
+    async def _refresh(
+        self, key: LinkKey, loader: LinkLoader, previous: OokLinksResult
+    ) -> None:
+        try:
+            result = await loader(previous)
+        except Exception as e:
+            # Keep serving the stale entry; the next lookup will try again.
+            self._logger.warning(
+                "Background link refresh failed",
+                key=".".join(k for k in key if k),
+                error=str(e),
+            )
+            return
+        if result.not_modified:
+            self.stats.not_modified += 1
+        await self._store(key, result)
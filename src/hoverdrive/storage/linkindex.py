@@ -0,0 +1,212 @@
+"""In-memory index of the best documentation link for SDM entities."""
+
+from __future__ import annotations
+
+import sys
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+__all__ = ["ColumnLinks", "SdmLinkIndex", "SdmSchemaIndex", "SdmTableIndex"]
+
+
+class ColumnLinks(Mapping[str, str]):
+    """Immutable mapping of column name to link, stored compactly.
+
+    The links of a table's columns almost always share a base URL, such as
+    ``https://sdm-schemas.lsst.io/dp02.html#Object.``, followed by the column
+    name. The most common base is stored once, and links that are that base
+    followed by the column name are not stored at all but rebuilt on lookup.
+    Column names are interned, so that names repeated across tables and data
+    releases, such as ``coord_ra``, are stored once, and sorted, so that they
+    are found by bisection without a hash table.
+
+    Parameters
+    ----------
+    links
+        The link of each column, by column name.
+    """
+
+    __slots__ = ("_base", "_names", "_urls")
+
+    def __init__(self, links: Mapping[str, str] | None = None) -> None:
+        links = links or {}
+        bases = Counter(
+            url[: -len(name)]
+            for name, url in links.items()
+            if url.endswith(name) and len(url) > len(name)
+        )
+        base = sys.intern(bases.most_common(1)[0][0]) if bases else ""
+        names = sorted(links)
+        urls = tuple(None if links[n] == base + n else links[n] for n in names)
+        self._base = base
+        self._names = tuple(sys.intern(n) for n in names)
+        self._urls = urls if any(u is not None for u in urls) else None
+
+    def __getitem__(self, name: str) -> str:
+        position = bisect_left(self._names, name)
+        if position == len(self._names) or self._names[position] != name:
+            raise KeyError(name)
+        url = self._urls[position] if self._urls else None
+        return self._base + name if url is None else url
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        position = bisect_left(self._names, name)
+        return position < len(self._names) and self._names[position] == name
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"ColumnLinks({dict(self)!r})"
+
+
+@dataclass(slots=True)
+class SdmTableIndex:
+    """The best documentation links for a table and its columns."""
+
+    link: str | None = None
+    """The best link for the table itself, if any."""
+
+    columns: ColumnLinks = field(default_factory=ColumnLinks)
+    """The best link for each documented column, by column name."""
+
+
+type SdmSchemaIndex = dict[str, dict[str, SdmTableIndex]]
+"""Mapping of schema name to table name to table links."""
+
+
+class SdmLinkIndex:
+    """An in-memory index of the best documentation link per SDM entity.
+
+    The index is replaced as a whole by `replace`, or one schema or table at
+    a time by `replace_schema` and `replace_table`, each of which swaps in a
+    fully built mapping with a single assignment. Readers therefore always see
+    either the old or the new catalog and never a partially built one.
+
+    Lookups return `None` both for entities that are not documented and for
+    entities that the index does not know about, such as when the index has
+    not been loaded yet. Callers should fall back to Ook in that case.
+    """
+
+    def __init__(self) -> None:
+        self._schemas: SdmSchemaIndex = {}
+        self.loaded_at: datetime | None = None
+        self.version = 0
+        """Incremented whenever the contents of the index change."""
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the index has been populated at least once."""
+        return self.loaded_at is not None
+
+    def __len__(self) -> int:
+        """Count the number of indexed tables."""
+        return sum(len(tables) for tables in self._schemas.values())
+
+    @property
+    def schemas(self) -> SdmSchemaIndex:
+        """The current contents of the index, which must not be modified.
+
+        Changes to the index replace this mapping rather than modifying it,
+        so it can be read, such as from another thread, while the index is
+        being updated.
+        """
+        return self._schemas
+
+    def get_tables(self, schema_name: str) -> dict[str, SdmTableIndex]:
+        """Get the indexed links for every table of a schema.
+
+        The result must not be modified.
+        """
+        return self._schemas.get(schema_name, {})
+
+    def get_table(
+        self, schema_name: str, table_name: str
+    ) -> SdmTableIndex | None:
+        """Get the indexed links for a table, if the table is known."""
+        tables = self._schemas.get(schema_name)
+        if tables is None:
+            return None
+        return tables.get(table_name)
+
+    def get_table_link(self, schema_name: str, table_name: str) -> str | None:
+        """Get the best documentation link for a table."""
+        table = self.get_table(schema_name, table_name)
+        return table.link if table else None
+
+    def get_column_link(
+        self, schema_name: str, table_name: str, column_name: str
+    ) -> str | None:
+        """Get the best documentation link for a column."""
+        table = self.get_table(schema_name, table_name)
+        return table.columns.get(column_name) if table else None
+
+    def replace(
+        self, schemas: SdmSchemaIndex, *, loaded_at: datetime | None = None
+    ) -> None:
+        """Atomically replace the contents of the index.
+
+        Parameters
+        ----------
+        schemas
+            The fully built replacement index. The caller must not modify it
+            afterwards.
+        loaded_at
+            When the data was fetched from Ook, if not now, such as for data
+            read from a snapshot.
+        """
+        self._schemas = schemas
+        self.loaded_at = loaded_at or datetime.now(tz=UTC)
+        self.version += 1
+
+    def replace_schema(
+        self, schema_name: str, tables: dict[str, SdmTableIndex]
+    ) -> None:
+        """Atomically replace the tables of one schema.
+
+        Parameters
+        ----------
+        schema_name
+            The name of the schema.
+        tables
+            The fully built replacement tables, which may be empty if the
+            schema is no longer documented. The caller must not modify them
+            afterwards.
+        """
+        schemas = dict(self._schemas)
+        if tables:
+            schemas[schema_name] = tables
+        else:
+            schemas.pop(schema_name, None)
+        self._schemas = schemas
+        self.version += 1
+
+    def replace_table(
+        self, schema_name: str, table_name: str, table: SdmTableIndex | None
+    ) -> None:
+        """Atomically replace the links of one table.
+
+        Parameters
+        ----------
+        schema_name
+            The name of the schema.
+        table_name
+            The name of the table within the schema.
+        table
+            The fully built replacement, or `None` if the table is no longer
+            documented. The caller must not modify it afterwards.
+        """
+        tables = dict(self._schemas.get(schema_name, {}))
+        if table is None:
+            tables.pop(table_name, None)
+        else:
+            tables[table_name] = table
+        self.replace_schema(schema_name, tables)
@@ -0,0 +1,293 @@
+"""In-memory search index of documented SDM table and column names."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Self
+
+from .linkindex import SdmSchemaIndex
+
+__all__ = ["SdmNameIndex", "SdmNameMatch"]
+
+
+@dataclass(slots=True, frozen=True)
+class SdmNameMatch:
+    """A documented table or column whose name matches a search."""
+
+    schema_name: str
+    """The name of the SDM schema."""
+
+    table_name: str
+    """The name of the table within the schema."""
+
+    column_name: str | None
+    """The name of the column, or `None` for the table itself."""
+
+    url: str
+    """The best documentation link."""
+
+
+type _TableKey = tuple[str, str]
+"""Schema and table name of a table."""
+
+
+class SdmNameIndex:
+    """Find documented tables and columns by name, as the user types.
+
+    The index is built once from a snapshot of the link index and then only
+    read. It holds the distinct table and column names sorted by their
+    lowercase form, so that the names starting with a prefix are found by
+    bisection, and, for each trigram, the positions of the names containing
+    it, so that the names containing a fragment are found without scanning
+    every name. Searches are case-insensitive.
+
+    For each name, only references to the tables with that name and to the
+    tables with a column of that name are held, and each table's reference is
+    shared by all of its columns. The links themselves are looked up in the
+    link index for the returned matches only.
+
+    Use `build` to create an index.
+
+    Parameters
+    ----------
+    schemas
+        The link index contents the index was built from.
+    names
+        Distinct table and column names, sorted by their lowercase form.
+    tables
+        For each name, the documented tables with that name.
+    columns
+        For each name, the tables with a documented column of that name.
+    trigrams
+        Positions in ``names`` of the names containing each trigram.
+    """
+
+    def __init__(
+        self,
+        *,
+        schemas: SdmSchemaIndex,
+        names: list[str],
+        tables: list[tuple[_TableKey, ...]],
+        columns: list[tuple[_TableKey, ...]],
+        trigrams: dict[str, array[int]],
+    ) -> None:
+        self._schemas = schemas
+        self._names = names
+        self._keys = [_lower(n) for n in names]
+        self._tables = tables
+        self._columns = columns
+        self._trigrams = trigrams
+        self._schema_names: dict[str, list[str]] = defaultdict(list)
+        self._table_names: dict[str, list[_TableKey]] = defaultdict(list)
+        for schema_name, schema_tables in schemas.items():
+            self._schema_names[schema_name.lower()].append(schema_name)
+            for table_name in schema_tables:
+                key = table_name.lower()
+                self._table_names[key].append((schema_name, table_name))
+        self._sorted_columns: dict[_TableKey, list[str]] = {}
+
+    @classmethod
+    def build(cls, schemas: SdmSchemaIndex) -> Self:
+        """Build the index of the documented entities in the link index.
+
+        Parameters
+        ----------
+        schemas
+            The contents of the link index, which must not be modified while
+            the index exists.
+
+        Returns
+        -------
+        SdmNameIndex
+            The new index.
+        """
+        tables: dict[str, list[_TableKey]] = defaultdict(list)
+        columns: dict[str, list[_TableKey]] = defaultdict(list)
+        for schema_name, schema_tables in schemas.items():
+            for table_name, table in schema_tables.items():
+                key = (schema_name, table_name)
+                if table.link:
+                    tables[table_name].append(key)
+                for column_name in table.columns:
+                    columns[column_name].append(key)
+
+        names = sorted(tables.keys() | columns.keys(), key=_sort_key)
+        postings: dict[str, list[int]] = defaultdict(list)
+        for position, name in enumerate(names):
+            lowered = name.lower()
+            for trigram in {
+                lowered[i : i + 3] for i in range(len(lowered) - 2)
+            }:
+                postings[trigram].append(position)
+        return cls(
+            schemas=schemas,
+            names=names,
+            tables=[tuple(sorted(tables.get(n, ()))) for n in names],
+            columns=[tuple(sorted(columns.get(n, ()))) for n in names],
+            trigrams={t: array("I", p) for t, p in postings.items()},
+        )
+
+    def __len__(self) -> int:
+        """Count the number of distinct names."""
+        return len(self._names)
+
+    def search(self, query: str, limit: int) -> list[SdmNameMatch]:
+        """Find the tables and columns whose names match a query.
+
+        A query without dots matches the tables and columns whose names start
+        with it, and then, if it is at least three characters long, those
+        whose names contain it. In each group, names are in alphabetical
+        order, so an exact match comes first, and for the same name, tables
+        come before columns. A query with dots is matched against the end of
+        qualified names: ``Object.coord`` matches the columns of tables named
+        ``Object`` whose names start with ``coord``, and
+        ``dp02_dc2_catalogs.Obj`` the tables of that schema whose names start
+        with ``Obj``.
+
+        Parameters
+        ----------
+        query
+            The prefix or fragment typed so far.
+        limit
+            Maximum number of matches.
+
+        Returns
+        -------
+        list of SdmNameMatch
+            The best matches, best first.
+        """
+        query = query.strip().lower()
+        if not query or limit < 1:
+            return []
+        *qualifiers, name = query.split(".")
+        if qualifiers:
+            return self._search_qualified(qualifiers, name, limit)
+
+        results: list[SdmNameMatch] = []
+        for position in self._find_prefix(name):
+            results.extend(self._get_matches(position, limit - len(results)))
+            if len(results) >= limit:
+                return results
+        if len(name) >= 3:
+            for position in self._find_fragment(name):
+                results.extend(
+                    self._get_matches(position, limit - len(results))
+                )
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _get_matches(self, position: int, limit: int) -> list[SdmNameMatch]:
+        """Get the first tables and then columns with the name at a
+        position.
+        """
+        name = self._names[position]
+        matches = []
+        for schema_name, table_name in self._tables[position][:limit]:
+            link = self._schemas[schema_name][table_name].link
+            if link:
+                matches.append(
+                    SdmNameMatch(schema_name, table_name, None, link)
+                )
+        for schema_name, table_name in self._columns[position]:
+            if len(matches) >= limit:
+                break
+            url = self._schemas[schema_name][table_name].columns[name]
+            matches.append(SdmNameMatch(schema_name, table_name, name, url))
+        return matches
+
+    def _find_prefix(self, prefix: str) -> Iterator[int]:
+        """Generate the positions of the names starting with a prefix."""
+        keys = self._keys
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield position
+            position += 1
+
+    def _find_fragment(self, fragment: str) -> Iterator[int]:
+        """Generate the positions of the names containing, but not starting
+        with, a fragment of at least three characters.
+        """
+        # Every name containing the fragment contains all of its trigrams,
+        # so the shortest list of names with one of them has every match.
+        candidates = min(
+            (
+                self._trigrams.get(fragment[i : i + 3], array("I"))
+                for i in range(len(fragment) - 2)
+            ),
+            key=len,
+        )
+        for position in candidates:
+            key = self._keys[position]
+            if fragment in key and not key.startswith(fragment):
+                yield position
+
+    def _search_qualified(
+        self, qualifiers: list[str], prefix: str, limit: int
+    ) -> list[SdmNameMatch]:
+        """Search for entities by the end of their qualified names."""
+        results: list[SdmNameMatch] = []
+        if len(qualifiers) == 1:
+            # Tables of a schema named by the qualifier.
+            for schema_name in self._schema_names.get(qualifiers[0], []):
+                for table_name, table in self._schemas[schema_name].items():
+                    if table.link and table_name.lower().startswith(prefix):
+                        results.append(
+                            SdmNameMatch(
+                                schema_name, table_name, None, table.link
+                            )
+                        )
+            # Columns of tables named by the qualifier.
+            tables = set(self._table_names.get(qualifiers[0], []))
+            results.extend(self._find_columns(tables, prefix, limit))
+        elif len(qualifiers) == 2:
+            tables = {
+                (schema_name, table_name)
+                for schema_name, table_name in self._table_names.get(
+                    qualifiers[1], []
+                )
+                if schema_name.lower() == qualifiers[0]
+            }
+            results.extend(self._find_columns(tables, prefix, limit))
+        results.sort(key=_match_order)
+        return results[:limit]
+
+    def _find_columns(
+        self, tables: set[tuple[str, str]], prefix: str, limit: int
+    ) -> Iterator[SdmNameMatch]:
+        """Generate the first documented columns of each table whose names
+        start with a prefix.
+        """
+        for schema_name, table_name in tables:
+            urls = self._schemas[schema_name][table_name].columns
+            names = self._sorted_columns.get((schema_name, table_name))
+            if names is None:
+                names = sorted(urls, key=str.lower)
+                self._sorted_columns[schema_name, table_name] = names
+            position = bisect_left(names, prefix, key=str.lower)
+            for name in names[position : position + limit]:
+                if not name.lower().startswith(prefix):
+                    break
+                yield SdmNameMatch(schema_name, table_name, name, urls[name])
+
+
+def _lower(name: str) -> str:
+    """Lowercase a name, reusing the name itself if it is lowercase."""
+    key = name.lower()
+    return name if key == name else key
+
+
+def _sort_key(name: str) -> tuple[str, str]:
+    """Sort key of names, case-insensitively but deterministically."""
+    return (name.lower(), name)
+
+
+def _match_order(match: SdmNameMatch) -> tuple[str, bool, str, str, str]:
+    """Sort key of matches by name, with tables before columns."""
+    name = match.column_name or match.table_name
+    is_column = match.column_name is not None
+    return (name.lower(), is_column, match.schema_name, match.table_name, name)
@@ -2,12 +2,53 @@
 
 from __future__ import annotations
 
-from httpx import AsyncClient
-from pydantic import BaseModel, Field, RootModel
+import asyncio
+import json
+import re
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NotRequired, Protocol, Self, TypedDict
+
+from httpx import AsyncClient, HTTPError, HTTPStatusError, Response, codes
+from pydantic import BaseModel, Field, RootModel, TypeAdapter
 from structlog.stdlib import BoundLogger
-from uritemplate import expand, variable
+from uritemplate import URITemplate, variable
+
+from ..exceptions import UpstreamTransientError, UpstreamUnavailableError
+from ..logcontext import get_request_logger
+from ..timing import timed
+
+if TYPE_CHECKING:
+    from ..metrics import Metrics
+    from .admission import AdmissionLimiter
+    from .circuitbreaker import CircuitBreaker, CircuitPermit
+    from .crawler import RateLimiter
+    from .linkcache import LinkCache, LinkKey
+    from .retry import RetryController
+    from .singleflight import SingleFlight
 
-__all__ = ["OokClient", "OokLink", "OokLinksArray"]
+__all__ = [
+    "LinkRanking",
+    "OokClient",
+    "OokLink",
+    "OokLinkTarget",
+    "OokLinksArray",
+    "OokLinksPayload",
+    "OokLinksResult",
+    "OokSdmEntityLinks",
+    "OokSdmEntityLinksArray",
+    "parse_tap_table_name",
+]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+"""Whitespace between JSON tokens."""
+
+_TRANSIENT_STATUSES = frozenset(
+    {codes.BAD_GATEWAY, codes.SERVICE_UNAVAILABLE, codes.GATEWAY_TIMEOUT}
+)
+"""Ook response statuses that a retry of the request may not get."""
 
 
 class OokClient:
@@ -20,19 +61,72 @@ class OokClient:
         Example: "https://roundtable.lsst.cloud/ook"
     http_client
         The httpx client to use for making requests.
+    logger
+        Logger to use outside of a request. Within a request, the request's
+        logger is used instead.
+    link_cache
+        If provided, link lookups are served from this cache and Ook is only
+        queried on a miss or to refresh a stale entry.
+    single_flight
+        If provided, concurrent unconditional GET requests for the same URL
+        share a single upstream request.
+    metrics
+        If provided, the latency and status of every request to Ook are
+        recorded here.
+    ranking
+        If provided, the best link of each set of links fetched through the
+        link cache is chosen with this policy as soon as the links are
+        fetched, and stored with them in the cache.
+    circuit_breaker
+        If provided, requests fail fast while this breaker is open, and the
+        outcome of every request is recorded in it.
+    admission
+        If provided, every request to Ook must first be admitted by this
+        limiter. Lookups answered from the link cache, and requests merged by
+        ``single_flight``, do not send a request and so are not limited.
+    retry
+        If provided, requests that fail transiently are retried, and slow
+        requests are hedged, as decided by this controller. Hedges are only
+        sent while ``admission`` has free slots.
     """
 
     def __init__(
-        self, *, base_url: str, http_client: AsyncClient, logger: BoundLogger
+        self,
+        *,
+        base_url: str,
+        http_client: AsyncClient,
+        logger: BoundLogger,
+        link_cache: LinkCache | None = None,
+        single_flight: SingleFlight[str, Response] | None = None,
+        metrics: Metrics | None = None,
+        ranking: LinkRanking | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        admission: AdmissionLimiter | None = None,
+        retry: RetryController | None = None,
     ) -> None:
         base_url = base_url.removesuffix("/")
         self.base_url = base_url
         self._http_client = http_client
         self._logger = logger
+        self._link_cache = link_cache
+        self._single_flight = single_flight
+        self._metrics = metrics
+        self._ranking = ranking
+        self._circuit_breaker = circuit_breaker
+        self._admission = admission
+        self._retry = retry
+
+        # Parsed URI templates, keyed by path template. Path templates are
+        # constants of the calling code, so this stays small.
+        self._templates: dict[str, URITemplate] = {}
+
+    @property
+    def _log(self) -> BoundLogger:
+        return get_request_logger(self._logger)
 
     async def get_sdm_column_links(
         self, tap_table_name: str, column_name: str
-    ) -> OokLinksArray:
+    ) -> OokLinksPayload:
         """Make a GET request to the Ook API for the SDM column links.
 
         Parameters
@@ -44,8 +138,8 @@ class OokClient:
 
         Returns
         -------
-        links
-            The links for the column.
+        OokLinksPayload
+            The links for the column, decoded on demand.
         """
         schema_name, table_name = self._parse_tap_table_name_to_sdm(
             tap_table_name
@@ -59,12 +153,15 @@ class OokClient:
             "table_name": table_name,
             "column_name": column_name,
         }
-        json_data = await self.get_item(path_template, url_params=url_params)
-        # Ideally we should convert this into an internal domain model to avoid
-        # coupling the rest of the codebase to the Ook API.
-        return OokLinksArray.model_validate_json(json_data)
+        return await self._get_links(
+            (schema_name, table_name, column_name),
+            path_template,
+            url_params=url_params,
+        )
 
-    async def get_sdm_table_links(self, tap_table_name: str) -> OokLinksArray:
+    async def get_sdm_table_links(
+        self, tap_table_name: str
+    ) -> OokLinksPayload:
         """Make a GET request to the Ook API for the SDM table links.
 
         Parameters
@@ -74,8 +171,8 @@ class OokClient:
 
         Returns
         -------
-        OokLinksArray
-            The links for the column.
+        OokLinksPayload
+            The links for the table, decoded on demand.
         """
         schema_name, table_name = self._parse_tap_table_name_to_sdm(
             tap_table_name
@@ -87,10 +184,210 @@ class OokClient:
             "schema_name": schema_name,
             "table_name": table_name,
         }
-        json_data = await self.get_item(path_template, url_params=url_params)
-        # Ideally we should convert this into an internal domain model to avoid
-        # coupling the rest of the codebase to the Ook API.
-        return OokLinksArray.model_validate_json(json_data)
+        return await self._get_links(
+            (schema_name, table_name, None),
+            path_template,
+            url_params=url_params,
+        )
+
+    async def get_sdm_schemas(self) -> list[OokSdmEntityLinks]:
+        """Get the links for every SDM schema known to Ook.
+
+        Returns
+        -------
+        list of OokSdmEntityLinks
+            The links for each schema, following every page of results.
+        """
+        return await self.get_collection("/links/domains/sdm/schemas")
+
+    async def get_sdm_tables(
+        self, schema_name: str
+    ) -> list[OokSdmEntityLinks]:
+        """Get the links for every table in an SDM schema.
+
+        Parameters
+        ----------
+        schema_name
+            The name of the SDM schema.
+
+        Returns
+        -------
+        list of OokSdmEntityLinks
+            The links for each table, following every page of results.
+        """
+        return await self.get_collection(
+            "/links/domains/sdm/schemas/{schema_name}/tables",
+            url_params={"schema_name": schema_name},
+        )
+
+    async def get_sdm_columns(
+        self, schema_name: str, table_name: str
+    ) -> list[OokSdmEntityLinks]:
+        """Get the links for every column in an SDM table.
+
+        Parameters
+        ----------
+        schema_name
+            The name of the SDM schema.
+        table_name
+            The name of the table within the schema.
+
+        Returns
+        -------
+        list of OokSdmEntityLinks
+            The links for each column, following every page of results.
+        """
+        return await self.get_collection(
+            "/links/domains/sdm/schemas/{schema_name}/tables/{table_name}"
+            "/columns",
+            url_params={"schema_name": schema_name, "table_name": table_name},
+        )
+
+    async def prefetch_sdm_columns(
+        self, schema_name: str, table_name: str
+    ) -> int:
+        """Fill the link cache with the links of every column of a table.
+
+        The links are fetched with a single paginated request for the whole
+        table, so that later lookups of any of its columns are cache hits.
+        Like other bulk requests, the request bypasses the admission limiter
+        and is not retried or hedged, so that prefetches never take capacity
+        from lookups that a user is waiting on. Columns that already have a
+        fresh entry are left alone, so that their validators are kept and
+        their TTL is not extended.
+
+        Parameters
+        ----------
+        schema_name
+            The name of the SDM schema.
+        table_name
+            The name of the table within the schema.
+
+        Returns
+        -------
+        int
+            Number of columns cached, which is 0 without a link cache.
+        """
+        if self._link_cache is None:
+            return 0
+        columns = self.stream_collection(
+            "/links/domains/sdm/schemas/{schema_name}/tables/{table_name}"
+            "/columns",
+            url_params={"schema_name": schema_name, "table_name": table_name},
+        )
+        count = 0
+        async for column in columns:
+            key = (schema_name, table_name, column.name)
+            if await self._link_cache.is_fresh(key):
+                continue
+            links = OokLinksPayload.from_model(OokLinksArray(column.links))
+            if self._ranking is not None:
+                links.best_url(self._ranking)
+            await self._link_cache.set(key, links)
+            count += 1
+        return count
+
+    async def get_collection(
+        self,
+        path_template: str,
+        *,
+        url_params: dict | None = None,
+    ) -> list[OokSdmEntityLinks]:
+        """Make GET requests to the Ook API for a paginated collection.
+
+        Pages are followed through the ``next`` relation of the ``Link``
+        response header until the collection is exhausted.
+
+        Parameters
+        ----------
+        path_template
+            Template for the Ook endpoint's path.
+        url_params
+            Parameters for the `path_template`.
+
+        Returns
+        -------
+        list of OokSdmEntityLinks
+            Every item in the collection, which is empty if Ook does not know
+            the parent entity.
+        """
+        url: str | None = self._format_url(
+            path_template, url_params=url_params
+        )
+        items: list[OokSdmEntityLinks] = []
+        while url:
+            self._log.debug("Sending OOK collection Get", url=url)
+            response = await self._request(url)
+            if response.status_code == codes.NOT_FOUND:
+                break
+            response.raise_for_status()
+            page = OokSdmEntityLinksArray.model_validate_json(response.text)
+            items.extend(page.root)
+            next_link = response.links.get("next")
+            url = next_link["url"] if next_link else None
+        return items
+
+    async def stream_collection(
+        self,
+        path_template: str,
+        *,
+        url_params: dict | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> AsyncIterator[OokSdmEntityLinks]:
+        """Generate the items of a paginated collection as they arrive.
+
+        Unlike `get_collection`, each page is parsed while it is received,
+        and its items are generated one at a time, so that a bulk consumer
+        never holds a whole page. Requests bypass the admission limiter and
+        are not retried or hedged: a bulk consumer limits its own
+        concurrency, and should not take slots from requests that a user is
+        waiting on.
+
+        Parameters
+        ----------
+        path_template
+            Template for the Ook endpoint's path.
+        url_params
+            Parameters for the `path_template`.
+        rate_limiter
+            If provided, each page is only requested once this limiter
+            allows it.
+
+        Yields
+        ------
+        OokSdmEntityLinks
+            Every item in the collection, which is empty if Ook does not know
+            the parent entity.
+
+        Raises
+        ------
+        UpstreamUnavailableError
+            Raised if Ook could not be reached or answered with a server
+            error, or if the circuit breaker is open.
+        httpx.HTTPError
+            Raised if Ook answered with another error or the response was
+            cut off.
+        ValueError
+            Raised if the response is not a JSON array of entities.
+        """
+        url: str | None = self._format_url(
+            path_template, url_params=url_params
+        )
+        while url:
+            if rate_limiter is not None:
+                await rate_limiter.wait()
+            self._log.debug("Streaming OOK collection Get", url=url)
+            async with self._stream(url) as response:
+                if response.status_code == codes.NOT_FOUND:
+                    return
+                response.raise_for_status()
+                parser = _JsonArrayParser()
+                async for chunk in response.aiter_text():
+                    for item in parser.feed(chunk):
+                        yield OokSdmEntityLinks.model_validate(item)
+                parser.close()
+                next_link = response.links.get("next")
+                url = next_link["url"] if next_link else None
 
     async def get_item(
         self,
@@ -116,21 +413,279 @@ class OokClient:
             path_template,
             url_params=url_params,
         )
-        self._logger.info("Sending OOK Get", url=url)
-        response = await self._http_client.get(url)
-        response.raise_for_status()
+        response = await self._fetch(url)
         return response.text
 
+    async def _fetch(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> Response:
+        """Send a GET request, merging concurrent unconditional requests."""
+        if headers or self._single_flight is None:
+            return await self._send_get(url, headers)
+        # The shared request is not timed as part of any request, so time
+        # the wait for it instead.
+        with timed("ook"):
+            return await self._single_flight.do(
+                url, lambda: self._send_get(url)
+            )
+
+    async def _send_get(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> Response:
+        self._log.info("Sending OOK Get", url=url)
+        response = await self._request(url, headers)
+        if response.status_code != codes.NOT_MODIFIED:
+            response.raise_for_status()
+        return response
+
+    async def _request(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> Response:
+        """Send a GET request to Ook, retrying transient failures.
+
+        Raises
+        ------
+        UpstreamOverloadedError
+            Raised if the request was not admitted.
+        UpstreamUnavailableError
+            Raised if Ook could not be reached or answered with a server
+            error, or if the circuit breaker is open.
+        """
+        retry = self._retry
+        if retry is None:
+            return await self._admitted_request(url, headers)
+        retry.record_request()
+        attempt = 0
+        while True:
+            try:
+                return await self._hedged_request(retry, url, headers)
+            except UpstreamTransientError:
+                if attempt >= retry.max_retries or not retry.spend():
+                    raise
+            attempt += 1
+            retry.stats.retries += 1
+            delay = retry.backoff(attempt)
+            self._log.info("Retrying Ook request", url=url, delay=delay)
+            await asyncio.sleep(delay)
+
+    async def _hedged_request(
+        self, retry: RetryController, url: str, headers: dict[str, str] | None
+    ) -> Response:
+        """Send a GET request to Ook, hedging it if it is slow.
+
+        If the request has not answered after the hedge delay, an identical
+        request is sent, and the first successful response is returned. If
+        both fail, the original request's error is raised.
+        """
+        delay = retry.hedge_delay
+        if delay is None:
+            return await self._admitted_request(url, headers)
+        first = asyncio.ensure_future(self._admitted_request(url, headers))
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+            if self._admission and not self._admission.has_capacity:
+                return await first
+            if not retry.spend():
+                return await first
+            retry.stats.hedges += 1
+            hedge = asyncio.ensure_future(self._admitted_request(url, headers))
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winners = [t for t in done if not t.exception()]
+                if winners:
+                    if hedge in winners:
+                        retry.stats.hedge_wins += 1
+                    return winners[0].result()
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _admitted_request(
+        self, url: str, headers: dict[str, str] | None
+    ) -> Response:
+        """Send a GET request to Ook, once admitted by the limiter."""
+        if self._admission is None:
+            return await self._send_request(url, headers)
+        async with self._admission.admit():
+            return await self._send_request(url, headers)
+
+    async def _send_request(
+        self, url: str, headers: dict[str, str] | None
+    ) -> Response:
+        """Send a GET request to Ook, recording its latency and status."""
+        breaker = self._circuit_breaker
+        permit = None
+        if breaker is not None and (permit := breaker.allow()) is None:
+            raise UpstreamUnavailableError("Ook is unavailable")
+        start = time.perf_counter()
+        try:
+            with timed("ook"):
+                response = await self._http_client.get(url, headers=headers)
+        except HTTPError as e:
+            self._record(start, "error", failed=True, permit=permit)
+            self._log.warning("Ook request failed", url=url, error=str(e))
+            raise UpstreamTransientError("Unable to reach Ook") from e
+        except BaseException:
+            if breaker is not None and permit is not None:
+                breaker.record_abandoned(permit)
+            raise
+        failed = response.is_server_error
+        self._record(start, response.status_code, failed=failed, permit=permit)
+        if failed:
+            self._log.warning(
+                "Ook request failed", url=url, status=response.status_code
+            )
+            msg = f"Ook failed with status {response.status_code}"
+            if response.status_code in _TRANSIENT_STATUSES:
+                raise UpstreamTransientError(msg)
+            raise UpstreamUnavailableError(msg)
+        return response
+
+    @asynccontextmanager
+    async def _stream(self, url: str) -> AsyncIterator[Response]:
+        """Send a GET request to Ook whose body is read while streamed.
+
+        The request is recorded in the metrics and the breaker once the body
+        has been read. A `ValueError` raised while reading it, because the
+        body is malformed, is recorded as a failed request.
+        """
+        breaker = self._circuit_breaker
+        permit = None
+        if breaker is not None and (permit := breaker.allow()) is None:
+            raise UpstreamUnavailableError("Ook is unavailable")
+        start = time.perf_counter()
+        try:
+            async with self._http_client.stream("GET", url) as response:
+                if not response.is_server_error:
+                    yield response
+        except HTTPStatusError as e:
+            self._record(
+                start, e.response.status_code, failed=False, permit=permit
+            )
+            raise
+        except HTTPError as e:
+            self._record(start, "error", failed=True, permit=permit)
+            self._log.warning("Ook request failed", url=url, error=str(e))
+            raise UpstreamTransientError("Unable to reach Ook") from e
+        except ValueError as e:
+            self._record(start, "error", failed=True, permit=permit)
+            self._log.warning(
+                "Ook response is malformed", url=url, error=str(e)
+            )
+            raise
+        except BaseException:
+            if breaker is not None and permit is not None:
+                breaker.record_abandoned(permit)
+            raise
+        failed = response.is_server_error
+        self._record(start, response.status_code, failed=failed, permit=permit)
+        if failed:
+            self._log.warning(
+                "Ook request failed", url=url, status=response.status_code
+            )
+            msg = f"Ook failed with status {response.status_code}"
+            if response.status_code in _TRANSIENT_STATUSES:
+                raise UpstreamTransientError(msg)
+            raise UpstreamUnavailableError(msg)
+
+    def _record(
+        self,
+        start: float,
+        status: int | str,
+        *,
+        failed: bool,
+        permit: CircuitPermit | None,
+    ) -> None:
+        """Record the outcome of a request in the metrics and the breaker."""
+        elapsed = time.perf_counter() - start
+        if self._metrics is not None:
+            self._metrics.ook_request_duration.observe(elapsed, status)
+        if self._retry is not None and not failed:
+            self._retry.observe(elapsed)
+        breaker = self._circuit_breaker
+        if breaker is None or permit is None:
+            return
+        if failed:
+            opened = breaker.record_failure(permit)
+        else:
+            opened = breaker.record_success(permit, elapsed)
+        if opened:
+            self._logger.error(
+                "Ook is failing, failing fast until it recovers",
+                consecutive_failures=breaker.stats.consecutive_failures,
+            )
+
+    async def _get_links(
+        self,
+        key: LinkKey,
+        path_template: str,
+        *,
+        url_params: dict,
+    ) -> OokLinksPayload:
+        """Get links from the cache, if configured, or else from Ook."""
+        url = self._format_url(path_template, url_params=url_params)
+
+        async def load(previous: OokLinksResult | None) -> OokLinksResult:
+            headers = {}
+            if previous and previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous and previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+            try:
+                response = await self._fetch(url, headers)
+            except HTTPStatusError as e:
+                # Ook returns 404 for entities it has no links for. That is
+                # an ordinary answer, not an upstream failure.
+                if e.response.status_code == codes.NOT_FOUND:
+                    return OokLinksResult(links=OokLinksPayload(b"[]"))
+                raise
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if previous and response.status_code == codes.NOT_MODIFIED:
+                result = OokLinksResult(
+                    links=previous.links,
+                    etag=etag or previous.etag,
+                    last_modified=last_modified or previous.last_modified,
+                    not_modified=True,
+                )
+            else:
+                # Only the fields needed to pick a redirect are decoded here,
+                # which also rejects a malformed response before it is
+                # cached.
+                links = OokLinksPayload(response.content)
+                links.targets()
+                result = OokLinksResult(
+                    links=links, etag=etag, last_modified=last_modified
+                )
+            if self._ranking is not None:
+                result.links.best_url(self._ranking)
+            return result
+
+        if self._link_cache is None:
+            return (await load(None)).links
+        return await self._link_cache.get(key, load)
+
     def _format_url(
         self,
         path_template: str,
         *,
         url_params: variable.VariableValueDict | None = None,
     ) -> str:
-        if not path_template.startswith("/"):
-            path_template = "/" + path_template
-        uri_template = f"{self.base_url}{path_template}"
-        return expand(uri_template, url_params)
+        template = self._templates.get(path_template)
+        if template is None:
+            path = path_template
+            if not path.startswith("/"):
+                path = "/" + path
+            template = URITemplate(f"{self.base_url}{path}")
+            self._templates[path_template] = template
+        return template.expand(url_params)
 
     def _parse_tap_table_name_to_sdm(
         self, tap_table_name: str
@@ -150,8 +705,98 @@ class OokClient:
         tuple[str, str]
             The schema and table names.
         """
-        schema_name, table_name = tap_table_name.split(".", maxsplit=1)
-        return schema_name, table_name
+        return parse_tap_table_name(tap_table_name)
+
+
+class _JsonArrayParser:
+    """Parse the items of a JSON array of objects from chunks of text."""
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._ended = False
+        self._expect_item = True
+        self._count = 0
+
+    def feed(self, chunk: str) -> list[object]:
+        """Add text and return the items it completed.
+
+        Raises
+        ------
+        ValueError
+            Raised if the text is not a JSON array of objects.
+        """
+        buffer = self._buffer + chunk
+        position = 0
+        items = []
+        while (position := _skip_space(buffer, position)) < len(buffer):
+            if buffer[position] == "{" and self._expect_item and self._started:
+                try:
+                    item, position = self._decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    # The object is incomplete until more text arrives.
+                    break
+                items.append(item)
+                self._count += 1
+                self._expect_item = False
+            else:
+                self._parse_delimiter(buffer[position])
+                position += 1
+        self._buffer = buffer[position:]
+        return items
+
+    def _parse_delimiter(self, char: str) -> None:
+        if self._ended:
+            raise ValueError("Unexpected data after JSON array")
+        if not self._started and char == "[":
+            self._started = True
+        elif (
+            char == "]"
+            and self._started
+            and (not self._expect_item or not self._count)
+        ):
+            self._ended = True
+        elif char == "," and not self._expect_item:
+            self._expect_item = True
+        else:
+            raise ValueError(f"Unexpected {char!r} in JSON array of objects")
+
+    def close(self) -> None:
+        """Check that the whole array was received.
+
+        Raises
+        ------
+        ValueError
+            Raised if the array was cut off or an item is malformed.
+        """
+        if not self._ended:
+            raise ValueError("Truncated or malformed JSON array")
+
+
+def _skip_space(text: str, position: int) -> int:
+    """Get the position of the first non-whitespace character from a
+    position.
+    """
+    match = _WHITESPACE.match(text, position)
+    return match.end() if match else position
+
+
+def parse_tap_table_name(tap_table_name: str) -> tuple[str, str]:
+    """Parse a TAP table name into SDM schema and table names.
+
+    Parameters
+    ----------
+    tap_table_name
+        The name of the TAP table, such as ``dp02_dc2_catalogs.Object``.
+
+    Returns
+    -------
+    tuple[str, str]
+        The schema and table names.
+    """
+    schema_name, table_name = tap_table_name.split(".", maxsplit=1)
+    return schema_name, table_name
 
 
 class OokLink(BaseModel):
@@ -183,3 +828,169 @@ class OokLinksArray(RootModel):
     """An array of documentation links."""
 
     root: list[OokLink]
+
+
+class OokLinkTarget(TypedDict):
+    """The fields of a documentation link needed to choose a redirect.
+
+    This is a `dict` rather than a model because building dictionaries is
+    the cheapest way for pydantic to decode a large array of links.
+    """
+
+    url: str
+    """Documentation URL."""
+
+    type: str
+    """Type of documentation."""
+
+    collection_title: NotRequired[str | None]
+    """Title of the documentation collection."""
+
+
+_TARGETS_ADAPTER = TypeAdapter(list[OokLinkTarget])
+
+
+class LinkRanking(Protocol):
+    """A policy for choosing the documentation link to redirect to."""
+
+    @property
+    def key(self) -> str:
+        """Identifies the policy, to recognize links it did not rank."""
+
+    def best_url(self, links: Iterable[OokLinkTarget | OokLink]) -> str | None:
+        """Choose the link to redirect to, if any."""
+
+
+class OokLinksPayload:
+    """A JSON array of documentation links from Ook, decoded on demand.
+
+    Choosing a redirect needs only the URL and type of each link, which
+    `targets` decodes without building `OokLink` models. `to_model` decodes
+    the full models, for responses that include every link. Each is decoded
+    at most once, and the best link is chosen at most once per ranking
+    policy. Payloads compare equal if their JSON is identical.
+
+    Parameters
+    ----------
+    data
+        The JSON array, as sent by Ook.
+    ranked
+        The key of a ranking policy and the best URL it chose for these
+        links, if already known, such as from a cache entry.
+    """
+
+    __slots__ = ("_model", "_targets", "data", "ranked")
+
+    def __init__(
+        self, data: bytes, *, ranked: tuple[str, str | None] | None = None
+    ) -> None:
+        self.data = data
+        self.ranked = ranked
+        self._targets: list[OokLinkTarget] | None = None
+        self._model: OokLinksArray | None = None
+
+    @classmethod
+    def from_model(cls, links: OokLinksArray) -> Self:
+        """Create a payload from decoded links."""
+        payload = cls(links.model_dump_json(exclude_none=True).encode())
+        payload._model = links
+        return payload
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OokLinksPayload):
+            return NotImplemented
+        return self.data == other.data
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def __len__(self) -> int:
+        return len(self.targets())
+
+    def __repr__(self) -> str:
+        return f"OokLinksPayload({self.data!r})"
+
+    def targets(self) -> list[OokLinkTarget]:
+        """Decode the URL and type of each link.
+
+        Raises
+        ------
+        pydantic.ValidationError
+            Raised if the payload is not an array of links.
+        """
+        if self._targets is None:
+            with timed("decode"):
+                self._targets = _TARGETS_ADAPTER.validate_json(self.data)
+        return self._targets
+
+    def best_url(self, ranking: LinkRanking) -> str | None:
+        """Choose the link to redirect to.
+
+        Parameters
+        ----------
+        ranking
+            The ranking policy. If these links were last ranked with the
+            same policy, its choice is reused without decoding the links.
+
+        Returns
+        -------
+        str or None
+            URL of the best link, if any.
+
+        Raises
+        ------
+        pydantic.ValidationError
+            Raised if the payload is not an array of links.
+        """
+        if self.ranked is None or self.ranked[0] != ranking.key:
+            targets = self.targets()
+            with timed("rank"):
+                self.ranked = (ranking.key, ranking.best_url(targets))
+        return self.ranked[1]
+
+    def to_model(self) -> OokLinksArray:
+        """Decode the links in full.
+
+        Raises
+        ------
+        pydantic.ValidationError
+            Raised if the payload is not an array of links.
+        """
+        if self._model is None:
+            self._model = OokLinksArray.model_validate_json(self.data)
+        return self._model
+
+
+@dataclass(slots=True, frozen=True)
+class OokLinksResult:
+    """Links fetched from Ook, with the validators Ook sent for them."""
+
+    links: OokLinksPayload
+    """The links."""
+
+    etag: str | None = None
+    """The ``ETag`` response header, for revalidation with
+    ``If-None-Match``.
+    """
+
+    last_modified: str | None = None
+    """The ``Last-Modified`` response header, for revalidation with
+    ``If-Modified-Since``.
+    """
+
+    not_modified: bool = False
+    """Whether Ook confirmed that previously fetched links are unchanged."""
+
+
+class OokSdmEntityLinks(BaseModel):
+    """The documentation links for one SDM schema, table, or column."""
+
+    name: str = Field(..., title="Name of the schema, table, or column")
+
+    links: list[OokLink] = Field(..., title="Documentation links")
+
+
+class OokSdmEntityLinksArray(RootModel):
+    """A page of SDM entities and their documentation links."""
+
+    root: list[OokSdmEntityLinks]
@@ -0,0 +1,148 @@
+"""Background prefetching of data that requests are likely to need soon."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from structlog.stdlib import BoundLogger
+
+__all__ = ["PrefetchStats", "Prefetcher"]
+
+
+@dataclass(slots=True)
+class PrefetchStats:
+    """Counters of a `Prefetcher`."""
+
+    scheduled: int = 0
+    """Prefetches started or queued."""
+
+    deduplicated: int = 0
+    """Prefetches skipped because the key was prefetched recently."""
+
+    dropped: int = 0
+    """Prefetches skipped because too many were pending."""
+
+    completed: int = 0
+    """Prefetches that succeeded."""
+
+    failed: int = 0
+    """Prefetches that failed."""
+
+    pending: int = 0
+    """Prefetches currently queued or running."""
+
+
+class Prefetcher[K: Hashable]:
+    """Run prefetches in the background, at most once per key for a while.
+
+    A prefetch is scheduled without waiting for it, so it never delays the
+    request that triggered it. It is skipped if the same key was prefetched,
+    successfully or not yet finished, within ``ttl``, or if ``max_pending``
+    prefetches are already queued or running. At most ``concurrency`` of
+    them run at once. A failed prefetch is logged and forgotten, so that the
+    next request for the key tries again.
+
+    Prefetches run outside of the context of the request that scheduled
+    them, so they are not timed or logged as part of it.
+
+    Parameters
+    ----------
+    concurrency
+        Maximum number of prefetches running at once.
+    max_pending
+        Maximum number of prefetches queued or running.
+    ttl
+        How long a key is not prefetched again, typically the lifetime of
+        what it prefetches in the cache.
+    logger
+        Logger for failed prefetches.
+    max_keys
+        Maximum number of recently prefetched keys remembered. The oldest are
+        forgotten first.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        max_pending: int,
+        ttl: timedelta,
+        logger: BoundLogger,
+        max_keys: int = 10_000,
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._max_pending = max_pending
+        self._ttl = ttl.total_seconds()
+        self._logger = logger
+        self._max_keys = max_keys
+        self._expires: OrderedDict[K, float] = OrderedDict()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.stats = PrefetchStats()
+
+    def schedule(self, key: K, func: Callable[[], Awaitable[object]]) -> bool:
+        """Start a prefetch in the background, unless it is not needed.
+
+        Parameters
+        ----------
+        key
+            Identifies what is prefetched.
+        func
+            Called to prefetch it.
+
+        Returns
+        -------
+        bool
+            Whether the prefetch was scheduled.
+        """
+        now = time.monotonic()
+        expires = self._expires.get(key)
+        if expires is not None and expires > now:
+            self.stats.deduplicated += 1
+            return False
+        if len(self._tasks) >= self._max_pending:
+            self.stats.dropped += 1
+            return False
+
+        self._expires[key] = now + self._ttl
+        self._expires.move_to_end(key)
+        while len(self._expires) > self._max_keys:
+            self._expires.popitem(last=False)
+        self.stats.scheduled += 1
+        self.stats.pending += 1
+        task = asyncio.create_task(
+            self._run(key, func), context=contextvars.Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def join(self) -> None:
+        """Wait for the pending prefetches to finish."""
+        await asyncio.gather(*self._tasks)
+
+    async def aclose(self) -> None:
+        """Cancel the pending prefetches."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(
+        self, key: K, func: Callable[[], Awaitable[object]]
+    ) -> None:
+        try:
+            async with self._semaphore:
+                await func()
+        except Exception as e:
+            self.stats.failed += 1
+            self._expires.pop(key, None)
+            self._logger.warning("Prefetch failed", key=key, error=str(e))
+        else:
+            self.stats.completed += 1
+        finally:
+            self.stats.pending -= 1
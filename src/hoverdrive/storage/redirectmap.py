@@ -0,0 +1,224 @@
+"""Static exports of the SDM link index for serving redirects without
+hoverdrive.
+
+The redirect of a table or column depends only on its name, so once the link
+index is loaded, the redirects can be written out as a static lookup table
+that an ingress or CDN serves directly, leaving hoverdrive to handle only the
+entities missing from it and the dynamic endpoints.
+
+The ``nginx`` format is a file to include in the ``http`` context of the
+nginx configuration. It defines ``$hoverdrive_table_link`` from
+``$arg_table`` and ``$hoverdrive_column_link`` from ``$arg_table`` and
+``$arg_column``, which are empty for unknown entities, so that the redirect
+locations can answer from them and otherwise pass the request on:
+
+.. code-block:: nginx
+
+   location = /hoverdrive/column-docs-redirect {
+       if ($hoverdrive_column_link) {
+           return 307 $hoverdrive_column_link;
+       }
+       proxy_pass http://hoverdrive;
+   }
+
+Large maps need larger ``map_hash_max_size`` and ``map_hash_bucket_size``
+settings than the nginx defaults. Keys of nginx maps match regardless of
+case, so entities whose names differ only in case are left out of the map,
+with a comment saying so, and left to hoverdrive.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+from collections.abc import Callable, Iterator
+from enum import StrEnum
+from pathlib import Path
+from typing import TextIO
+
+from .linkindex import SdmSchemaIndex
+
+__all__ = ["RedirectMapFormat", "write_redirect_map", "write_table_files"]
+
+_NGINX_UNSAFE = re.compile(r'["\\$\s;{}]')
+"""Characters that cannot appear in a quoted nginx map key or value.
+
+``$`` would start a variable in a value, and the others would need escaping
+that is not worth the risk for entities that hoverdrive can serve itself.
+"""
+
+_UNSAFE_FILE_NAME = re.compile(r"[/\\\0]|^\.")
+"""Characters and prefixes that would let a table name escape the directory
+of per-table files, or hide its file.
+"""
+
+_TABLE_FILE_NAME = re.compile(r"^[^.].*\.[^.]+\.json$")
+"""Pattern of the names of per-table files, ``<schema>.<table>.json``."""
+
+
+class RedirectMapFormat(StrEnum):
+    """File format of a static redirect map."""
+
+    nginx = "nginx"
+    """``map`` blocks for nginx."""
+
+    json = "json"
+    """JSON object with ``tables`` and ``columns`` keys."""
+
+    csv = "csv"
+    """CSV with ``table``, ``column``, and ``url`` columns, where ``column``
+    is empty for tables.
+    """
+
+
+def write_redirect_map(
+    schemas: SdmSchemaIndex, path: Path, map_format: RedirectMapFormat
+) -> int:
+    """Write the redirect of every documented table and column to a file.
+
+    Tables are identified by their TAP names, such as
+    ``dp02_dc2_catalogs.Object``, as in the ``table`` query parameter of the
+    redirect endpoints. The file is written to a temporary file that then
+    replaces it, so a reader never sees a partially written map.
+
+    Parameters
+    ----------
+    schemas
+        The contents of the link index.
+    path
+        Path of the file to write.
+    map_format
+        Format of the file.
+
+    Returns
+    -------
+    int
+        Number of redirects written. The ``nginx`` format leaves out the
+        entities whose names or links contain characters that cannot be
+        safely quoted, and those whose names differ only in case.
+    """
+    writers: dict[RedirectMapFormat, Callable[[SdmSchemaIndex, TextIO], int]]
+    writers = {
+        RedirectMapFormat.nginx: _write_nginx,
+        RedirectMapFormat.json: _write_json,
+        RedirectMapFormat.csv: _write_csv,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8", newline="") as output:
+        count = writers[map_format](schemas, output)
+    tmp_path.replace(path)
+    return count
+
+
+def write_table_files(schemas: SdmSchemaIndex, directory: Path) -> int:
+    """Write the column links of each table to its own JSON file.
+
+    Each file is named after the TAP name of the table, such as
+    ``dp02_dc2_catalogs.Object.json``, and holds the same document as the
+    ``/column-docs-urls`` endpoint returns for the table when no columns are
+    requested, so that it can be served in its place. Tables whose names
+    contain path separators or start with a dot are skipped, so that names
+    from Ook cannot write outside of the directory. Files of tables that
+    were not written, such as tables removed from Ook since the previous
+    export, are deleted, but other files in the directory are left alone.
+
+    Parameters
+    ----------
+    schemas
+        The contents of the link index.
+    directory
+        Directory to write the files to.
+
+    Returns
+    -------
+    int
+        Number of files written.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    written: set[str] = set()
+    for schema_name, tables in schemas.items():
+        for table_name, table in tables.items():
+            tap_name = f"{schema_name}.{table_name}"
+            if _UNSAFE_FILE_NAME.search(tap_name):
+                continue
+            body = {"table": tap_name, "columns": dict(table.columns)}
+            path = directory / f"{tap_name}.json"
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_text(json.dumps(body), encoding="utf-8")
+            tmp_path.replace(path)
+            written.add(path.name)
+    for path in directory.iterdir():
+        if path.name not in written and _TABLE_FILE_NAME.match(path.name):
+            path.unlink(missing_ok=True)
+    return len(written)
+
+
+def _iter_redirects(
+    schemas: SdmSchemaIndex,
+) -> Iterator[tuple[str, str | None, str]]:
+    """Generate the TAP table name, column name or `None` for the table
+    itself, and link of every documented entity.
+    """
+    for schema_name, tables in schemas.items():
+        for table_name, table in tables.items():
+            tap_name = f"{schema_name}.{table_name}"
+            if table.link:
+                yield tap_name, None, table.link
+            for column_name, url in table.columns.items():
+                yield tap_name, column_name, url
+
+
+def _write_nginx(schemas: SdmSchemaIndex, output: TextIO) -> int:
+    tables: dict[str, list[tuple[str, str]]] = {}
+    columns: dict[str, list[tuple[str, str]]] = {}
+    for table, column, url in _iter_redirects(schemas):
+        key = table if column is None else f"{table}:{column}"
+        if _NGINX_UNSAFE.search(key) or _NGINX_UNSAFE.search(url):
+            continue
+        entries = tables if column is None else columns
+        entries.setdefault(key.lower(), []).append((key, url))
+    count = 0
+    for source, variable, entries in (
+        ("$arg_table", "$hoverdrive_table_link", tables),
+        ('"$arg_table:$arg_column"', "$hoverdrive_column_link", columns),
+    ):
+        output.write(f"map {source} {variable} {{\n")
+        output.write('    default "";\n')
+        for matches in entries.values():
+            if len(matches) == 1:
+                key, url = matches[0]
+                output.write(f'    "{key}" "{url}";\n')
+                count += 1
+            else:
+                # nginx compares string keys without regard to case, so none
+                # of these can be told apart.
+                output.writelines(
+                    f'    # "{key}" left out: differs only in case\n'
+                    for key, _ in matches
+                )
+        output.write("}\n")
+    return count
+
+
+def _write_json(schemas: SdmSchemaIndex, output: TextIO) -> int:
+    tables: dict[str, str] = {}
+    columns: dict[str, dict[str, str]] = {}
+    for table, column, url in _iter_redirects(schemas):
+        if column is None:
+            tables[table] = url
+        else:
+            columns.setdefault(table, {})[column] = url
+    json.dump({"tables": tables, "columns": columns}, output)
+    return len(tables) + sum(len(c) for c in columns.values())
+
+
+def _write_csv(schemas: SdmSchemaIndex, output: TextIO) -> int:
+    writer = csv.writer(output)
+    writer.writerow(("table", "column", "url"))
+    count = 0
+    for table, column, url in _iter_redirects(schemas):
+        writer.writerow((table, column or "", url))
+        count += 1
+    return count
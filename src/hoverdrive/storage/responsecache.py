@@ -0,0 +1,85 @@
+"""Cache of pre-serialized response bodies."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+__all__ = ["ResponseCache", "ResponseCacheStats"]
+
+
+@dataclass(slots=True)
+class ResponseCacheStats:
+    """Counters describing the effectiveness of a `ResponseCache`."""
+
+    hits: int = 0
+    """Lookups that returned a stored body."""
+
+    misses: int = 0
+    """Lookups that found no body, or one built from different data."""
+
+
+@dataclass(slots=True)
+class _Entry:
+    source: object
+    body: bytes
+
+
+class ResponseCache[K: Hashable]:
+    """A size-bounded LRU cache of serialized response bodies.
+
+    Each body is stored together with the data it was serialized from. A
+    lookup only returns the body if that data still compares equal to the
+    caller's current data, so the cache never needs its own TTL: once the
+    underlying links change, the next request re-serializes them.
+
+    Parameters
+    ----------
+    max_size
+        Maximum number of bodies to hold. Set to 0 to disable the cache.
+    """
+
+    def __init__(self, *, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[K, _Entry] = OrderedDict()
+        self.stats = ResponseCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K, source: object) -> bytes | None:
+        """Get the body for a key if it was built from equal data.
+
+        Parameters
+        ----------
+        key
+            The cache key.
+        source
+            The data the response would be serialized from now.
+
+        Returns
+        -------
+        bytes or None
+            The stored body, or `None` if there is no usable body.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.source != source:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.body
+
+    def set(self, key: K, source: object, body: bytes) -> None:
+        """Store a body along with the data it was serialized from."""
+        if self._max_size <= 0:
+            return
+        self._entries[key] = _Entry(source=source, body=body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Drop the body for a key, if present."""
+        self._entries.pop(key, None)
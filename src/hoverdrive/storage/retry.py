@@ -0,0 +1,158 @@
+"""Retries and hedged requests to an upstream service."""
+
+from __future__ import annotations
+
+import math
+import random
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+__all__ = ["RetryController", "RetryStats"]
+
+_LATENCY_WINDOW = 1000
+"""Number of recent request durations the hedge delay is computed from."""
+
+_MIN_SAMPLES = 50
+"""Number of durations needed before requests are hedged."""
+
+_RECOMPUTE_EVERY = 50
+"""Number of new durations after which the hedge delay is recomputed."""
+
+_MAX_BUDGET = 10.0
+"""Maximum number of retries and hedges that can be sent in a burst."""
+
+
+@dataclass(slots=True)
+class RetryStats:
+    """Counters of a `RetryController`."""
+
+    retries: int = 0
+    """Failed requests that were retried."""
+
+    hedges: int = 0
+    """Hedge requests sent because the original request was slow."""
+
+    hedge_wins: int = 0
+    """Hedge requests that answered before the original request."""
+
+    budget_exhausted: int = 0
+    """Retries and hedges not sent because the retry budget was spent."""
+
+
+class RetryController:
+    """Decide when to retry or hedge requests to an upstream service.
+
+    A request that has not answered after the ``hedge_percentile`` percentile
+    of the latency of recent requests, but at least ``hedge_min_delay``, is
+    hedged with a second identical request, and the first response wins. A
+    request that fails transiently is retried up to ``max_retries`` times,
+    after a random delay of up to ``backoff`` doubled for every retry.
+
+    Every retry and hedge spends a token from a budget that is refilled by
+    ``budget_ratio`` tokens per original request, up to a small burst. While
+    the upstream service is failing or slow across the board, the budget
+    runs out and the extra load is capped at that fraction of the original
+    load, instead of multiplying it.
+
+    Parameters
+    ----------
+    max_retries
+        Maximum number of retries of a failed request.
+    backoff
+        Maximum delay before the first retry.
+    hedge_percentile
+        Percentile of recent latencies after which requests are hedged, or
+        `None` to not hedge.
+    hedge_min_delay
+        Minimum delay before a request is hedged.
+    budget_ratio
+        Retries and hedges allowed per original request, over time.
+    rng
+        Source of random numbers in [0, 1), for tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int,
+        backoff: timedelta,
+        hedge_percentile: float | None,
+        hedge_min_delay: timedelta,
+        budget_ratio: float,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.max_retries = max_retries
+        self._backoff = backoff.total_seconds()
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_delay = hedge_min_delay.total_seconds()
+        self._budget_ratio = budget_ratio
+        self._budget = _MAX_BUDGET
+        self._rng = rng
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._new_latencies = 0
+        self._hedge_delay: float | None = None
+        self.stats = RetryStats()
+
+    @property
+    def hedge_delay(self) -> float | None:
+        """Seconds after which a request is hedged, or `None` to not hedge
+        it, if hedging is disabled or too few requests have been observed.
+        """
+        return self._hedge_delay
+
+    def backoff(self, retry: int) -> float:
+        """Choose the delay before a retry.
+
+        Parameters
+        ----------
+        retry
+            Number of the retry, starting at 1.
+
+        Returns
+        -------
+        float
+            Delay in seconds.
+        """
+        return self._rng() * self._backoff * 2 ** (retry - 1)
+
+    def observe(self, duration: float) -> None:
+        """Record the duration of a successful request.
+
+        Parameters
+        ----------
+        duration
+            Duration in seconds.
+        """
+        if self._hedge_percentile is None:
+            return
+        self._latencies.append(duration)
+        self._new_latencies += 1
+        if (
+            self._new_latencies >= _RECOMPUTE_EVERY
+            and len(self._latencies) >= _MIN_SAMPLES
+        ):
+            self._new_latencies = 0
+            latencies = sorted(self._latencies)
+            rank = math.ceil(self._hedge_percentile / 100 * len(latencies))
+            delay = latencies[max(rank - 1, 0)]
+            self._hedge_delay = max(delay, self._hedge_min_delay)
+
+    def record_request(self) -> None:
+        """Refill the budget for an original request."""
+        self._budget = min(self._budget + self._budget_ratio, _MAX_BUDGET)
+
+    def spend(self) -> bool:
+        """Spend a token of the budget on a retry or hedge.
+
+        Returns
+        -------
+        bool
+            Whether the retry or hedge may be sent.
+        """
+        if self._budget < 1:
+            self.stats.budget_exhausted += 1
+            return False
+        self._budget -= 1
+        return True
@@ -0,0 +1,96 @@
+"""Coalescing of identical concurrent upstream requests."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from collections.abc import Callable, Coroutine, Hashable
+from dataclasses import dataclass
+
+__all__ = ["SingleFlight", "SingleFlightStats"]
+
+
+@dataclass(slots=True)
+class SingleFlightStats:
+    """Counters describing how many calls a `SingleFlight` merged."""
+
+    calls: int = 0
+    """Calls that actually ran the underlying function."""
+
+    merged: int = 0
+    """Calls that joined an in-flight call for the same key instead."""
+
+
+@dataclass(slots=True)
+class _Call[V]:
+    """An in-flight call and the number of callers waiting on it."""
+
+    task: asyncio.Task[V]
+    waiters: int = 0
+
+
+class SingleFlight[K: Hashable, V]:
+    """Share one in-flight call among concurrent callers with the same key.
+
+    The first caller for a key starts the call in its own task. Callers that
+    arrive with the same key while it is running wait on that task rather
+    than starting another. Once the call finishes, the key is forgotten, so
+    the next caller starts a new call; caching results is left to the caller.
+
+    The call runs outside of the context of the caller that started it,
+    since it is shared with callers from other requests, so it is not timed
+    or logged as part of any of them.
+
+    Errors raised by the call are raised to every waiter. Cancelling a waiter
+    only cancels that waiter; the shared call is cancelled once no waiters
+    are left, so an abandoned request does not keep running upstream.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, _Call[V]] = {}
+        self.stats = SingleFlightStats()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: K, func: Callable[[], Coroutine[object, object, V]]
+    ) -> V:
+        """Run ``func``, or join an in-flight call for the same key.
+
+        Parameters
+        ----------
+        key
+            Identifies calls that may be shared, such as a request URL.
+        func
+            Called to start the underlying call if none is in flight.
+
+        Returns
+        -------
+        V
+            The result of the (possibly shared) call.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            self.stats.calls += 1
+            task = asyncio.create_task(func(), context=contextvars.Context())
+            call = _Call(task=task)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.stats.merged += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every waiter was cancelled. Stop the shared call and make
+                # sure that no new caller joins it while it unwinds.
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: K, call: _Call[V]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -0,0 +1,155 @@
+"""On-disk snapshot of the SDM link index."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .linkindex import ColumnLinks, SdmSchemaIndex, SdmTableIndex
+
+__all__ = ["LinkSnapshot", "LinkSnapshotStore"]
+
+_FORMAT_VERSION = "1"
+"""Version of the snapshot schema, bumped on incompatible changes."""
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE links (
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    column_name TEXT,
+    url TEXT
+);
+"""
+"""SQLite schema of a snapshot.
+
+Table rows have a null ``column_name`` and may have a null ``url`` if only
+the table's columns are documented.
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class LinkSnapshot:
+    """A link index read from a snapshot."""
+
+    schemas: SdmSchemaIndex
+    """The indexed links."""
+
+    created_at: datetime
+    """When the snapshot was written."""
+
+    ranking: str | None = None
+    """Key of the ranking policy that chose the links, if recorded."""
+
+
+class LinkSnapshotStore:
+    """Read and write SQLite snapshots of the SDM link index.
+
+    Writes go to a temporary file that then replaces the snapshot, so a
+    reader never sees a partially written snapshot. The methods do blocking
+    I/O and should be run in a thread from async code.
+
+    Parameters
+    ----------
+    path
+        Path of the snapshot file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def load(self) -> LinkSnapshot | None:
+        """Read the snapshot.
+
+        Returns
+        -------
+        LinkSnapshot or None
+            The snapshot, or `None` if there is no snapshot or it was written
+            in an incompatible format.
+
+        Raises
+        ------
+        sqlite3.Error
+            Raised if the snapshot file is corrupt.
+        """
+        if not self._path.exists():
+            return None
+        uri = f"{self._path.resolve().as_uri()}?mode=ro"
+        with closing(sqlite3.connect(uri, uri=True)) as db:
+            meta = dict(db.execute("SELECT key, value FROM meta"))
+            if meta.get("format_version") != _FORMAT_VERSION:
+                return None
+            schemas: SdmSchemaIndex = {}
+            columns: dict[tuple[str, str], dict[str, str]] = {}
+            rows = db.execute(
+                "SELECT schema_name, table_name, column_name, url FROM links"
+            )
+            for schema_name, table_name, column_name, url in rows:
+                tables = schemas.setdefault(schema_name, {})
+                table = tables.get(table_name)
+                if table is None:
+                    table = tables[table_name] = SdmTableIndex()
+                if column_name is None:
+                    table.link = url
+                else:
+                    key = (schema_name, table_name)
+                    columns.setdefault(key, {})[column_name] = url
+        for (schema_name, table_name), links in columns.items():
+            schemas[schema_name][table_name].columns = ColumnLinks(links)
+        return LinkSnapshot(
+            schemas=schemas,
+            created_at=datetime.fromisoformat(meta["created_at"]),
+            ranking=meta.get("ranking"),
+        )
+
+    def save(
+        self, schemas: SdmSchemaIndex, *, ranking: str | None = None
+    ) -> None:
+        """Write a snapshot, replacing any existing one.
+
+        Parameters
+        ----------
+        schemas
+            The links to write.
+        ranking
+            Key of the ranking policy that chose the links.
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(f".{self._path.name}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        with closing(sqlite3.connect(tmp_path)) as db:
+            db.executescript(_SCHEMA)
+            meta = [
+                ("format_version", _FORMAT_VERSION),
+                ("created_at", datetime.now(tz=UTC).isoformat()),
+            ]
+            if ranking is not None:
+                meta.append(("ranking", ranking))
+            db.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", meta)
+            db.executemany(
+                "INSERT INTO links VALUES (?, ?, ?, ?)",
+                (
+                    row
+                    for schema_name, tables in schemas.items()
+                    for table_name, table in tables.items()
+                    for row in _table_rows(schema_name, table_name, table)
+                ),
+            )
+            db.commit()
+        tmp_path.replace(self._path)
+
+
+def _table_rows(
+    schema_name: str, table_name: str, table: SdmTableIndex
+) -> list[tuple[str, str, str | None, str | None]]:
+    rows: list[tuple[str, str, str | None, str | None]] = [
+        (schema_name, table_name, None, table.link)
+    ]
+    rows.extend(
+        (schema_name, table_name, column_name, url)
+        for column_name, url in table.columns.items()
+    )
+    return rows
@@ -0,0 +1,257 @@
+"""Timing of the stages of a request.
+
+The timing middleware starts a `RequestTimer` for each request and records it
+in a context variable, so that the dependencies, services, and clients that
+handle the request can time their stages with `timed` without being passed
+the timer. Stages form a tree of spans, which is summarized in a
+``Server-Timing`` response header and can be exported as trace spans. Outside
+of a timed request, `timed` does nothing.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from structlog.stdlib import BoundLogger
+
+__all__ = [
+    "LoggingSpanExporter",
+    "OpenTelemetrySpanExporter",
+    "RequestTimer",
+    "SpanExporter",
+    "TimingSpan",
+    "mark",
+    "time_request",
+    "timed",
+]
+
+_timer: ContextVar[RequestTimer | None] = ContextVar(
+    "hoverdrive_timer", default=None
+)
+_current_span: ContextVar[int] = ContextVar("hoverdrive_span", default=0)
+_NO_TIMING = nullcontext()
+
+
+@dataclass(slots=True, frozen=True)
+class TimingSpan:
+    """A timed stage of a request."""
+
+    name: str
+    """Name of the stage, such as ``ook`` or ``cache``."""
+
+    span_id: int
+    """Identifier of the span within its request."""
+
+    parent_id: int | None
+    """Identifier of the enclosing span, or `None` for the whole request."""
+
+    start_ns: int
+    """Start time, in nanoseconds since the epoch."""
+
+    duration: float
+    """Duration in seconds."""
+
+
+class RequestTimer:
+    """Spans of the stages of a single request.
+
+    The timer itself is the root span, with identifier 0, named after the
+    request.
+
+    Parameters
+    ----------
+    name
+        Name of the root span.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.spans: list[TimingSpan] = []
+        self._ids = itertools.count(1)
+        self._start = time.perf_counter()
+        self._start_ns = time.time_ns()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time a stage, nested in the current stage."""
+        span_id = next(self._ids)
+        parent_id = _current_span.get()
+        token = _current_span.set(span_id)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _current_span.reset(token)
+            self._add(name, span_id, parent_id, start)
+
+    def mark(self, name: str) -> None:
+        """Record a stage that started with the request and ends now."""
+        self._add(name, next(self._ids), 0, self._start)
+
+    def finish(self) -> list[TimingSpan]:
+        """End the request and return all of its spans, root first."""
+        root = TimingSpan(
+            name=self.name,
+            span_id=0,
+            parent_id=None,
+            start_ns=self._start_ns,
+            duration=time.perf_counter() - self._start,
+        )
+        return [root, *self.spans]
+
+    def server_timing(self) -> str:
+        """Summarize the stages as the value of a ``Server-Timing`` header.
+
+        Durations of stages with the same name, such as the lookups of a
+        batch request, are added up, and the time since the start of the
+        request is reported as ``total``.
+        """
+        durations: dict[str, float] = {}
+        for span in self.spans:
+            durations[span.name] = durations.get(span.name, 0) + span.duration
+        durations["total"] = time.perf_counter() - self._start
+        return ", ".join(
+            f"{name};dur={duration * 1000:.3f}"
+            for name, duration in durations.items()
+        )
+
+    def _add(
+        self, name: str, span_id: int, parent_id: int, start: float
+    ) -> None:
+        end = time.perf_counter()
+        start_ns = self._start_ns + int((start - self._start) * 1e9)
+        span = TimingSpan(name, span_id, parent_id, start_ns, end - start)
+        self.spans.append(span)
+
+
+@contextmanager
+def time_request(name: str) -> Iterator[RequestTimer]:
+    """Time the request handled by the current task.
+
+    Parameters
+    ----------
+    name
+        Name of the root span.
+
+    Yields
+    ------
+    RequestTimer
+        The timer that `timed` and `mark` record stages in until the context
+        manager exits.
+    """
+    timer = RequestTimer(name)
+    timer_token = _timer.set(timer)
+    span_token = _current_span.set(0)
+    try:
+        yield timer
+    finally:
+        _current_span.reset(span_token)
+        _timer.reset(timer_token)
+
+
+def timed(name: str) -> AbstractContextManager[Any]:
+    """Time a stage of the current request, if it is being timed.
+
+    Parameters
+    ----------
+    name
+        Name of the stage.
+
+    Returns
+    -------
+    contextlib.AbstractContextManager
+        Context manager wrapping the stage.
+    """
+    timer = _timer.get()
+    if timer is None:
+        return _NO_TIMING
+    return timer.span(name)
+
+
+def mark(name: str) -> None:
+    """Record a stage of the current request from its start until now.
+
+    Parameters
+    ----------
+    name
+        Name of the stage.
+    """
+    timer = _timer.get()
+    if timer is not None:
+        timer.mark(name)
+
+
+class SpanExporter(Protocol):
+    """Destination of the spans of timed requests."""
+
+    def export(self, spans: Sequence[TimingSpan]) -> None:
+        """Export the spans of a request, root first."""
+
+
+class LoggingSpanExporter:
+    """Log the spans of each request as a single message.
+
+    Parameters
+    ----------
+    logger
+        Logger to log the spans with.
+    """
+
+    def __init__(self, logger: BoundLogger) -> None:
+        self._logger = logger
+
+    def export(self, spans: Sequence[TimingSpan]) -> None:
+        self._logger.info(
+            "Request timing",
+            spans=[
+                {
+                    "name": s.name,
+                    "id": s.span_id,
+                    "parent": s.parent_id,
+                    "duration_ms": round(s.duration * 1000, 3),
+                }
+                for s in spans
+            ],
+        )
+
+
+class OpenTelemetrySpanExporter:
+    """Emit the spans of each request through the OpenTelemetry API.
+
+    The spans go to the globally configured tracer provider, and are therefore
+    dropped unless the OpenTelemetry SDK has been set up, for example by
+    running hoverdrive under ``opentelemetry-instrument``.
+
+    Raises
+    ------
+    ImportError
+        Raised if the OpenTelemetry API is not installed, which the
+        configuration already rejects.
+    """
+
+    def __init__(self) -> None:
+        from opentelemetry import trace  # noqa: PLC0415
+
+        self._trace = trace
+        self._tracer = trace.get_tracer("hoverdrive")
+
+    def export(self, spans: Sequence[TimingSpan]) -> None:
+        # Parents start before their children, so they are created first.
+        started: dict[int, Any] = {}
+        for span in sorted(spans, key=lambda s: (s.start_ns, s.span_id)):
+            context = None
+            if span.parent_id is not None and span.parent_id in started:
+                parent = started[span.parent_id]
+                context = self._trace.set_span_in_context(parent)
+            started[span.span_id] = self._tracer.start_span(
+                span.name, context=context, start_time=span.start_ns
+            )
+        for span in spans:
+            end_ns = span.start_ns + int(span.duration * 1e9)
+            started[span.span_id].end(end_time=end_ns)
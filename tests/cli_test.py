@@ -0,0 +1,51 @@
+"""Tests for the hoverdrive command-line interface."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import respx
+from click.testing import CliRunner
+
+from hoverdrive.cli import main
+
+from .support.ook import make_link, mock_ook_sdm_domain
+
+
+def test_export_redirects(respx_mock: respx.Router, tmp_path: Path) -> None:
+    mock_ook_sdm_domain(respx_mock)
+    output = tmp_path / "redirects.map"
+    table_dir = tmp_path / "tables"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        main,
+        [
+            "export-redirects",
+            "--output",
+            str(output),
+            "--table-dir",
+            str(table_dir),
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert "Wrote 7 redirects" in result.output
+    assert "Wrote 2 table files" in result.output
+
+    nginx_map = output.read_text()
+    assert nginx_map.startswith("map $arg_table $hoverdrive_table_link {\n")
+    url = make_link("dp02_dc2_catalogs", "Object")["url"]
+    assert f'    "dp02_dc2_catalogs.Object" "{url}";\n' in nginx_map
+    url = make_link("dp02_dc2_catalogs", "Source", "coord_ra")["url"]
+    assert f'    "dp02_dc2_catalogs.Source:coord_ra" "{url}";\n' in nginx_map
+
+    table_file = table_dir / "dp02_dc2_catalogs.Source.json"
+    assert json.loads(table_file.read_text()) == {
+        "table": "dp02_dc2_catalogs.Source",
+        "columns": {
+            c: make_link("dp02_dc2_catalogs", "Source", c)["url"]
+            for c in ("coord_dec", "coord_ra")
+        },
+    }
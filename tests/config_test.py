@@ -0,0 +1,23 @@
+"""Tests for the hoverdrive.config module."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from hoverdrive import config as config_module
+from hoverdrive.config import Config, SpanExporterType
+
+
+def test_ook_http2(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config_module, "find_spec", lambda name: None)
+    with pytest.raises(ValidationError, match="http2 extra"):
+        Config(ook_http2=True)
+    assert not Config().ook_http2
+
+
+def test_span_exporter(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config_module, "find_spec", lambda name: None)
+    with pytest.raises(ValidationError, match="opentelemetry extra"):
+        Config(span_exporter=SpanExporterType.opentelemetry)
+    assert Config(span_exporter=SpanExporterType.log).span_exporter == "log"
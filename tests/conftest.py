@@ -3,22 +3,43 @@
 from __future__ import annotations
 
 from collections.abc import AsyncGenerator
+from typing import Any
 
+import pytest
 import pytest_asyncio
 from asgi_lifespan import LifespanManager
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
 from hoverdrive import main
+from hoverdrive.config import config
+
+
+@pytest.fixture
+def config_overrides() -> dict[str, Any]:
+    """Return settings to change in the configuration of the test
+    application.
+
+    Tests that need other settings at startup override this fixture by
+    parametrizing ``config_overrides`` with a dictionary of setting names to
+    values.
+    """
+    return {}
 
 
 @pytest_asyncio.fixture
-async def app() -> AsyncGenerator[FastAPI]:
+async def app(
+    monkeypatch: pytest.MonkeyPatch, config_overrides: dict[str, Any]
+) -> AsyncGenerator[FastAPI]:
     """Return a configured test application.
 
     Wraps the application in a lifespan manager so that startup and shutdown
     events are sent during test execution.
     """
+    # Tests mock Ook, so don't try to reach the real one at startup.
+    monkeypatch.setattr(config, "ook_preconnect", False)
+    for name, value in config_overrides.items():
+        monkeypatch.setattr(config, name, value)
     async with LifespanManager(main.app):
         yield main.app
 
@@ -0,0 +1,82 @@
+"""Tests for the DataLink endpoints of hoverdrive.handlers.external."""
+
+from __future__ import annotations
+
+from xml.etree import ElementTree as ET
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from hoverdrive.config import config
+from hoverdrive.dependencies.context import context_dependency
+
+from ..support.ook import make_link, mock_ook_sdm_domain
+
+NS = {"v": "http://www.ivoa.net/xml/VOTable/v1.3"}
+
+
+def parse_rows(body: bytes) -> list[dict[str, str | None]]:
+    """Parse the rows of a DataLink VOTable into dicts keyed by field."""
+    root = ET.fromstring(body)  # noqa: S314 (trusted test response)
+    fields = [f.attrib["name"] for f in root.iterfind(".//v:FIELD", NS)]
+    return [
+        dict(zip(fields, [td.text for td in tr], strict=True))
+        for tr in root.iterfind(".//v:TR", NS)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_column_docs_links(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test ``GET /hoverdrive/column-docs-links``."""
+    mock_ook_sdm_domain(respx_mock)
+    params = {"table": "dp02_dc2_catalogs.Object", "column": "coord_ra"}
+    response = await client.get("/hoverdrive/column-docs-links", params=params)
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith(
+        "application/x-votable+xml;content=datalink"
+    )
+    link = make_link("dp02_dc2_catalogs", "Object", "coord_ra")
+    assert parse_rows(response.content) == [
+        {
+            "ID": "dp02_dc2_catalogs.Object.coord_ra",
+            "access_url": link["url"],
+            "service_def": None,
+            "error_message": None,
+            "semantics": "#documentation",
+            "description": f"SDM Schema Browser: {link['title']}",
+            "content_type": "text/html",
+            "content_length": None,
+            "local_semantics": "schema_browser",
+        }
+    ]
+
+    # The second request reuses the serialized VOTable.
+    second = await client.get("/hoverdrive/column-docs-links", params=params)
+    assert second.content == response.content
+    datalink_cache = context_dependency.process_context.datalink_cache
+    assert datalink_cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_get_table_docs_links_not_found(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test ``GET /hoverdrive/table-docs-links`` for an undocumented table."""
+    respx_mock.get(
+        f"{config.ook_url}/links/domains/sdm/schemas/dp02_dc2_catalogs"
+        "/tables/Unknown"
+    ).mock(return_value=Response(200, json=[]))
+    response = await client.get(
+        "/hoverdrive/table-docs-links",
+        params={"table": "dp02_dc2_catalogs.Unknown"},
+    )
+    assert response.status_code == 200
+    rows = parse_rows(response.content)
+    assert len(rows) == 1
+    assert rows[0]["ID"] == "dp02_dc2_catalogs.Unknown"
+    error = rows[0]["error_message"]
+    assert error
+    assert error.startswith("NotFoundFault:")
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 import respx
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, Request, Response
 
 from hoverdrive.config import config
+from hoverdrive.dependencies.context import context_dependency
+
+from ..support.ook import make_link, mock_ook_sdm_domain
 
 
 @pytest.mark.asyncio
@@ -59,6 +64,40 @@ async def test_get_column_docs_redirect(
     )
 
 
+@pytest.mark.asyncio
+async def test_redirect_caching(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test the caching headers of redirects and ``If-None-Match``."""
+    mock_ook_sdm_domain(respx_mock)
+    params = {"table": "dp02_dc2_catalogs.Object", "column": "coord_ra"}
+    response = await client.get(
+        "/hoverdrive/column-docs-redirect", params=params
+    )
+    assert response.status_code == 307
+    assert response.headers["Cache-Control"] == "public, max-age=300"
+    etag = response.headers["ETag"]
+
+    response = await client.get(
+        "/hoverdrive/column-docs-redirect",
+        params=params,
+        headers={"If-None-Match": f'"other", W/{etag}'},
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"] == "public, max-age=300"
+    assert "Location" not in response.headers
+
+    # A different target has a different ETag.
+    response = await client.get(
+        "/hoverdrive/column-docs-redirect",
+        params={**params, "column": "coord_dec"},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 307
+    assert response.headers["ETag"] != etag
+
+
 @pytest.mark.asyncio
 async def test_get_table_docs_redirect(
     client: AsyncClient, respx_mock: respx.Router
@@ -90,3 +129,379 @@ async def test_get_table_docs_redirect(
     assert response.headers["Location"] == (
         "https://sdm-schemas.lsst.io/dp02.html#Object"
     )
+
+
+@pytest.mark.asyncio
+async def test_column_docs_redirect_is_cached(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test that repeated redirects for a column only query Ook once."""
+    route = respx_mock.get(
+        "https://roundtable.lsst.cloud/ook/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables/Object/columns/coord_ra"
+    ).mock(
+        return_value=Response(
+            status_code=200,
+            json=[
+                {
+                    "url": "https://sdm-schemas.lsst.io/dp02.html#Object.coord_ra",
+                    "type": "schema_browser",
+                    "title": "dp02_dc2_catalogs.Object.coord_ra",
+                    "collection_title": "SDM Schema Browser",
+                }
+            ],
+        )
+    )
+    for _ in range(3):
+        response = await client.get(
+            "/hoverdrive/column-docs-redirect",
+            params={"table": "dp02_dc2_catalogs.Object", "column": "coord_ra"},
+        )
+        assert response.status_code == 307
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_redirects_from_link_index(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test that redirects are served from the preloaded link index."""
+    mock_ook_sdm_domain(respx_mock)
+    process_context = context_dependency.process_context
+    await process_context.link_index_refresher.refresh()
+    respx_mock.reset()
+
+    response = await client.get(
+        "/hoverdrive/column-docs-redirect",
+        params={"table": "dp02_dc2_catalogs.Object", "column": "coord_dec"},
+    )
+    assert response.status_code == 307
+    assert (
+        response.headers["Location"]
+        == (make_link("dp02_dc2_catalogs", "Object", "coord_dec")["url"])
+    )
+    response = await client.get(
+        "/hoverdrive/table-docs-redirect",
+        params={"table": "dp02_dc2_catalogs.Source"},
+    )
+    assert response.status_code == 307
+    assert (
+        response.headers["Location"]
+        == (make_link("dp02_dc2_catalogs", "Source")["url"])
+    )
+    assert respx_mock.calls.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_get_column_docs_urls(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test ``GET /hoverdrive/column-docs-urls`` with a list of columns."""
+    mock_ook_sdm_domain(respx_mock)
+    respx_mock.get(
+        "https://roundtable.lsst.cloud/ook/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables/Object/columns/undocumented"
+    ).mock(return_value=Response(status_code=200, json=[]))
+
+    response = await client.get(
+        "/hoverdrive/column-docs-urls",
+        params={
+            "table": "dp02_dc2_catalogs.Object",
+            "column": ["coord_ra", "detect_isPrimary", "undocumented"],
+        },
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "table": "dp02_dc2_catalogs.Object",
+        "columns": {
+            "coord_ra": make_link("dp02_dc2_catalogs", "Object", "coord_ra")[
+                "url"
+            ],
+            "detect_isPrimary": make_link(
+                "dp02_dc2_catalogs", "Object", "detect_isPrimary"
+            )["url"],
+            "undocumented": None,
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_column_docs_urls_all_columns(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test ``GET /hoverdrive/column-docs-urls`` for a whole table."""
+    mock_ook_sdm_domain(respx_mock)
+    response = await client.get(
+        "/hoverdrive/column-docs-urls",
+        params={"table": "dp02_dc2_catalogs.Object"},
+    )
+    assert response.status_code == 200
+    columns = response.json()["columns"]
+    assert list(columns) == ["coord_ra", "coord_dec", "detect_isPrimary"]
+    # The whole table is fetched with one paginated collection query.
+    assert respx_mock.calls.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_column_docs_urls_ook_failing(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test that columns whose lookup fails map to null, unless all do."""
+    mock_ook_sdm_domain(respx_mock)
+    respx_mock.get(
+        "https://roundtable.lsst.cloud/ook/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables/Object/columns/failing"
+    ).mock(return_value=Response(status_code=500))
+
+    url = "/hoverdrive/column-docs-urls"
+    table = "dp02_dc2_catalogs.Object"
+    response = await client.get(
+        url, params={"table": table, "column": ["coord_ra", "failing"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["columns"] == {
+        "coord_ra": make_link("dp02_dc2_catalogs", "Object", "coord_ra")[
+            "url"
+        ],
+        "failing": None,
+    }
+
+    response = await client.get(
+        url, params={"table": table, "column": ["failing"]}
+    )
+    assert response.status_code == 503
+    assert response.json()["detail"][0]["type"] == "upstream_unavailable"
+
+
+@pytest.mark.asyncio
+async def test_get_column_docs_urls_too_many(client: AsyncClient) -> None:
+    """Test that the number of requested columns is limited."""
+    response = await client.get(
+        "/hoverdrive/column-docs-urls",
+        params={
+            "table": "dp02_dc2_catalogs.Object",
+            "column": [f"column{i}" for i in range(201)],
+        },
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_column_docs_redirect_unknown_column(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test that columns unknown to Ook are a cached 404."""
+    route = respx_mock.get(
+        "https://roundtable.lsst.cloud/ook/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables/Object/columns/typo"
+    ).mock(
+        return_value=Response(status_code=404, json={"detail": "Not found"})
+    )
+    for _ in range(3):
+        response = await client.get(
+            "/hoverdrive/column-docs-redirect",
+            params={"table": "dp02_dc2_catalogs.Object", "column": "typo"},
+        )
+        assert response.status_code == 404
+        assert response.json()["detail"][0]["type"] == "not_found"
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_column_docs_redirect_ook_failing(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test that Ook failures are a 503 and open the circuit breaker."""
+    route = respx_mock.get(
+        "https://roundtable.lsst.cloud/ook/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables/Object/columns/coord_ra"
+    ).mock(return_value=Response(status_code=500))
+    for _ in range(config.ook_breaker_failure_threshold + 2):
+        response = await client.get(
+            "/hoverdrive/column-docs-redirect",
+            params={"table": "dp02_dc2_catalogs.Object", "column": "coord_ra"},
+        )
+        assert response.status_code == 503
+        assert response.json()["detail"][0]["type"] == "upstream_unavailable"
+
+    # Once the breaker is open, requests fail without reaching Ook.
+    assert route.call_count == config.ook_breaker_failure_threshold
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "config_overrides", [{"ook_max_in_flight": 1, "ook_max_queued": 0}]
+)
+async def test_column_docs_redirect_overloaded(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test that requests over the admission limit fail fast."""
+    ook_called = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_ook(request: Request) -> Response:
+        ook_called.set()
+        await release.wait()
+        return Response(
+            status_code=200,
+            json=[make_link("dp02_dc2_catalogs", "Object", "coord_ra")],
+        )
+
+    base_url = (
+        "https://roundtable.lsst.cloud/ook/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables/Object/columns/"
+    )
+    respx_mock.get(base_url + "coord_ra").mock(side_effect=slow_ook)
+    cached = respx_mock.get(base_url + "coord_dec").mock(
+        return_value=Response(
+            status_code=200,
+            json=[make_link("dp02_dc2_catalogs", "Object", "coord_dec")],
+        )
+    )
+
+    url = "/hoverdrive/column-docs-redirect"
+    table = "dp02_dc2_catalogs.Object"
+    response = await client.get(
+        url, params={"table": table, "column": "coord_dec"}
+    )
+    assert response.status_code == 307
+    slow = asyncio.create_task(
+        client.get(url, params={"table": table, "column": "coord_ra"})
+    )
+    await ook_called.wait()
+
+    # Ook is busy and the queue has no room, so a lookup that needs
+    # Ook is shed, but a cached lookup is still answered.
+    response = await client.get(
+        url, params={"table": table, "column": "coord_id"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    error = response.json()["detail"][0]
+    assert error["type"] == "upstream_overloaded"
+    response = await client.get(
+        url, params={"table": table, "column": "coord_dec"}
+    )
+    assert response.status_code == 307
+    assert cached.call_count == 1
+
+    release.set()
+    response = await slow
+    assert response.status_code == 307
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("config_overrides", [{"prefetch_columns": True}])
+async def test_column_docs_redirect_prefetch(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test that the first hover over a table prefetches all its columns."""
+    mock_ook_sdm_domain(respx_mock)
+
+    url = "/hoverdrive/column-docs-redirect"
+    table = "dp02_dc2_catalogs.Object"
+    response = await client.get(
+        url, params={"table": table, "column": "coord_ra"}
+    )
+    assert response.status_code == 307
+    prefetcher = context_dependency.process_context.column_prefetcher
+    assert prefetcher
+    await prefetcher.join()
+    assert prefetcher.stats.completed == 1
+
+    # The other columns are now cached, and the table is not
+    # prefetched again.
+    calls = respx_mock.calls.call_count
+    for column in ("coord_dec", "detect_isPrimary"):
+        response = await client.get(
+            url, params={"table": table, "column": column}
+        )
+        assert response.status_code == 307
+        assert column in response.headers["Location"]
+    assert respx_mock.calls.call_count == calls
+    assert prefetcher.stats.scheduled == 1
+
+    response = await client.get("/stats")
+    assert response.json()["column_prefetch"]["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_server_timing(
+    client: AsyncClient,
+    respx_mock: respx.Router,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the ``Server-Timing`` header of a redirect."""
+    respx_mock.get(
+        "https://roundtable.lsst.cloud/ook/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables/Object/columns/coord_ra"
+    ).mock(
+        return_value=Response(
+            status_code=200,
+            json=[make_link("dp02_dc2_catalogs", "Object", "coord_ra")],
+        )
+    )
+    url = "/hoverdrive/column-docs-redirect"
+    params = {"table": "dp02_dc2_catalogs.Object", "column": "coord_ra"}
+    response = await client.get(url, params=params)
+    assert "Server-Timing" not in response.headers
+
+    monkeypatch.setattr(config, "server_timing", True)
+    await context_dependency.process_context.link_cache.invalidate(
+        ("dp02_dc2_catalogs", "Object", "coord_ra")
+    )
+    response = await client.get(url, params=params)
+    assert response.status_code == 307
+    stages = [
+        stage.split(";")[0]
+        for stage in response.headers["Server-Timing"].split(", ")
+    ]
+    assert stages == ["setup", "cache", "ook", "decode", "rank", "total"]
+
+    # Paths that only start with the same characters as the prefix are not
+    # timed.
+    response = await client.get("/hoverdrivex/column-docs-redirect")
+    assert response.status_code == 404
+    assert "Server-Timing" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_search(client: AsyncClient, respx_mock: respx.Router) -> None:
+    """Test ``GET /hoverdrive/search``."""
+    response = await client.get("/hoverdrive/search", params={"q": "coord"})
+    assert response.status_code == 501
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("config_overrides", [{"link_index_enabled": True}])
+async def test_search_link_index(
+    respx_mock: respx.Router, client: AsyncClient
+) -> None:
+    """Test ``GET /hoverdrive/search`` with the link index loaded."""
+    mock_ook_sdm_domain(respx_mock)
+    await context_dependency.process_context.link_index_refresher.refresh()
+
+    response = await client.get(
+        "/hoverdrive/search", params={"q": "Object.coord", "limit": 1}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "query": "Object.coord",
+        "matches": [
+            {
+                "table": "dp02_dc2_catalogs.Object",
+                "column": "coord_dec",
+                "url": make_link("dp02_dc2_catalogs", "Object", "coord_dec")[
+                    "url"
+                ],
+            }
+        ],
+    }
+
+    response = await client.get("/hoverdrive/search", params={"q": "sourc"})
+    assert response.json()["matches"] == [
+        {
+            "table": "dp02_dc2_catalogs.Source",
+            "url": make_link("dp02_dc2_catalogs", "Source")["url"],
+        }
+    ]
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import pytest
-from httpx import AsyncClient
+import respx
+from httpx import AsyncClient, Response
 
 from hoverdrive.config import config
 
+from ..support.ook import mock_ook_sdm_domain
+
 
 @pytest.mark.asyncio
 async def test_get_index(client: AsyncClient) -> None:
@@ -19,3 +22,88 @@ async def test_get_index(client: AsyncClient) -> None:
     assert isinstance(data["description"], str)
     assert isinstance(data["repository_url"], str)
     assert isinstance(data["documentation_url"], str)
+
+
+@pytest.mark.asyncio
+async def test_get_stats(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test ``GET /stats``."""
+    respx_mock.get(
+        f"{config.ook_url}/links/domains/sdm/schemas/dp02_dc2_catalogs"
+        "/tables/Object"
+    ).mock(return_value=Response(200, json=[]))
+    for _ in range(2):
+        await client.get(
+            "/hoverdrive/table-docs-redirect",
+            params={"table": "dp02_dc2_catalogs.Object"},
+        )
+
+    response = await client.get("/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ook_pool"]["max_connections"] == config.ook_max_connections
+    assert data["ook_single_flight"]["calls"] == 1
+    assert data["link_cache"]["misses"] == 1
+    assert data["link_cache"]["negative_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_metrics(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test ``GET /metrics``."""
+    mock_ook_sdm_domain(respx_mock)
+    for _ in range(2):
+        await client.get(
+            "/hoverdrive/table-docs-redirect",
+            params={"table": "dp02_dc2_catalogs.Object"},
+        )
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert (
+        "hoverdrive_http_request_duration_seconds_count"
+        '{route="/hoverdrive/table-docs-redirect",status="307"} 2'
+    ) in lines
+    assert "hoverdrive_http_requests_in_flight 0" in lines
+    assert 'hoverdrive_ook_request_duration_seconds_count{status="200"} 1' in (
+        lines
+    )
+    assert 'hoverdrive_link_cache_lookups_total{result="hit"} 1' in lines
+    assert 'hoverdrive_link_cache_lookups_total{result="miss"} 1' in lines
+
+    # Internal routes aren't measured.
+    assert not any('route="/metrics"' in line for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_post_sdm_links_changed(
+    client: AsyncClient, respx_mock: respx.Router
+) -> None:
+    """Test ``POST /events/sdm-links-changed``."""
+    mock_ook_sdm_domain(respx_mock)
+    response = await client.post(
+        "/events/sdm-links-changed",
+        json={"schema_name": "dp02_dc2_catalogs"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"tables": 2, "columns": 5, "removed": 0}
+
+    # The column links are now cached, so a redirect doesn't ask Ook.
+    calls = respx_mock.calls.call_count
+    response = await client.get(
+        "/hoverdrive/column-docs-redirect",
+        params={"table": "dp02_dc2_catalogs.Source", "column": "coord_ra"},
+    )
+    assert response.status_code == 307
+    assert respx_mock.calls.call_count == calls
+
+    response = await client.post(
+        "/events/sdm-links-changed",
+        json={"schema_name": "dp02_dc2_catalogs", "table_name": "Object"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"tables": 1, "columns": 3, "removed": 0}
@@ -0,0 +1,28 @@
+"""Tests for the request logger context."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import structlog
+
+from hoverdrive.logcontext import get_request_logger, set_request_logger
+
+
+@pytest.mark.asyncio
+async def test_request_logger() -> None:
+    default = structlog.get_logger("hoverdrive")
+
+    async def handle_request(request_id: str) -> None:
+        logger = default.bind(request_id=request_id)
+        set_request_logger(logger)
+        await asyncio.sleep(0)
+        assert get_request_logger(default) is logger
+
+    # Each request's logger is local to the task handling it.
+    await asyncio.gather(
+        asyncio.create_task(handle_request("a")),
+        asyncio.create_task(handle_request("b")),
+    )
+    assert get_request_logger(default) is default
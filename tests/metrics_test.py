@@ -0,0 +1,42 @@
+"""Tests for the hoverdrive.metrics module."""
+
+from __future__ import annotations
+
+from hoverdrive.metrics import Histogram, Metrics
+
+
+def test_histogram() -> None:
+    histogram = Histogram(
+        "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)
+    )
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(5, "/a")
+    histogram.observe(0.5, 'say "hi"')
+
+    lines: list[str] = []
+    histogram.render(lines)
+    assert lines[:7] == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.15',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+    assert 'latency_seconds_bucket{route="say \\"hi\\"",le="1"} 1' in lines
+
+
+def test_render() -> None:
+    metrics = Metrics()
+    metrics.http_requests_in_flight.inc()
+    metrics.ook_request_duration.observe(0.01, 404)
+    text = metrics.render()
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert "# TYPE hoverdrive_http_requests_in_flight gauge" in lines
+    assert "hoverdrive_http_requests_in_flight 1" in lines
+    assert 'hoverdrive_ook_request_duration_seconds_count{status="404"} 1' in (
+        lines
+    )
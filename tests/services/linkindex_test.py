@@ -0,0 +1,112 @@
+"""Tests for the hoverdrive.services.linkindex module."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+import respx
+import structlog
+from httpx import AsyncClient, Response
+
+from hoverdrive.config import config
+from hoverdrive.services.linkindex import LinkIndexRefresher
+from hoverdrive.services.links import LinksService
+from hoverdrive.storage.linkindex import SdmLinkIndex
+from hoverdrive.storage.ookapi import OokClient
+from hoverdrive.storage.snapshot import LinkSnapshotStore
+
+from ..support.ook import make_link, mock_ook_sdm_domain
+
+
+@pytest.mark.asyncio
+async def test_refresh(respx_mock: respx.Router) -> None:
+    mock_ook_sdm_domain(respx_mock)
+    logger = structlog.get_logger("hoverdrive")
+    index = SdmLinkIndex()
+    async with AsyncClient() as http_client:
+        ook_client = OokClient(
+            base_url=config.ook_url, http_client=http_client, logger=logger
+        )
+        refresher = LinkIndexRefresher(
+            index=index,
+            ook_client=ook_client,
+            interval=timedelta(hours=1),
+            logger=logger,
+        )
+        await refresher.refresh()
+        assert index.is_loaded
+        assert len(index) == 2
+        assert (
+            index.get_table_link("dp02_dc2_catalogs", "Object")
+            == (make_link("dp02_dc2_catalogs", "Object")["url"])
+        )
+        assert (
+            index.get_column_link(
+                "dp02_dc2_catalogs", "Object", "detect_isPrimary"
+            )
+            == (
+                make_link("dp02_dc2_catalogs", "Object", "detect_isPrimary")[
+                    "url"
+                ]
+            )
+        )
+        assert (
+            index.get_column_link("dp02_dc2_catalogs", "Object", "x") is None
+        )
+        assert index.get_table_link("dp03_catalogs", "Object") is None
+
+        # Once loaded, the links service answers without calling Ook.
+        respx_mock.reset()
+        links_service = LinksService(ook_client=ook_client, link_index=index)
+        link = await links_service.get_redirect_link_for_column(
+            "dp02_dc2_catalogs.Source", "coord_dec"
+        )
+        assert (
+            link
+            == make_link("dp02_dc2_catalogs", "Source", "coord_dec")["url"]
+        )
+        assert respx_mock.calls.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_start_from_snapshot(
+    respx_mock: respx.Router, tmp_path: Path
+) -> None:
+    """Test that a snapshot is written and serves a later cold start."""
+    mock_ook_sdm_domain(respx_mock)
+    logger = structlog.get_logger("hoverdrive")
+    snapshot_store = LinkSnapshotStore(tmp_path / "links.sqlite")
+    async with AsyncClient() as http_client:
+        ook_client = OokClient(
+            base_url=config.ook_url, http_client=http_client, logger=logger
+        )
+        refresher = LinkIndexRefresher(
+            index=SdmLinkIndex(),
+            ook_client=ook_client,
+            interval=timedelta(hours=1),
+            logger=logger,
+            snapshot_store=snapshot_store,
+        )
+        await refresher.start()
+        await refresher.stop()
+
+        # Simulate a restart while Ook is down.
+        respx_mock.reset()
+        respx_mock.route().mock(return_value=Response(503))
+        index = SdmLinkIndex()
+        refresher = LinkIndexRefresher(
+            index=index,
+            ook_client=ook_client,
+            interval=timedelta(hours=1),
+            logger=logger,
+            snapshot_store=snapshot_store,
+        )
+        await refresher.start()
+        assert respx_mock.calls.call_count == 0
+        assert (
+            index.get_column_link("dp02_dc2_catalogs", "Object", "coord_ra")
+            == (make_link("dp02_dc2_catalogs", "Object", "coord_ra")["url"])
+        )
+        await refresher.stop()
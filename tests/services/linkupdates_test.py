@@ -0,0 +1,102 @@
+"""Tests for the hoverdrive.services.linkupdates module."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+import respx
+import structlog
+from httpx import AsyncClient, Request, Response
+
+from hoverdrive.config import config
+from hoverdrive.services.linkupdates import LinkUpdateService
+from hoverdrive.services.ranking import LinkRanker
+from hoverdrive.storage.cachebackend import MemoryCacheBackend
+from hoverdrive.storage.linkcache import LinkCache
+from hoverdrive.storage.linkindex import (
+    ColumnLinks,
+    SdmLinkIndex,
+    SdmTableIndex,
+)
+from hoverdrive.storage.ookapi import OokClient, OokLinksResult
+
+from ..support.ook import make_link
+
+
+async def fail_loader(previous: OokLinksResult | None) -> OokLinksResult:
+    raise AssertionError("Link cache entry was not replaced")
+
+
+@pytest.mark.asyncio
+async def test_update_table(respx_mock: respx.Router) -> None:
+    base = f"{config.ook_url}/links/domains/sdm/schemas/dp02/tables/Object"
+    columns: dict[str, list[dict[str, Any]]] = {
+        "coord_ra": [make_link("dp02", "Object", "coord_ra", "v2")],
+        "coord_dec": [],
+        "detect_isPrimary": [make_link("dp02", "Object", "detect_isPrimary")],
+    }
+
+    def get_columns(request: Request) -> Response:
+        items = [{"name": n, "links": links} for n, links in columns.items()]
+        return Response(200, json=items)
+
+    respx_mock.get(f"{base}/columns").mock(side_effect=get_columns)
+    respx_mock.get(base).mock(
+        return_value=Response(200, json=[make_link("dp02", "Object")])
+    )
+
+    logger = structlog.get_logger("hoverdrive")
+    link_cache = LinkCache(
+        backend=MemoryCacheBackend(max_size=100),
+        ttl=timedelta(days=30),
+        negative_ttl=timedelta(days=30),
+        logger=logger,
+    )
+    link_index = SdmLinkIndex()
+    old_url = make_link("dp02", "Object", "coord_ra")["url"]
+    link_index.replace(
+        {
+            "dp02": {
+                "Object": SdmTableIndex(
+                    columns=ColumnLinks(
+                        {"coord_ra": old_url, "removed": old_url}
+                    )
+                )
+            }
+        }
+    )
+    async with AsyncClient() as http_client:
+        ook_client = OokClient(
+            base_url=config.ook_url,
+            http_client=http_client,
+            logger=logger,
+            link_cache=link_cache,
+        )
+        service = LinkUpdateService(
+            ook_client=ook_client,
+            link_cache=link_cache,
+            link_index=link_index,
+            ranker=LinkRanker(),
+            logger=logger,
+        )
+        result = await service.update_table("dp02", "Object")
+
+    assert (result.tables, result.columns, result.removed) == (1, 3, 1)
+    table = link_index.get_table("dp02", "Object")
+    assert table
+    assert table.link == make_link("dp02", "Object")["url"]
+    assert table.columns == {
+        "coord_ra": columns["coord_ra"][0]["url"],
+        "detect_isPrimary": columns["detect_isPrimary"][0]["url"],
+    }
+
+    # The cache now holds the new links, including the negative entry of
+    # the column that lost its links.
+    ranker = LinkRanker()
+    links = await link_cache.get(("dp02", "Object", "coord_ra"), fail_loader)
+    assert links.best_url(ranker) == columns["coord_ra"][0]["url"]
+    links = await link_cache.get(("dp02", "Object", "coord_dec"), fail_loader)
+    assert links.best_url(ranker) is None
+    assert link_cache.stats.negative_hits == 1
@@ -0,0 +1,50 @@
+"""Tests for the hoverdrive.services.ranking module."""
+
+from __future__ import annotations
+
+import json
+
+from hoverdrive.config import LinkFallback
+from hoverdrive.services.ranking import LinkRanker
+from hoverdrive.storage.ookapi import OokLink, OokLinksPayload
+
+
+def make_link(url: str, link_type: str, collection: str) -> OokLink:
+    return OokLink(
+        url=url, title=url, type=link_type, collection_title=collection
+    )
+
+
+def test_ranking() -> None:
+    links = [
+        make_link("https://a", "user_guide", "DP0.2 Guide"),
+        make_link("https://b", "tutorial", "DP0.2 Tutorials"),
+        make_link("https://c", "schema_browser", "DP0.2 Schemas"),
+        make_link("https://d", "schema_browser", "SDM Schema Browser"),
+    ]
+
+    # Without preferences, Ook's order is kept.
+    assert LinkRanker().best_url(links) == "https://a"
+
+    ranker = LinkRanker(type_priority=["schema_browser", "user_guide"])
+    assert ranker.best_url(links) == "https://c"
+    assert ranker.best_url(links[:2]) == "https://a"
+
+    ranker = LinkRanker(
+        type_priority=["schema_browser"],
+        collection_priority=["SDM Schema Browser"],
+    )
+    assert ranker.best_url(links) == "https://d"
+
+    ranker = LinkRanker(
+        type_priority=["schema_browser"], fallback=LinkFallback.none
+    )
+    assert ranker.best_url(links[:2]) is None
+    assert ranker.best_url([]) is None
+
+    # Lean targets are ranked the same way as models.
+    data = json.dumps([link.model_dump() for link in links]).encode()
+    payload = OokLinksPayload(data)
+    assert payload.best_url(ranker) == "https://c"
+    assert payload.ranked == (ranker.key, "https://c")
+    assert ranker.key != LinkRanker().key
@@ -0,0 +1,75 @@
+"""Tests for the hoverdrive.storage.admission module."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from hoverdrive.exceptions import UpstreamOverloadedError
+from hoverdrive.storage.admission import AdmissionLimiter
+
+
+@pytest.mark.asyncio
+async def test_admission_limiter() -> None:
+    limiter = AdmissionLimiter(
+        max_in_flight=2, max_queued=1, queue_timeout=timedelta(seconds=5)
+    )
+    release = asyncio.Event()
+    started = 0
+
+    async def call() -> None:
+        nonlocal started
+        async with limiter.admit():
+            started += 1
+            await release.wait()
+
+    tasks = [asyncio.create_task(call()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert started == 2
+    assert limiter.stats.in_flight == 2
+    assert limiter.stats.waiting == 1
+
+    # The queue is full, so further calls are rejected without waiting.
+    with pytest.raises(UpstreamOverloadedError) as excinfo:
+        async with limiter.admit():
+            pass
+    assert excinfo.value.retry_after == 5
+    assert limiter.stats.rejected == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert started == 3
+    assert limiter.stats.in_flight == 0
+    assert limiter.stats.waiting == 0
+    assert limiter.stats.admitted == 3
+    assert limiter.stats.queued == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_limiter_timeout() -> None:
+    limiter = AdmissionLimiter(
+        max_in_flight=1, max_queued=10, queue_timeout=timedelta(seconds=0.01)
+    )
+    release = asyncio.Event()
+
+    async def call() -> None:
+        async with limiter.admit():
+            await release.wait()
+
+    task = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    with pytest.raises(UpstreamOverloadedError) as excinfo:
+        async with limiter.admit():
+            pass
+    assert excinfo.value.retry_after == 1
+    assert limiter.stats.timed_out == 1
+    assert limiter.stats.waiting == 0
+
+    # The slot of a call that timed out is not lost.
+    release.set()
+    await task
+    async with limiter.admit():
+        assert limiter.stats.in_flight == 1
+    assert limiter.stats.in_flight == 0
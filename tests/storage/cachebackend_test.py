@@ -0,0 +1,68 @@
+"""Tests for the hoverdrive.storage.cachebackend module."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from hoverdrive.exceptions import CacheBackendError
+from hoverdrive.storage.cachebackend import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+)
+
+from ..support.redis import fake_redis_server
+
+
+@pytest.mark.asyncio
+async def test_memory_backend() -> None:
+    backend = MemoryCacheBackend(max_size=2)
+    await backend.set("a", b"1", timedelta(hours=1))
+    await backend.set("b", b"2", timedelta(hours=1))
+    assert await backend.get("a") == b"1"
+    await backend.set("c", b"3", timedelta(hours=1))
+    assert await backend.get("b") is None
+    assert backend.evictions == 1
+
+    await backend.set("d", b"4", timedelta(0))
+    assert await backend.get("d") is None
+    await backend.delete("a")
+    assert await backend.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend() -> None:
+    async with fake_redis_server(password="secret") as server:
+        backend = RedisCacheBackend(
+            host="127.0.0.1",
+            port=server.port,
+            password="secret",
+            database=1,
+            key_prefix="test:",
+        )
+        assert await backend.get("a") is None
+        await backend.set("a", b"\x00binary\r\n", timedelta(minutes=1))
+        assert await backend.get("a") == b"\x00binary\r\n"
+        assert server.data[b"test:a"][0] == b"\x00binary\r\n"
+        await backend.delete("a")
+        assert await backend.get("a") is None
+
+        # Authentication and database selection happen once per connection.
+        names = [c[0] for c in server.commands]
+        assert names.count(b"AUTH") == 1
+        assert names.count(b"SELECT") == 1
+        await backend.aclose()
+
+        bad = RedisCacheBackend(
+            host="127.0.0.1", port=server.port, password="wrong"
+        )
+        with pytest.raises(CacheBackendError):
+            await bad.get("a")
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_unavailable(unused_tcp_port: int) -> None:
+    backend = RedisCacheBackend(host="127.0.0.1", port=unused_tcp_port)
+    with pytest.raises(CacheBackendError):
+        await backend.get("a")
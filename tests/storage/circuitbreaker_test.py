@@ -0,0 +1,123 @@
+"""Tests for the hoverdrive.storage.circuitbreaker module."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from hoverdrive.storage.circuitbreaker import (
+    CircuitBreaker,
+    CircuitPermit,
+    CircuitState,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _allow(breaker: CircuitBreaker) -> CircuitPermit:
+    permit = breaker.allow()
+    assert permit is not None
+    return permit
+
+
+def test_circuit_breaker() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=3,
+        slow_call_duration=timedelta(seconds=1),
+        reset_timeout=timedelta(seconds=30),
+        clock=clock,
+    )
+
+    # A success resets the count of consecutive failures.
+    for _ in range(2):
+        assert not breaker.record_failure(_allow(breaker))
+    assert not breaker.record_success(_allow(breaker), 0.1)
+
+    # Slow calls count as failures.
+    for _ in range(2):
+        assert not breaker.record_failure(_allow(breaker))
+    assert breaker.record_success(_allow(breaker), 2.0)
+    assert breaker.stats.opened == 1
+    assert breaker.allow() is None
+    assert breaker.stats.rejected == 1
+
+    # After the reset timeout, a single probe is allowed, and reopens the
+    # breaker if it fails.
+    clock.now = 30
+    assert breaker.state == CircuitState.half_open
+    probe = _allow(breaker)
+    assert breaker.allow() is None
+    assert breaker.record_failure(probe)
+    assert breaker.allow() is None
+    assert breaker.stats.opened == 2
+
+    # An abandoned probe lets another probe through, and a successful probe
+    # closes the breaker.
+    clock.now = 60
+    breaker.record_abandoned(_allow(breaker))
+    assert not breaker.record_success(_allow(breaker), 0.1)
+    assert breaker.stats.state == CircuitState.closed
+    assert breaker.stats.consecutive_failures == 0
+
+
+def test_late_success() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        slow_call_duration=timedelta(seconds=1),
+        reset_timeout=timedelta(seconds=30),
+        clock=clock,
+    )
+
+    # A call allowed before the breaker opened that succeeds late does not
+    # close it, either while it is open or once it is half-open.
+    first = _allow(breaker)
+    second = _allow(breaker)
+    assert breaker.record_failure(_allow(breaker))
+    assert not breaker.record_success(first, 0.1)
+    assert breaker.allow() is None
+    clock.now = 30
+    assert not breaker.record_success(second, 0.1)
+    assert breaker.state == CircuitState.half_open
+
+    # The probe still closes it.
+    assert not breaker.record_success(_allow(breaker), 0.1)
+    assert breaker.allow() is not None
+    assert breaker.allow() is not None
+    assert breaker.stats.opened == 1
+
+
+def test_late_outcome_during_probe() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        slow_call_duration=timedelta(seconds=1),
+        reset_timeout=timedelta(seconds=30),
+        clock=clock,
+    )
+
+    # Slow calls allowed before the breaker opened finish while the probe
+    # is running, and neither close nor reopen the breaker.
+    slow = [_allow(breaker), _allow(breaker)]
+    assert breaker.record_failure(_allow(breaker))
+    clock.now = 30
+    probe = _allow(breaker)
+    assert not breaker.record_success(slow[0], 0.5)
+    assert breaker.allow() is None
+    assert not breaker.record_failure(slow[1])
+    assert breaker.allow() is None
+    assert breaker.state == CircuitState.half_open
+
+    # Only the probe decides.
+    assert breaker.record_failure(probe)
+    assert breaker.stats.opened == 2
+    clock.now = 60
+    assert not breaker.record_success(_allow(breaker), 0.1)
+    assert breaker.allow() is not None
+    assert breaker.allow() is not None
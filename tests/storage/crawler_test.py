@@ -0,0 +1,120 @@
+"""Tests for the hoverdrive.storage.crawler module."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+import respx
+import structlog
+from httpx import AsyncClient, Response
+
+from hoverdrive.config import config
+from hoverdrive.exceptions import UpstreamUnavailableError
+from hoverdrive.storage.crawler import (
+    CrawlEntry,
+    CrawlProgress,
+    OokCrawler,
+    RateLimiter,
+)
+from hoverdrive.storage.ookapi import OokClient
+
+from ..support.ook import SDM_DOMAIN, mock_ook_sdm_domain
+
+_SOURCE_COLUMNS = (
+    f"{config.ook_url}/links/domains/sdm/schemas/dp02_dc2_catalogs/tables"
+    "/Source/columns"
+)
+
+
+def _keys(entries: list[CrawlEntry]) -> list[tuple[str | None, ...]]:
+    return [(e.schema_name, e.table_name, e.column_name) for e in entries]
+
+
+@pytest.mark.asyncio
+async def test_crawl(respx_mock: respx.Router) -> None:
+    mock_ook_sdm_domain(respx_mock)
+    logger = structlog.get_logger("hoverdrive")
+    async with AsyncClient() as http_client:
+        ook_client = OokClient(
+            base_url=config.ook_url, http_client=http_client, logger=logger
+        )
+        crawler = OokCrawler(
+            ook_client=ook_client, logger=logger, concurrency=1, queue_size=2
+        )
+        run = crawler.crawl()
+        entries = [entry async for entry in run]
+
+    expected: list[tuple[str | None, ...]] = [
+        ("dp02_dc2_catalogs", None, None)
+    ]
+    for table, columns in SDM_DOMAIN["dp02_dc2_catalogs"].items():
+        expected.append(("dp02_dc2_catalogs", table, None))
+        expected.extend(("dp02_dc2_catalogs", table, c) for c in columns)
+    assert sorted(_keys(entries), key=str) == sorted(expected, key=str)
+    keys = _keys(entries)
+    for key in keys:
+        if key[2]:
+            assert keys.index((*key[:2], None)) < keys.index(key)
+    assert entries[-1].links[0].url.endswith("Source.coord_dec")
+    assert run.stats.schemas == 1
+    assert run.stats.tables == 2
+    assert run.stats.columns == 5
+    assert run.stats.entries == 8
+    assert run.stats.entries_per_second > 0
+
+
+@pytest.mark.asyncio
+async def test_resume(respx_mock: respx.Router, tmp_path: Path) -> None:
+    mock_ook_sdm_domain(respx_mock)
+    respx_mock.get(_SOURCE_COLUMNS).mock(return_value=Response(500))
+    logger = structlog.get_logger("hoverdrive")
+    progress_path = tmp_path / "progress"
+    async with AsyncClient() as http_client:
+        ook_client = OokClient(
+            base_url=config.ook_url, http_client=http_client, logger=logger
+        )
+        crawler = OokCrawler(ook_client=ook_client, logger=logger)
+
+        # Without progress, a failed table ends the crawl.
+        with pytest.raises(UpstreamUnavailableError):
+            _ = [entry async for entry in crawler.crawl()]
+
+        # With progress, the other tables are completed and recorded.
+        run = crawler.crawl(CrawlProgress(progress_path))
+        entries = [entry async for entry in run]
+        assert ("dp02_dc2_catalogs", "Object", "coord_ra") in _keys(entries)
+        assert run.stats.tables == 1
+        assert run.stats.failed_tables == 1
+        assert progress_path.exists()
+
+        # Once resumed, only the failed table is crawled.
+        respx_mock.get(_SOURCE_COLUMNS).mock(
+            return_value=Response(
+                200,
+                content=b' [{"name": "coord_ra", "links": []},\n'
+                b'{"name": "coord_dec", "links": []} ] ',
+            )
+        )
+        progress = CrawlProgress(progress_path)
+        assert progress.is_completed("dp02_dc2_catalogs", "Object")
+        run = crawler.crawl(progress)
+        entries = [entry async for entry in run]
+        assert _keys(entries) == [
+            ("dp02_dc2_catalogs", None, None),
+            ("dp02_dc2_catalogs", "Source", None),
+            ("dp02_dc2_catalogs", "Source", "coord_ra"),
+            ("dp02_dc2_catalogs", "Source", "coord_dec"),
+        ]
+        assert run.stats.skipped_tables == 1
+        assert not progress_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter() -> None:
+    limiter = RateLimiter(100)
+    start = time.monotonic()
+    for _ in range(5):
+        await limiter.wait()
+    assert time.monotonic() - start >= 0.04
@@ -0,0 +1,63 @@
+"""Tests for the hoverdrive.storage.http module."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, Limits
+from uvicorn import Config, Server
+
+from hoverdrive.storage.http import MonitoredTransport, get_environment_proxy
+
+from ..support.server import server_running
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(unused_tcp_port: int) -> None:
+    app = FastAPI()
+
+    @app.get("/")
+    async def index() -> dict[str, str]:
+        return {"status": "ok"}
+
+    server = Server(
+        Config(app, port=unused_tcp_port, log_level="warning", lifespan="off")
+    )
+    transport = MonitoredTransport(
+        limits=Limits(max_connections=4, max_keepalive_connections=4)
+    )
+    async with server_running(server):
+        async with AsyncClient(transport=transport) as client:
+            for _ in range(3):
+                r = await client.get(f"http://127.0.0.1:{unused_tcp_port}/")
+                assert r.status_code == 200
+            stats = transport.get_stats()
+
+    assert stats.max_connections == 4
+    assert stats.requests == 3
+    assert stats.in_flight == 0
+    assert stats.max_in_flight == 1
+    # Keep-alive means only the first request opened a connection.
+    assert stats.connects == 1
+    assert stats.connections == 1
+    assert stats.idle_connections == 1
+    assert stats.connect_seconds_total > 0
+    assert stats.pool_wait_seconds_max >= 0
+
+
+def test_get_environment_proxy(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.lower(), raising=False)
+    url = "https://roundtable.lsst.cloud/ook"
+    assert get_environment_proxy(url) is None
+
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.com:3128")
+    assert get_environment_proxy(url) == "http://proxy.example.com:3128"
+    assert get_environment_proxy("http://ook.example.com/") is None
+    monkeypatch.setenv("ALL_PROXY", "http://all.example.com:3128")
+    assert get_environment_proxy("http://ook.example.com/") == (
+        "http://all.example.com:3128"
+    )
+    monkeypatch.setenv("NO_PROXY", ".lsst.cloud")
+    assert get_environment_proxy(url) is None
@@ -0,0 +1,348 @@
+"""Tests for the hoverdrive.storage.linkcache module."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+import respx
+import structlog
+from httpx import AsyncClient, Response
+
+from hoverdrive.exceptions import UpstreamUnavailableError
+from hoverdrive.services.ranking import LinkRanker
+from hoverdrive.storage.admission import AdmissionLimiter
+from hoverdrive.storage.cachebackend import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+)
+from hoverdrive.storage.linkcache import LinkCache
+from hoverdrive.storage.ookapi import (
+    OokClient,
+    OokLink,
+    OokLinksArray,
+    OokLinksPayload,
+    OokLinksResult,
+)
+from hoverdrive.timing import time_request, timed
+
+from ..support.ook import make_link
+from ..support.redis import fake_redis_server
+
+
+def make_links(url: str) -> OokLinksPayload:
+    return OokLinksPayload.from_model(
+        OokLinksArray(
+            [OokLink(url=url, title="Object", type="schema_browser")]
+        )
+    )
+
+
+class CountingLoader:
+    """A loader that returns a new URL each time it is called."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(
+        self, previous: OokLinksResult | None
+    ) -> OokLinksResult:
+        self.calls += 1
+        with timed("load"):
+            await asyncio.sleep(0)
+        return OokLinksResult(
+            links=make_links(f"https://example.com/{self.calls}")
+        )
+
+
+@pytest.mark.asyncio
+async def test_hit_and_miss() -> None:
+    cache = LinkCache(
+        backend=MemoryCacheBackend(max_size=10),
+        ttl=timedelta(hours=1),
+        logger=structlog.get_logger("hoverdrive"),
+    )
+    loader = CountingLoader()
+    key = ("dp02_dc2_catalogs", "Object", "coord_ra")
+
+    first = await cache.get(key, loader)
+    second = await cache.get(key, loader)
+    assert (
+        first.targets()[0]["url"]
+        == second.targets()[0]["url"]
+        == "https://example.com/1"
+    )
+    assert loader.calls == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_ranked_links() -> None:
+    cache = LinkCache(
+        backend=MemoryCacheBackend(max_size=10),
+        ttl=timedelta(hours=1),
+        logger=structlog.get_logger("hoverdrive"),
+    )
+    links = make_links("https://example.com/")
+    ranker = LinkRanker()
+    links.best_url(ranker)
+    await cache.set(("schema", "table", None), links)
+    loader = CountingLoader()
+
+    # The choice of link is stored with the links, so a hit does not decode
+    # them again.
+    cached = await cache.get(("schema", "table", None), loader)
+    assert cached.ranked == (ranker.key, "https://example.com/")
+    assert cached.best_url(ranker) == "https://example.com/"
+    assert cached.best_url(LinkRanker(type_priority=["x"])) == (
+        "https://example.com/"
+    )
+    assert loader.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate() -> None:
+    cache = LinkCache(
+        backend=MemoryCacheBackend(max_size=10),
+        ttl=timedelta(0),
+        logger=structlog.get_logger("hoverdrive"),
+    )
+    loader = CountingLoader()
+    key = ("dp02_dc2_catalogs", "Object", None)
+
+    await cache.get(key, loader)
+    # Every entry is immediately stale, so concurrent lookups get the old
+    # value and start exactly one background refresh, which is not timed as
+    # part of the request that started it.
+    with time_request("request") as timer:
+        stale = await asyncio.gather(
+            *(cache.get(key, loader) for _ in range(5))
+        )
+        await asyncio.sleep(0.01)
+    assert {links.targets()[0]["url"] for links in stale} == {
+        "https://example.com/1"
+    }
+    assert loader.calls == 2
+    assert cache.stats.refreshes == 1
+    assert "load" not in {span.name for span in timer.spans}
+
+    refreshed = await cache.get(key, loader)
+    assert refreshed.targets()[0]["url"] == "https://example.com/2"
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stale_on_error() -> None:
+    cache = LinkCache(
+        backend=MemoryCacheBackend(max_size=10),
+        ttl=timedelta(0),
+        max_stale=timedelta(0),
+        stale_if_error=timedelta(hours=1),
+        logger=structlog.get_logger("hoverdrive"),
+    )
+    links = make_links("https://example.com/")
+    await cache.set(("schema", "table", None), links)
+
+    async def failing_loader(
+        previous: OokLinksResult | None,
+    ) -> OokLinksResult:
+        raise UpstreamUnavailableError("Ook is unavailable")
+
+    # Every entry is immediately expired, so it is only served if Ook fails.
+    cached = await cache.get(("schema", "table", None), failing_loader)
+    assert cached == links
+    assert cache.stats.stale_on_error == 1
+
+    loader = CountingLoader()
+    cached = await cache.get(("schema", "table", None), loader)
+    assert cached == make_links("https://example.com/1")
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_backend() -> None:
+    """Test that replicas sharing a Redis backend share cache entries."""
+    async with fake_redis_server() as server:
+        replicas = [
+            LinkCache(
+                backend=RedisCacheBackend(host="127.0.0.1", port=server.port),
+                ttl=timedelta(hours=1),
+                logger=structlog.get_logger("hoverdrive"),
+            )
+            for _ in range(3)
+        ]
+        loader = CountingLoader()
+        key = ("dp02_dc2_catalogs", "Object", "coord_ra")
+        for cache in replicas:
+            links = await cache.get(key, loader)
+            assert links.targets()[0]["url"] == "https://example.com/1"
+        assert loader.calls == 1
+        assert [c.stats.misses for c in replicas] == [1, 0, 0]
+        for cache in replicas:
+            await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_backend_failure(unused_tcp_port: int) -> None:
+    """Test that lookups fall through to Ook if the backend is down."""
+    cache = LinkCache(
+        backend=RedisCacheBackend(host="127.0.0.1", port=unused_tcp_port),
+        ttl=timedelta(hours=1),
+        logger=structlog.get_logger("hoverdrive"),
+    )
+    loader = CountingLoader()
+    links = await cache.get(("s", "t", None), loader)
+    assert links.targets()[0]["url"] == "https://example.com/1"
+    assert cache.stats.backend_errors == 2
+
+
+@pytest.mark.asyncio
+async def test_corrupt_entry() -> None:
+    """Test that entries that cannot be decoded are refetched."""
+    backend = MemoryCacheBackend(max_size=10)
+    cache = LinkCache(
+        backend=backend,
+        ttl=timedelta(hours=1),
+        logger=structlog.get_logger("hoverdrive"),
+    )
+    await backend.set(
+        "links/s/t", b'{"count": "many"}\n[]', timedelta(hours=1)
+    )
+    loader = CountingLoader()
+    links = await cache.get(("s", "t", None), loader)
+    assert links.targets()[0]["url"] == "https://example.com/1"
+    assert cache.stats.backend_errors == 1
+    assert cache.stats.misses == 1
+    assert await cache.is_fresh(("s", "t", None))
+
+
+@pytest.mark.asyncio
+async def test_negative_cache() -> None:
+    cache = LinkCache(
+        backend=MemoryCacheBackend(max_size=10),
+        ttl=timedelta(hours=1),
+        negative_ttl=timedelta(hours=1),
+        logger=structlog.get_logger("hoverdrive"),
+    )
+    calls = 0
+
+    async def no_links(previous: OokLinksResult | None) -> OokLinksResult:
+        nonlocal calls
+        calls += 1
+        return OokLinksResult(links=OokLinksPayload(b"[]"))
+
+    key = ("dp02_dc2_catalogs", "Object", "typo")
+    for _ in range(3):
+        links = await cache.get(key, no_links)
+        assert links.targets() == []
+    assert calls == 1
+    assert cache.stats.negative_hits == 2
+
+    # Newly documented columns replace the negative entry.
+    await cache.set(key, make_links("https://example.com/typo"))
+    links = await cache.get(key, no_links)
+    assert links.targets()[0]["url"] == "https://example.com/typo"
+
+
+@pytest.mark.asyncio
+async def test_conditional_refresh(respx_mock: respx.Router) -> None:
+    """Test that stale entries are revalidated with conditional requests."""
+    link = make_link("dp02_dc2_catalogs", "Object", "coord_ra")
+    url = (
+        "https://ook.example.com/links/domains/sdm/schemas/dp02_dc2_catalogs"
+        "/tables/Object/columns/coord_ra"
+    )
+    route = respx_mock.get(url)
+    route.side_effect = [
+        Response(200, json=[link], headers={"ETag": '"v1"'}),
+        Response(304, headers={"ETag": '"v1"'}),
+    ]
+    logger = structlog.get_logger("hoverdrive")
+    cache = LinkCache(
+        backend=MemoryCacheBackend(max_size=10),
+        ttl=timedelta(0),
+        logger=logger,
+    )
+    async with AsyncClient() as http_client:
+        ook_client = OokClient(
+            base_url="https://ook.example.com",
+            http_client=http_client,
+            logger=logger,
+            link_cache=cache,
+        )
+        for _ in range(2):
+            links = await ook_client.get_sdm_column_links(
+                "dp02_dc2_catalogs.Object", "coord_ra"
+            )
+            assert links.targets()[0]["url"] == link["url"]
+        await asyncio.sleep(0)
+
+    assert route.call_count == 2
+    assert "If-None-Match" not in route.calls[0].request.headers
+    assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert cache.stats.not_modified == 1
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_prefetch(respx_mock: respx.Router) -> None:
+    """Test that prefetches fill the cache without overwriting fresh
+    entries or taking admission slots.
+    """
+    base = (
+        "https://ook.example.com/links/domains/sdm/schemas/dp02_dc2_catalogs"
+        "/tables/Object/columns"
+    )
+    columns = ("coord_ra", "coord_dec")
+    respx_mock.get(f"{base}/coord_ra").mock(
+        return_value=Response(
+            200,
+            json=[make_link("dp02_dc2_catalogs", "Object", "coord_ra")],
+            headers={"ETag": '"v1"'},
+        )
+    )
+    respx_mock.get(base).mock(
+        return_value=Response(
+            200,
+            json=[
+                {
+                    "name": c,
+                    "links": [make_link("dp02_dc2_catalogs", "Object", c)],
+                }
+                for c in columns
+            ],
+        )
+    )
+    logger = structlog.get_logger("hoverdrive")
+    backend = MemoryCacheBackend(max_size=10)
+    cache = LinkCache(backend=backend, ttl=timedelta(hours=1), logger=logger)
+    admission = AdmissionLimiter(
+        max_in_flight=1, max_queued=0, queue_timeout=timedelta(seconds=1)
+    )
+    async with AsyncClient() as http_client:
+        ook_client = OokClient(
+            base_url="https://ook.example.com",
+            http_client=http_client,
+            logger=logger,
+            link_cache=cache,
+            admission=admission,
+        )
+        await ook_client.get_sdm_column_links(
+            "dp02_dc2_catalogs.Object", "coord_ra"
+        )
+        fresh = await backend.get("links/dp02_dc2_catalogs/Object/coord_ra")
+        assert admission.stats.admitted == 1
+
+        count = await ook_client.prefetch_sdm_columns(
+            "dp02_dc2_catalogs", "Object"
+        )
+
+    assert count == 1
+    assert admission.stats.admitted == 1
+    assert await cache.is_fresh(("dp02_dc2_catalogs", "Object", "coord_dec"))
+    assert (
+        await backend.get("links/dp02_dc2_catalogs/Object/coord_ra") == fresh
+    )
+    await cache.aclose()
@@ -0,0 +1,41 @@
+"""Tests for the hoverdrive.storage.linkindex module."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from hoverdrive.storage.linkindex import ColumnLinks
+
+
+def test_column_links() -> None:
+    base = "https://sdm-schemas.lsst.io/dp02.html#Object."
+    links = {
+        "coord_ra": f"{base}coord_ra",
+        "coord_dec": f"{base}coord_dec",
+        "g_psfFlux": "https://example.com/flux.html#g_psfFlux",
+        "objectId": "https://example.com/ids",
+    }
+    columns = ColumnLinks(links)
+
+    assert columns == links
+    assert len(columns) == 4
+    assert list(columns) == sorted(links)
+    for name, url in links.items():
+        assert name in columns
+        assert columns[name] == url
+    assert "r_psfFlux" not in columns
+    assert columns.get("r_psfFlux") is None
+    with pytest.raises(KeyError):
+        columns["r_psfFlux"]
+    assert columns.keys() - {"coord_ra"} == links.keys() - {"coord_ra"}
+
+    # Names decoded from different responses are shared.
+    other = ColumnLinks(json.loads('{"coord_ra": "https://example.com/"}'))
+    assert next(iter(other)) is list(columns)[1]
+
+    empty = ColumnLinks()
+    assert empty == {}
+    assert not empty
+    assert "coord_ra" not in empty
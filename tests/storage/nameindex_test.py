@@ -0,0 +1,83 @@
+"""Tests for the hoverdrive.storage.nameindex module."""
+
+from __future__ import annotations
+
+from hoverdrive.storage.linkindex import (
+    ColumnLinks,
+    SdmSchemaIndex,
+    SdmTableIndex,
+)
+from hoverdrive.storage.nameindex import SdmNameIndex, SdmNameMatch
+
+
+def _names(matches: list[SdmNameMatch]) -> list[str]:
+    return [
+        ".".join(n for n in (m.schema_name, m.table_name, m.column_name) if n)
+        for m in matches
+    ]
+
+
+def test_search() -> None:
+    schemas: SdmSchemaIndex = {
+        "dp02_dc2_catalogs": {
+            "Object": SdmTableIndex(
+                link="https://example.com/Object",
+                columns=ColumnLinks(
+                    {
+                        "coord_ra": "https://example.com/Object.coord_ra",
+                        "coord_dec": "https://example.com/Object.coord_dec",
+                        "detect_isPrimary": "https://example.com/Object.detect",
+                    }
+                ),
+            ),
+            "Source": SdmTableIndex(
+                columns=ColumnLinks(
+                    {
+                        "coord_ra": "https://example.com/Source.coord_ra",
+                        "sourceId": "https://example.com/Source.sourceId",
+                    }
+                ),
+            ),
+        },
+        "dp03_catalogs": {
+            "coord": SdmTableIndex(link="https://example.com/coord"),
+        },
+    }
+    index = SdmNameIndex.build(schemas)
+    assert len(index) == 6
+
+    # Exact matches first, tables before columns, then other prefix matches,
+    # then names containing the query, in alphabetical order.
+    assert _names(index.search("COORD", 10)) == [
+        "dp03_catalogs.coord",
+        "dp02_dc2_catalogs.Object.coord_dec",
+        "dp02_dc2_catalogs.Object.coord_ra",
+        "dp02_dc2_catalogs.Source.coord_ra",
+    ]
+    assert _names(index.search("coord", 2)) == [
+        "dp03_catalogs.coord",
+        "dp02_dc2_catalogs.Object.coord_dec",
+    ]
+    assert _names(index.search("rce", 10)) == [
+        "dp02_dc2_catalogs.Source.sourceId"
+    ]
+    assert _names(index.search("primary", 10)) == [
+        "dp02_dc2_catalogs.Object.detect_isPrimary"
+    ]
+    assert index.search("pr", 10) == []
+    assert index.search(" ", 10) == []
+
+    # Qualified names.
+    assert _names(index.search("object.coord_r", 10)) == [
+        "dp02_dc2_catalogs.Object.coord_ra"
+    ]
+    assert _names(index.search("dp02_dc2_catalogs.source.", 10)) == [
+        "dp02_dc2_catalogs.Source.coord_ra",
+        "dp02_dc2_catalogs.Source.sourceId",
+    ]
+    assert _names(index.search("dp03_catalogs.c", 10)) == [
+        "dp03_catalogs.coord"
+    ]
+    assert index.search("a.b.c.d", 10) == []
+    match = index.search("detect_isprimary", 1)[0]
+    assert match.url == "https://example.com/Object.detect"
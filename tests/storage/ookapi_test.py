@@ -0,0 +1,206 @@
+"""Tests for the hoverdrive.storage.ookapi module."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import timedelta
+
+import httpx
+import pytest
+import respx
+import structlog
+from httpx import AsyncClient, Request, Response
+from pydantic import ValidationError
+
+from hoverdrive.exceptions import (
+    UpstreamTransientError,
+    UpstreamUnavailableError,
+)
+from hoverdrive.storage.circuitbreaker import CircuitBreaker
+from hoverdrive.storage.ookapi import OokClient, OokLinksPayload
+from hoverdrive.storage.retry import RetryController
+
+from ..support.ook import make_link
+
+
+def test_links_payload() -> None:
+    links = [make_link("dp02_dc2_catalogs", "Object", c) for c in ("a", "b")]
+    data = json.dumps(links).encode()
+    payload = OokLinksPayload(data)
+
+    assert len(payload) == 2
+    assert payload.targets() == [
+        {
+            "url": link["url"],
+            "type": "schema_browser",
+            "collection_title": "SDM Schema Browser",
+        }
+        for link in links
+    ]
+    model = payload.to_model()
+    assert model.root[1].collection_title == "SDM Schema Browser"
+    assert OokLinksPayload.from_model(model).to_model() == model
+    assert payload == OokLinksPayload(data)
+    assert len(OokLinksPayload(b"[]")) == 0
+
+    with pytest.raises(ValidationError):
+        OokLinksPayload(b'[{"title": "No URL"}]').targets()
+
+
+def _retrying_client(
+    *, hedge_percentile: float | None = None
+) -> tuple[OokClient, RetryController]:
+    retry = RetryController(
+        max_retries=2,
+        backoff=timedelta(0),
+        hedge_percentile=hedge_percentile,
+        hedge_min_delay=timedelta(milliseconds=10),
+        budget_ratio=0.1,
+    )
+    client = OokClient(
+        base_url="https://ook.example.com",
+        http_client=AsyncClient(),
+        logger=structlog.get_logger("hoverdrive"),
+        retry=retry,
+    )
+    return client, retry
+
+
+@pytest.mark.asyncio
+async def test_retry(respx_mock: respx.Router) -> None:
+    client, retry = _retrying_client()
+    url = (
+        "https://ook.example.com/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables"
+    )
+    route = respx_mock.get(url).mock(
+        side_effect=[
+            Response(503),
+            httpx.ConnectError("Connection refused"),
+            Response(200, json=[]),
+        ]
+    )
+    assert await client.get_sdm_tables("dp02_dc2_catalogs") == []
+    assert route.call_count == 3
+    assert retry.stats.retries == 2
+
+    # Server errors other than gateway errors are not retried, and neither
+    # are requests beyond the maximum number of retries.
+    route.side_effect = [Response(500)]
+    with pytest.raises(UpstreamUnavailableError):
+        await client.get_sdm_tables("dp02_dc2_catalogs")
+    assert route.call_count == 4
+    route.side_effect = [Response(503)] * 3
+    with pytest.raises(UpstreamTransientError):
+        await client.get_sdm_tables("dp02_dc2_catalogs")
+    assert route.call_count == 7
+
+
+@pytest.mark.asyncio
+async def test_hedge(respx_mock: respx.Router) -> None:
+    client, retry = _retrying_client(hedge_percentile=50)
+    for _ in range(50):
+        retry.observe(0.001)
+    assert retry.hedge_delay == 0.01
+    calls = 0
+
+    async def slow_once(request: Request) -> Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return Response(200, json=[])
+
+    url = (
+        "https://ook.example.com/links/domains/sdm/schemas/"
+        "dp02_dc2_catalogs/tables"
+    )
+    respx_mock.get(url).mock(side_effect=slow_once)
+    async with asyncio.timeout(5):
+        assert await client.get_sdm_tables("dp02_dc2_catalogs") == []
+    assert calls == 2
+    assert retry.stats.hedges == 1
+    assert retry.stats.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_collection(respx_mock: respx.Router) -> None:
+    items = [
+        {"name": f"côlumn_{i}", "links": [make_link("s", "t")]}
+        for i in range(3)
+    ]
+    data = json.dumps(items, ensure_ascii=False, indent=1).encode()
+
+    async def chunks(size: int) -> AsyncIterator[bytes]:
+        for i in range(0, len(data), size):
+            yield data[i : i + size]
+
+    url = "https://ook.example.com/links/domains/sdm/schemas"
+    async with AsyncClient() as http_client:
+        client = OokClient(
+            base_url="https://ook.example.com",
+            http_client=http_client,
+            logger=structlog.get_logger("hoverdrive"),
+        )
+        for size in (1, 5, len(data)):
+            respx_mock.get(url).mock(
+                return_value=Response(200, content=chunks(size))
+            )
+            stream = client.stream_collection("/links/domains/sdm/schemas")
+            names = [item.name async for item in stream]
+            assert names == [item["name"] for item in items]
+
+        respx_mock.get(url).mock(return_value=Response(200, content=data[:-5]))
+        with pytest.raises(ValueError, match="Truncated"):
+            _ = [
+                item
+                async for item in client.stream_collection(
+                    "/links/domains/sdm/schemas"
+                )
+            ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [
+        "]",
+        "",
+        '{"name": "a", "links": []}',
+        '[{"name": "a", "links": []},]',
+        '[{"name": "a", "links": []} {"name": "b", "links": []}]',
+        '[,{"name": "a", "links": []}]',
+        "[1]",
+        "[] []",
+    ],
+)
+async def test_stream_collection_malformed(
+    respx_mock: respx.Router, body: str
+) -> None:
+    url = "https://ook.example.com/links/domains/sdm/schemas"
+    respx_mock.get(url).mock(return_value=Response(200, text=body))
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        slow_call_duration=timedelta(seconds=10),
+        reset_timeout=timedelta(seconds=30),
+    )
+    async with AsyncClient() as http_client:
+        client = OokClient(
+            base_url="https://ook.example.com",
+            http_client=http_client,
+            logger=structlog.get_logger("hoverdrive"),
+            circuit_breaker=breaker,
+        )
+        with pytest.raises(ValueError, match="JSON array"):
+            _ = [
+                item
+                async for item in client.stream_collection(
+                    "/links/domains/sdm/schemas"
+                )
+            ]
+
+    # A malformed response counts as a failed request.
+    assert breaker.stats.consecutive_failures == 1
+    assert breaker.stats.opened == 1
@@ -0,0 +1,96 @@
+"""Tests for the hoverdrive.storage.prefetch module."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from functools import partial
+
+import pytest
+import structlog
+
+from hoverdrive.storage.prefetch import Prefetcher
+
+
+def _prefetcher(
+    *, concurrency: int = 2, max_pending: int = 10, ttl: float = 60
+) -> Prefetcher[str]:
+    return Prefetcher(
+        concurrency=concurrency,
+        max_pending=max_pending,
+        ttl=timedelta(seconds=ttl),
+        logger=structlog.get_logger("hoverdrive"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_schedule() -> None:
+    prefetcher = _prefetcher(concurrency=2, max_pending=3)
+    release = asyncio.Event()
+    running = 0
+    max_running = 0
+    calls: list[str] = []
+
+    async def prefetch(key: str) -> None:
+        nonlocal running, max_running
+        calls.append(key)
+        running += 1
+        max_running = max(max_running, running)
+        await release.wait()
+        running -= 1
+
+    assert prefetcher.schedule("a", partial(prefetch, "a"))
+    assert not prefetcher.schedule("a", partial(prefetch, "a"))
+    assert prefetcher.schedule("b", partial(prefetch, "b"))
+    assert prefetcher.schedule("c", partial(prefetch, "c"))
+    assert not prefetcher.schedule("d", partial(prefetch, "d"))
+    await asyncio.sleep(0.01)
+    assert prefetcher.stats.pending == 3
+    assert max_running == 2
+
+    release.set()
+    await prefetcher.join()
+    assert sorted(calls) == ["a", "b", "c"]
+    assert max_running == 2
+    assert prefetcher.stats.scheduled == 3
+    assert prefetcher.stats.completed == 3
+    assert prefetcher.stats.deduplicated == 1
+    assert prefetcher.stats.dropped == 1
+
+    # Completed keys are not prefetched again, but dropped ones can be.
+    assert not prefetcher.schedule("a", partial(prefetch, "a"))
+    assert prefetcher.schedule("d", partial(prefetch, "d"))
+    await prefetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failure() -> None:
+    prefetcher = _prefetcher()
+
+    async def fail() -> None:
+        raise ValueError("Ook is down")
+
+    assert prefetcher.schedule("a", fail)
+    await prefetcher.join()
+    assert prefetcher.stats.failed == 1
+
+    # A failed prefetch is tried again on the next request.
+    assert prefetcher.schedule("a", fail)
+    await prefetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_ttl() -> None:
+    prefetcher = _prefetcher(ttl=0.05)
+    calls = 0
+
+    async def prefetch() -> None:
+        nonlocal calls
+        calls += 1
+
+    assert prefetcher.schedule("a", prefetch)
+    assert not prefetcher.schedule("a", prefetch)
+    await asyncio.sleep(0.1)
+    assert prefetcher.schedule("a", prefetch)
+    await prefetcher.join()
+    assert calls == 2
@@ -0,0 +1,151 @@
+"""Tests for the hoverdrive.storage.redirectmap module."""
+
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+
+from hoverdrive.storage.linkindex import (
+    ColumnLinks,
+    SdmSchemaIndex,
+    SdmTableIndex,
+)
+from hoverdrive.storage.redirectmap import (
+    RedirectMapFormat,
+    write_redirect_map,
+    write_table_files,
+)
+
+SCHEMAS: SdmSchemaIndex = {
+    "dp02_dc2_catalogs": {
+        "Object": SdmTableIndex(
+            link="https://example.com/Object",
+            columns=ColumnLinks(
+                {
+                    "coord_ra": "https://example.com/Object.coord_ra",
+                    "odd": 'https://example.com/"quoted"',
+                }
+            ),
+        ),
+        "Source": SdmTableIndex(
+            columns=ColumnLinks(
+                {"coord_dec": "https://example.com/Source.coord_dec"}
+            ),
+        ),
+    }
+}
+
+
+def test_formats(tmp_path: Path) -> None:
+    path = tmp_path / "map.json"
+    assert write_redirect_map(SCHEMAS, path, RedirectMapFormat.json) == 4
+    assert json.loads(path.read_text()) == {
+        "tables": {"dp02_dc2_catalogs.Object": "https://example.com/Object"},
+        "columns": {
+            "dp02_dc2_catalogs.Object": {
+                "coord_ra": "https://example.com/Object.coord_ra",
+                "odd": 'https://example.com/"quoted"',
+            },
+            "dp02_dc2_catalogs.Source": {
+                "coord_dec": "https://example.com/Source.coord_dec"
+            },
+        },
+    }
+
+    path = tmp_path / "map.csv"
+    assert write_redirect_map(SCHEMAS, path, RedirectMapFormat.csv) == 4
+    with path.open(newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["table", "column", "url"]
+    assert rows[1] == [
+        "dp02_dc2_catalogs.Object",
+        "",
+        "https://example.com/Object",
+    ]
+    assert [
+        "dp02_dc2_catalogs.Object",
+        "odd",
+        'https://example.com/"quoted"',
+    ] in rows
+
+    # Links that cannot be quoted for nginx are left to hoverdrive.
+    path = tmp_path / "redirects.map"
+    assert write_redirect_map(SCHEMAS, path, RedirectMapFormat.nginx) == 3
+    assert path.read_text() == (
+        "map $arg_table $hoverdrive_table_link {\n"
+        '    default "";\n'
+        '    "dp02_dc2_catalogs.Object" "https://example.com/Object";\n'
+        "}\n"
+        'map "$arg_table:$arg_column" $hoverdrive_column_link {\n'
+        '    default "";\n'
+        '    "dp02_dc2_catalogs.Object:coord_ra"'
+        ' "https://example.com/Object.coord_ra";\n'
+        '    "dp02_dc2_catalogs.Source:coord_dec"'
+        ' "https://example.com/Source.coord_dec";\n'
+        "}\n"
+    )
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_nginx_case_collisions(tmp_path: Path) -> None:
+    columns = ColumnLinks(
+        {
+            "coord_ra": "https://example.com/coord_ra",
+            "Coord_RA": "https://example.com/Coord_RA",
+            "coord_dec": "https://example.com/coord_dec",
+        }
+    )
+    schemas: SdmSchemaIndex = {"s": {"t": SdmTableIndex(columns=columns)}}
+    path = tmp_path / "redirects.map"
+    assert write_redirect_map(schemas, path, RedirectMapFormat.nginx) == 1
+    assert path.read_text().splitlines()[3:] == [
+        'map "$arg_table:$arg_column" $hoverdrive_column_link {',
+        '    default "";',
+        '    # "s.t:Coord_RA" left out: differs only in case',
+        '    # "s.t:coord_ra" left out: differs only in case',
+        '    "s.t:coord_dec" "https://example.com/coord_dec";',
+        "}",
+    ]
+
+
+def test_table_files(tmp_path: Path) -> None:
+    table = SdmTableIndex(
+        columns=ColumnLinks({"coord_ra": "https://example.com/coord_ra"})
+    )
+    schemas: SdmSchemaIndex = {
+        "dp02_dc2_catalogs": {"Object": table, "../../escape": table},
+        "..": {"Object": table},
+    }
+    directory = tmp_path / "tables"
+    assert write_table_files(schemas, directory) == 1
+    assert [p.name for p in tmp_path.rglob("*.json")] == [
+        "dp02_dc2_catalogs.Object.json"
+    ]
+    assert json.loads(
+        (directory / "dp02_dc2_catalogs.Object.json").read_text()
+    ) == {
+        "table": "dp02_dc2_catalogs.Object",
+        "columns": {"coord_ra": "https://example.com/coord_ra"},
+    }
+
+
+def test_table_files_stale(tmp_path: Path) -> None:
+    table = SdmTableIndex(
+        columns=ColumnLinks({"coord_ra": "https://example.com/coord_ra"})
+    )
+    directory = tmp_path / "tables"
+    schemas: SdmSchemaIndex = {"s": {"Object": table, "Source": table}}
+    assert write_table_files(schemas, directory) == 2
+    (directory / "index.json").write_text("{}")
+    (directory / "README").write_text("Table links")
+
+    # Files of tables removed since the previous export are deleted, but
+    # other files are kept.
+    del schemas["s"]["Source"]
+    assert write_table_files(schemas, directory) == 1
+    assert sorted(p.name for p in directory.iterdir()) == [
+        "README",
+        "index.json",
+        "s.Object.json",
+    ]
@@ -0,0 +1,51 @@
+"""Tests for the hoverdrive.storage.retry module."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from hoverdrive.storage.retry import RetryController
+
+
+def test_hedge_delay() -> None:
+    retry = RetryController(
+        max_retries=0,
+        backoff=timedelta(0),
+        hedge_percentile=90,
+        hedge_min_delay=timedelta(milliseconds=5),
+        budget_ratio=0.1,
+    )
+    for i in range(49):
+        retry.observe(i / 1000)
+    assert not retry.hedge_delay
+    retry.observe(0.049)
+    assert retry.hedge_delay == 0.044
+
+    # The delay is never shorter than the minimum.
+    for _ in range(1000):
+        retry.observe(0.001)
+    assert retry.hedge_delay == 0.005
+
+
+def test_retry_budget() -> None:
+    retry = RetryController(
+        max_retries=1,
+        backoff=timedelta(seconds=1),
+        hedge_percentile=None,
+        hedge_min_delay=timedelta(0),
+        budget_ratio=0.5,
+        rng=lambda: 0.5,
+    )
+    assert retry.backoff(1) == 0.5
+    assert retry.backoff(3) == 2.0
+    retry.observe(1.0)
+    assert retry.hedge_delay is None
+
+    # The budget allows a burst, then refills with original requests.
+    assert all(retry.spend() for _ in range(10))
+    assert not retry.spend()
+    assert retry.stats.budget_exhausted == 1
+    retry.record_request()
+    assert not retry.spend()
+    retry.record_request()
+    assert retry.spend()
@@ -0,0 +1,114 @@
+"""Tests for the hoverdrive.storage.singleflight module."""
+
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+
+import pytest
+
+from hoverdrive.storage.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_merged() -> None:
+    single_flight = SingleFlight[str, int]()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    waiters = [
+        asyncio.create_task(single_flight.do("a", fetch)) for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == [1] * 5
+    assert calls == 1
+    assert single_flight.stats.calls == 1
+    assert single_flight.stats.merged == 4
+    assert len(single_flight) == 0
+
+    # Once the call has finished, the next caller starts a new one.
+    assert await single_flight.do("a", fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter() -> None:
+    single_flight = SingleFlight[str, int]()
+    release = asyncio.Event()
+
+    async def fail() -> int:
+        await release.wait()
+        raise ValueError("upstream failed")
+
+    waiters = [
+        asyncio.create_task(single_flight.do("a", fail)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancellation() -> None:
+    single_flight = SingleFlight[str, int]()
+    release = asyncio.Event()
+    started = 0
+    cancelled = asyncio.Event()
+
+    async def fetch() -> int:
+        nonlocal started
+        started += 1
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return 42
+
+    first = asyncio.create_task(single_flight.do("a", fetch))
+    second = asyncio.create_task(single_flight.do("a", fetch))
+    await asyncio.sleep(0)
+
+    # Cancelling one waiter leaves the shared call running for the other.
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+    release.set()
+    assert await second == 42
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    # Cancelling every waiter cancels the shared call.
+    release.clear()
+    third = asyncio.create_task(single_flight.do("a", fetch))
+    await asyncio.sleep(0)
+    third.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await third
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+    assert len(single_flight) == 0
+    assert started == 2
+
+
+@pytest.mark.asyncio
+async def test_call_context() -> None:
+    """Test that the shared call does not run in the context of the caller
+    that started it.
+    """
+    single_flight = SingleFlight[str, str | None]()
+    request_id = ContextVar[str | None]("request_id", default=None)
+
+    async def fetch() -> str | None:
+        return request_id.get()
+
+    request_id.set("first")
+    assert await single_flight.do("a", fetch) is None
@@ -0,0 +1,46 @@
+"""Tests for the hoverdrive.storage.snapshot module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from hoverdrive.storage.linkindex import (
+    ColumnLinks,
+    SdmSchemaIndex,
+    SdmTableIndex,
+)
+from hoverdrive.storage.snapshot import LinkSnapshotStore
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    schemas: SdmSchemaIndex = {
+        "dp02_dc2_catalogs": {
+            "Object": SdmTableIndex(
+                link="https://example.com/Object",
+                columns=ColumnLinks(
+                    {"coord_ra": "https://example.com/Object.coord_ra"}
+                ),
+            ),
+            "Source": SdmTableIndex(
+                link=None,
+                columns=ColumnLinks(
+                    {"coord_dec": "https://example.com/Source.coord_dec"}
+                ),
+            ),
+        }
+    }
+    store = LinkSnapshotStore(tmp_path / "cache" / "links.sqlite")
+    assert store.load() is None
+
+    store.save(schemas)
+    snapshot = store.load()
+    assert snapshot
+    assert snapshot.schemas == schemas
+
+    # Saving again replaces the previous snapshot.
+    del schemas["dp02_dc2_catalogs"]["Source"]
+    store.save(schemas)
+    snapshot = store.load()
+    assert snapshot
+    assert list(snapshot.schemas["dp02_dc2_catalogs"]) == ["Object"]
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == ["links.sqlite"]
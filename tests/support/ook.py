@@ -0,0 +1,96 @@
+"""Mock Ook SDM links domain for tests."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import respx
+from httpx import Response
+
+from hoverdrive.config import config
+
+__all__ = ["SDM_DOMAIN", "make_link", "mock_ook_sdm_domain"]
+
+SDM_DOMAIN: dict[str, dict[str, list[str]]] = {
+    "dp02_dc2_catalogs": {
+        "Object": ["coord_ra", "coord_dec", "detect_isPrimary"],
+        "Source": ["coord_ra", "coord_dec"],
+    },
+}
+"""Schema name to table name to column names in the mock SDM domain."""
+
+
+def make_link(*names: str) -> dict[str, Any]:
+    """Make a schema browser link for an SDM schema, table, or column."""
+    anchor = ".".join(names[1:])
+    return {
+        "url": f"https://sdm-schemas.lsst.io/{names[0]}.html#{anchor}",
+        "type": "schema_browser",
+        "title": ".".join(names),
+        "collection_title": "SDM Schema Browser",
+    }
+
+
+def mock_ook_sdm_domain(
+    respx_mock: respx.Router, *, page_size: int = 2
+) -> None:
+    """Mock the Ook SDM link collection and item endpoints.
+
+    Collections are paginated with ``Link`` headers, ``page_size`` entries to
+    a page, so that clients must follow the ``next`` relation.
+    """
+    base = f"{config.ook_url}/links/domains/sdm/schemas"
+    _mock_collection(
+        respx_mock,
+        base,
+        [{"name": s, "links": [make_link(s)]} for s in SDM_DOMAIN],
+        page_size,
+    )
+    for schema, tables in SDM_DOMAIN.items():
+        _mock_collection(
+            respx_mock,
+            f"{base}/{schema}/tables",
+            [{"name": t, "links": [make_link(schema, t)]} for t in tables],
+            page_size,
+        )
+        for table, columns in tables.items():
+            respx_mock.get(f"{base}/{schema}/tables/{table}").mock(
+                return_value=Response(200, json=[make_link(schema, table)])
+            )
+            _mock_collection(
+                respx_mock,
+                f"{base}/{schema}/tables/{table}/columns",
+                [
+                    {"name": c, "links": [make_link(schema, table, c)]}
+                    for c in columns
+                ],
+                page_size,
+            )
+            for column in columns:
+                respx_mock.get(
+                    f"{base}/{schema}/tables/{table}/columns/{column}"
+                ).mock(
+                    return_value=Response(
+                        200, json=[make_link(schema, table, column)]
+                    )
+                )
+
+
+def _mock_collection(
+    respx_mock: respx.Router,
+    url: str,
+    items: list[dict[str, Any]],
+    page_size: int,
+) -> None:
+    # Routes are matched in order and a route without query parameters also
+    # matches requests that have them, so register the later pages first.
+    for start in reversed(range(0, len(items), page_size)):
+        headers = {}
+        if start + page_size < len(items):
+            headers["Link"] = f'<{url}?cursor={start + page_size}>; rel="next"'
+        params = {"cursor": str(start)} if start else {}
+        respx_mock.get(url, params=params).mock(
+            return_value=Response(
+                200, json=items[start : start + page_size], headers=headers
+            )
+        )
@@ -0,0 +1,91 @@
+"""A minimal Redis-protocol server standing in for Redis in tests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+__all__ = ["FakeRedisServer", "fake_redis_server"]
+
+
+class FakeRedisServer:
+    """An in-memory server for the RESP2 commands used by hoverdrive.
+
+    Supports ``AUTH``, ``SELECT``, ``PING``, ``GET``, ``SET`` (with ``PX``),
+    and ``DEL``, and records every command it receives.
+    """
+
+    def __init__(self, *, password: str | None = None) -> None:
+        self.password = password
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.commands: list[list[bytes]] = []
+        self.port = 0
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        authenticated = self.password is None
+        try:
+            while True:
+                args = await self._read_command(reader)
+                self.commands.append(args)
+                name = args[0].upper()
+                if name == b"AUTH":
+                    authenticated = args[1].decode() == self.password
+                    writer.write(
+                        b"+OK\r\n"
+                        if authenticated
+                        else b"-WRONGPASS invalid password\r\n"
+                    )
+                elif not authenticated:
+                    writer.write(b"-NOAUTH Authentication required\r\n")
+                else:
+                    writer.write(self._execute(name, args[1:]))
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    def _execute(self, name: bytes, args: list[bytes]) -> bytes:
+        match name:
+            case b"PING" | b"SELECT":
+                return b"+OK\r\n"
+            case b"GET":
+                value, expires_at = self.data.get(args[0], (None, None))
+                if value is None or (expires_at and time.time() > expires_at):
+                    return b"$-1\r\n"
+                return b"$%d\r\n%b\r\n" % (len(value), value)
+            case b"SET":
+                expires_at = None
+                if len(args) == 4 and args[2].upper() == b"PX":
+                    expires_at = time.time() + int(args[3]) / 1000
+                self.data[args[0]] = (args[1], expires_at)
+                return b"+OK\r\n"
+            case b"DEL":
+                count = sum(1 for k in args if self.data.pop(k, None))
+                return b":%d\r\n" % count
+            case _:
+                return b"-ERR unknown command\r\n"
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> list[bytes]:
+        header = await reader.readuntil(b"\r\n")
+        count = int(header[1:-2])
+        args = []
+        for _ in range(count):
+            length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+
+@asynccontextmanager
+async def fake_redis_server(
+    *, password: str | None = None
+) -> AsyncIterator[FakeRedisServer]:
+    """Run a `FakeRedisServer` on a free local port."""
+    fake = FakeRedisServer(password=password)
+    server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+    fake.port = server.sockets[0].getsockname()[1]
+    async with server:
+        yield fake
+        server.close()
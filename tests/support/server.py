@@ -0,0 +1,28 @@
+"""Run a real uvicorn server inside a test."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from uvicorn import Server
+
+__all__ = ["server_running"]
+
+
+@asynccontextmanager
+async def server_running(server: Server) -> AsyncIterator[None]:
+    """Serve with ``server`` in the background for the duration of the
+    context.
+    """
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    try:
+        yield
+    finally:
+        server.should_exit = True
+        await task
@@ -0,0 +1,66 @@
+"""Tests for the hoverdrive.timing module."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Sequence
+
+import pytest
+
+from hoverdrive.timing import (
+    OpenTelemetrySpanExporter,
+    TimingSpan,
+    mark,
+    time_request,
+    timed,
+)
+
+
+@pytest.mark.asyncio
+async def test_timing() -> None:
+    # Outside of a timed request, nothing is recorded.
+    with timed("ook"):
+        mark("setup")
+
+    async def lookup() -> None:
+        with timed("cache"):
+            await asyncio.sleep(0)
+        with timed("ook"):
+            await asyncio.sleep(0)
+
+    with time_request("GET /hoverdrive/column-docs-redirect") as timer:
+        mark("setup")
+        with timed("lookups"):
+            await asyncio.gather(lookup(), lookup())
+        header = timer.server_timing()
+        spans = timer.finish()
+
+    assert [s.name for s in spans[:3]] == [
+        "GET /hoverdrive/column-docs-redirect",
+        "setup",
+        "cache",
+    ]
+    parents = {s.name: s.parent_id for s in spans}
+    lookups = next(s for s in spans if s.name == "lookups")
+    assert parents["setup"] == 0
+    assert parents["lookups"] == 0
+    assert parents["ook"] == lookups.span_id
+    assert len([s for s in spans if s.name == "ook"]) == 2
+    assert all(s.start_ns >= spans[0].start_ns for s in spans)
+
+    # Stages with the same name are added up in the header.
+    stages = re.findall(r"(\w+);dur=[0-9.]+", header)
+    assert stages == ["setup", "cache", "ook", "lookups", "total"]
+
+
+def test_opentelemetry_exporter() -> None:
+    pytest.importorskip("opentelemetry")
+    spans: Sequence[TimingSpan] = [
+        TimingSpan("GET /hoverdrive/", 0, None, 1_000_000, 0.002),
+        TimingSpan("ook", 2, 1, 1_200_000, 0.0005),
+        TimingSpan("cache", 1, 0, 1_100_000, 0.001),
+    ]
+
+    # Without the SDK, spans are dropped, but they must still be valid.
+    OpenTelemetrySpanExporter().export(spans)